@@ -0,0 +1,84 @@
+"""
+Rows-per-second benchmark for DuckDB.ingest_artifacts() and Arrow export.
+
+Times the Arrow-registered ingest against the row-by-row ``executemany`` path it replaced, and reading the
+table back as a DataFrame versus as Arrow record batches, on a synthetic table of integer, float and string columns.
+
+Usage:
+    python benchmarks/bench_duckdb_ingest.py
+    python benchmarks/bench_duckdb_ingest.py --sizes 10000 100000 --cols 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+from dsi.backends.duckdb import DuckDB
+
+
+def make_table(num_rows, num_cols):
+    table = OrderedDict()
+    for c in range(num_cols):
+        if c % 3 == 0:
+            table[f"int_{c}"] = list(range(num_rows))
+        elif c % 3 == 1:
+            table[f"float_{c}"] = [i * 0.5 for i in range(num_rows)]
+        else:
+            table[f"str_{c}"] = [f"run_{i}" for i in range(num_rows)]
+    return OrderedDict([("bench", table)])
+
+
+class RowByRowDuckDB(DuckDB):
+    """DuckDB backend forced onto the previous executemany insert path."""
+    def arrow_table_helper(self, properties):
+        return None
+
+
+def time_run(backend_cls, collection, repeat):
+    ingest, df_read, arrow_read = [], [], []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = backend_cls(os.path.join(tmp, "bench.duckdb"))
+            start = time.perf_counter()
+            store.ingest_artifacts(collection)
+            ingest.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            store.get_table("bench")
+            df_read.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            reader = store.get_table("bench", arrow_return=True)
+            for _batch in reader:
+                pass
+            arrow_read.append(time.perf_counter() - start)
+            store.close()
+    return min(ingest), min(df_read), min(arrow_read)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="row counts to benchmark")
+    parser.add_argument("--cols", type=int, default=4, help="number of columns in the synthetic table")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the fastest run is reported")
+    parser.add_argument("--skip-row-by-row", action="store_true", help="skip the slow executemany baseline")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} | {'rowwise rows/s':>16} | {'arrow rows/s':>16} | {'speedup':>8} | {'read df rows/s':>16} | {'read arrow rows/s':>18}")
+    print("-" * 103)
+    for num_rows in args.sizes:
+        collection = make_table(num_rows, args.cols)
+        arrow_ingest, df_read, arrow_read = time_run(DuckDB, collection, args.repeat)
+        if args.skip_row_by_row:
+            rowwise, speedup = "n/a", "n/a"
+        else:
+            rowwise_ingest = time_run(RowByRowDuckDB, collection, args.repeat)[0]
+            rowwise, speedup = f"{num_rows / rowwise_ingest:,.0f}", f"{rowwise_ingest / arrow_ingest:.2f}x"
+        print(f"{num_rows:>12,} | {rowwise:>16} | {num_rows / arrow_ingest:>16,.0f} | {speedup:>8} | "
+              f"{num_rows / df_read:>16,.0f} | {num_rows / arrow_read:>18,.0f}")
+        del collection
+
+
+if __name__ == "__main__":
+    main()
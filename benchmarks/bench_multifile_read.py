@@ -0,0 +1,93 @@
+"""
+Files-per-second benchmark for the multi-file Csv and Parquet readers.
+
+Times Csv/Parquet ``add_rows()`` over many small per-run files against the loop it replaced, which grew the
+result with one ``concat`` per file and replaced NaN with None element by element.
+
+Usage:
+    python benchmarks/bench_multifile_read.py
+    python benchmarks/bench_multifile_read.py --files 10 1000 --rows 20 --format parquet
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from math import isnan
+
+import numpy as np
+from pandas import DataFrame, concat, read_csv
+from pyarrow import parquet as pq
+
+from dsi.plugins.file_reader import Csv, Parquet
+
+
+def write_runs(folder, num_files, num_rows, fmt):
+    rng = np.random.default_rng(0)
+    filenames = []
+    for i in range(num_files):
+        energy = rng.random(num_rows)
+        energy[rng.random(num_rows) < 0.1] = np.nan
+        df = DataFrame({"run_id": i, "step": np.arange(num_rows), "energy": energy, "state": f"state_{i % 7}"})
+        path = os.path.join(folder, f"run_{i:05d}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False)
+        filenames.append(path)
+    return filenames
+
+
+def read_loop(filenames, fmt):
+    """The per-file concat loop the readers used before."""
+    total_df = DataFrame()
+    for filename in filenames:
+        temp_df = read_csv(filename) if fmt == "csv" else pq.read_table(filename).to_pandas()
+        total_df = concat([total_df, temp_df], axis=0, ignore_index=True)
+    table_data = OrderedDict(total_df.to_dict(orient='list'))
+    for col, coldata in table_data.items():
+        table_data[col] = [None if isinstance(item, float) and isnan(item) else item for item in coldata]
+    return table_data
+
+
+def read_reader(filenames, fmt):
+    reader = Csv(filenames) if fmt == "csv" else Parquet(filenames)
+    reader.add_rows()
+    return reader.csv_data if fmt == "csv" else reader.parquet_data
+
+
+def best_time(fn, filenames, fmt, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(filenames, fmt)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, nargs="+", default=[10, 1_000, 10_000], help="file counts to benchmark")
+    parser.add_argument("--rows", type=int, default=10, help="rows in each file")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="file format")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the fastest run is reported")
+    parser.add_argument("--skip-loop", action="store_true", help="skip the slow per-file concat baseline")
+    args = parser.parse_args()
+
+    print(f"{'files':>8} | {'loop files/s':>14} | {'reader files/s':>15} | {'speedup':>8}")
+    print("-" * 55)
+    for num_files in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            filenames = write_runs(tmp, num_files, args.rows, args.format)
+            reader_time, result = best_time(read_reader, filenames, args.format, args.repeat)
+            if args.skip_loop:
+                loop, speedup = "n/a", "n/a"
+            else:
+                loop_time, expected = best_time(read_loop, filenames, args.format, args.repeat)
+                assert result == expected, "reader output differs from the per-file loop"
+                loop, speedup = f"{num_files / loop_time:,.0f}", f"{loop_time / reader_time:.2f}x"
+            print(f"{num_files:>8,} | {loop:>14} | {num_files / reader_time:>15,.0f} | {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Reader throughput with each Terminal error_attribution mode.
+
+``settrace`` records every function return while a reader runs so a failure can be traced to a line.
+``traceback`` reads the same location from the exception only when a reader fails, so the success path pays nothing.
+This runs the YAML1, Bueno and Cloverleaf readers from load_module() under both modes and reports files read per second.
+
+Usage:
+    python benchmarks/bench_reader_attribution.py
+    python benchmarks/bench_reader_attribution.py --files 200 --repeat 5
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from dsi.core import Terminal
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples")
+
+
+def make_inputs(tmp, num_files):
+    yaml_files = []
+    for i in range(num_files):
+        path = os.path.join(tmp, f"student_{i}.yml")
+        shutil.copyfile(os.path.join(EXAMPLES, "test", "student_test1.yml"), path)
+        yaml_files.append(path)
+
+    bueno_files = []
+    for i in range(num_files):
+        path = os.path.join(tmp, f"bueno_{i}.data")
+        with open(path, "w") as fh:
+            json.dump({f"metric_{c}": i * c for c in range(20)}, fh)
+        bueno_files.append(path)
+
+    clover_dir = os.path.join(EXAMPLES, "clover3d")
+    return {
+        "YAML1": (dict(filenames=yaml_files), num_files),
+        "Bueno": (dict(filenames=bueno_files), num_files),
+        "Cloverleaf": (dict(folder_path=clover_dir), len([d for d in os.listdir(clover_dir) if d.startswith("run_")])),
+    }
+
+
+def time_reader(reader, kwargs, mode, repeat):
+    timings = []
+    for _ in range(repeat):
+        terminal = Terminal(error_attribution=mode)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            terminal.load_module("plugin", reader, "reader", **kwargs)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100, help="number of YAML1 and Bueno input files")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the fastest run is reported")
+    args = parser.parse_args()
+
+    print(f"{'reader':>12} | {'settrace files/s':>17} | {'traceback files/s':>18} | {'speedup':>8}")
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as tmp:
+        for reader, (kwargs, num_files) in make_inputs(tmp, args.files).items():
+            trace_time = time_reader(reader, kwargs, "settrace", args.repeat)
+            tb_time = time_reader(reader, kwargs, "traceback", args.repeat)
+            print(f"{reader:>12} | {num_files / trace_time:>17,.1f} | {num_files / tb_time:>18,.1f} | {trace_time / tb_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Scaling benchmark for the row numbering used by Sqlite.find_cell() and Sqlite.find_relation().
+
+Builds a table of each size, then times a find_cell() search and a find_relation() filter that both match about
+half of the rows, so row numbers are needed for many rows. Time per row staying flat as the table grows shows
+linear scaling. With ``--gaps`` some rows are deleted first, which exercises the ROW_NUMBER() window path instead
+of the rowid shortcut.
+
+Usage:
+    python benchmarks/bench_sqlite_find.py
+    python benchmarks/bench_sqlite_find.py --sizes 100000 1000000 --gaps
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+from dsi.backends.sqlite import Sqlite
+
+
+def make_table(num_rows):
+    return OrderedDict([("bench", OrderedDict([
+        ("idx", list(range(num_rows))),
+        ("name", [f"run_{i % 2}_{i}" for i in range(num_rows)]),
+        ("value", [i * 0.5 for i in range(num_rows)]),
+    ]))])
+
+
+def time_find(num_rows, gaps):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Sqlite(os.path.join(tmp, "bench.db"))
+        store.ingest_artifacts(make_table(num_rows), bulk_load=True)
+        if gaps:
+            store.cur.execute("DELETE FROM bench WHERE idx % 1000 = 7;")
+            store.con.commit()
+
+        start = time.perf_counter()
+        cells = store.find_cell("run_1")
+        cell_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = store.find_relation("idx", f"> {num_rows // 2}")
+        relation_time = time.perf_counter() - start
+        store.close()
+    return cell_time, len(cells), relation_time, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500_000, 1_000_000, 2_000_000, 5_000_000], help="row counts to benchmark")
+    parser.add_argument("--gaps", action="store_true", help="delete every 1000th row so rowids are not contiguous")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} | {'find_cell s':>11} | {'matches':>10} | {'ns/row':>8} | {'find_relation s':>15} | {'matches':>10} | {'ns/row':>8}")
+    print("-" * 92)
+    for num_rows in args.sizes:
+        cell_time, num_cells, relation_time, num_rows_found = time_find(num_rows, args.gaps)
+        print(f"{num_rows:>12,} | {cell_time:>11.2f} | {num_cells:>10,} | {cell_time / num_rows * 1e9:>8.0f} | "
+              f"{relation_time:>15.2f} | {num_rows_found:>10,} | {relation_time / num_rows * 1e9:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Rows-per-second benchmark for Sqlite.ingest_artifacts().
+
+Compares the default row-by-row ingest against the columnar bulk-load mode (``bulk_load=True``)
+on a synthetic table of integer, float and string columns.
+
+Usage:
+    python benchmarks/bench_sqlite_ingest.py
+    python benchmarks/bench_sqlite_ingest.py --sizes 10000 1000000 --cols 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+from dsi.backends.sqlite import Sqlite
+
+
+def make_table(num_rows, num_cols):
+    table = OrderedDict()
+    for c in range(num_cols):
+        if c % 3 == 0:
+            table[f"int_{c}"] = list(range(num_rows))
+        elif c % 3 == 1:
+            table[f"float_{c}"] = [i * 0.5 for i in range(num_rows)]
+        else:
+            table[f"str_{c}"] = [f"run_{i}" for i in range(num_rows)]
+    return OrderedDict([("bench", table)])
+
+
+def time_ingest(collection, bulk_load, batch_size, repeat):
+    timings = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Sqlite(os.path.join(tmp, "bench.db"))
+            start = time.perf_counter()
+            store.ingest_artifacts(collection, bulk_load=bulk_load, batch_size=batch_size)
+            timings.append(time.perf_counter() - start)
+            store.close()
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000], help="row counts to benchmark")
+    parser.add_argument("--cols", type=int, default=4, help="number of columns in the synthetic table")
+    parser.add_argument("--batch-size", type=int, default=100000, help="rows per batch in bulk-load mode")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the fastest run is reported")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} | {'default rows/s':>16} | {'bulk rows/s':>16} | {'speedup':>8}")
+    print("-" * 62)
+    for num_rows in args.sizes:
+        collection = make_table(num_rows, args.cols)
+        default_time = time_ingest(collection, False, args.batch_size, args.repeat)
+        bulk_time = time_ingest(collection, True, args.batch_size, args.repeat)
+        print(f"{num_rows:>12,} | {num_rows / default_time:>16,.0f} | {num_rows / bulk_time:>16,.0f} | {default_time / bulk_time:>7.2f}x")
+        del collection
+
+
+if __name__ == "__main__":
+    main()
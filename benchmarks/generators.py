@@ -0,0 +1,82 @@
+"""
+Synthetic data generators for the DSI benchmark suite.
+
+Every generator is deterministic for a given set of arguments, so two revisions benchmarked
+with the same tier see exactly the same input.
+"""
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+from pandas import DataFrame
+
+
+def table(num_rows, num_cols):
+    """One table of `num_rows` rows cycling through integer, float and string columns, as a DSI collection."""
+    columns = OrderedDict()
+    for c in range(num_cols):
+        if c % 3 == 0:
+            columns[f"int_{c}"] = list(range(c, num_rows + c))
+        elif c % 3 == 1:
+            columns[f"float_{c}"] = [i * 0.5 + c for i in range(num_rows)]
+        else:
+            columns[f"str_{c}"] = [f"run_{i % 2}_{i}" for i in range(num_rows)]
+    return columns
+
+
+def tall_table(num_rows, num_cols=4, name="bench"):
+    """A collection with one narrow table of many rows."""
+    return OrderedDict([(name, table(num_rows, num_cols))])
+
+
+def wide_table(num_rows, num_cols=200, name="bench"):
+    """A collection with one table of many columns."""
+    return OrderedDict([(name, table(num_rows, num_cols))])
+
+
+def small_files(folder, num_files, num_rows=10, fmt="csv"):
+    """Write `num_files` per-run files of `num_rows` rows each and return their paths.
+
+    `fmt` is "csv", "parquet" or "bueno" (one flat JSON object per file, as the Bueno reader expects).
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(num_files):
+        path = os.path.join(folder, f"run_{i:06d}.{'data' if fmt == 'bueno' else fmt}")
+        if fmt == "bueno":
+            with open(path, "w") as f:
+                json.dump({f"metric_{c}": float(rng.random()) for c in range(num_rows)}, f)
+        else:
+            energy = rng.random(num_rows)
+            energy[rng.random(num_rows) < 0.1] = np.nan
+            df = DataFrame({"run_id": i, "step": np.arange(num_rows), "energy": energy, "state": f"state_{i % 7}"})
+            if fmt == "csv":
+                df.to_csv(path, index=False)
+            else:
+                df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def directory_tree(root, depth, fanout, files_per_dir, file_size=64):
+    """Build a tree `depth` levels deep with `fanout` sub-folders per folder and `files_per_dir` files in every folder.
+
+    Returns the number of files written.
+    """
+    payload = b"x" * file_size
+    count = 0
+    level = [root]
+    for d in range(depth + 1):
+        next_level = []
+        for folder in level:
+            os.makedirs(folder, exist_ok=True)
+            for f in range(files_per_dir):
+                with open(os.path.join(folder, f"file_{f}.dat"), "wb") as fh:
+                    fh.write(payload)
+                count += 1
+            if d < depth:
+                next_level.extend(os.path.join(folder, f"dir_{k}") for k in range(fanout))
+        level = next_level
+    return count
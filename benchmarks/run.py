@@ -0,0 +1,208 @@
+"""
+Runs the DSI benchmark suite, writes the results as JSON and compares result files or git revisions.
+
+Benchmarks are defined in ``benchmarks/suite.py`` on data from ``benchmarks/generators.py``; everything runs offline.
+Each benchmark is timed `--repeat` times and the fastest run is the headline number.
+
+Usage:
+    python benchmarks/run.py list
+    python benchmarks/run.py run --tier small --output results.json
+    python benchmarks/run.py run --tier medium -k sqlite reader
+    python benchmarks/run.py compare before.json after.json
+    python benchmarks/run.py revisions main HEAD --tier small
+
+``revisions`` checks each revision out into a temporary git worktree and runs this checkout's suite against
+that revision's ``dsi`` package, so both sides are measured with the same benchmark code.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def git(*args, cwd=BENCH_DIR):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def dsi_revision():
+    """The folder of the imported ``dsi`` package, its git revision and whether its tree has uncommitted changes."""
+    import dsi.core
+    folder = os.path.dirname(os.path.abspath(dsi.core.__file__))
+    try:
+        return folder, git("rev-parse", "HEAD", cwd=folder), bool(git("status", "--porcelain", "--", ".", cwd=folder))
+    except (OSError, subprocess.CalledProcessError):
+        return folder, None, None
+
+
+def run_benchmark(spec, params, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        fn, items = spec["setup"](tmp, **params)
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    best = min(times)
+    return {"params": params, "unit": spec["unit"], "items": items, "times": times,
+            "best": best, "median": statistics.median(times), "rate": items / best if best > 0 else None}
+
+
+def select(names, patterns):
+    if not patterns:
+        return list(names)
+    return [name for name in names if any(p in name for p in patterns)]
+
+
+def cmd_list(args):
+    from suite import BENCHMARKS
+    for name, spec in BENCHMARKS.items():
+        tiers = ", ".join(f"{tier}: {params}" for tier, params in spec["tiers"].items())
+        print(f"{name:<28} {spec['doc']}\n{'':<28} {tiers}")
+
+
+def cmd_run(args):
+    from suite import BENCHMARKS
+    dsi_path, revision, dirty = dsi_revision()
+    meta = {"revision": revision, "dirty": dirty, "dsi_path": dsi_path, "tier": args.tier, "repeat": args.repeat,
+            "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    results, errors = {}, {}
+    print(f"{'benchmark':<28} | {'best s':>9} | {'median s':>9} | {'rate':>16}")
+    print("-" * 72)
+    for name in select(BENCHMARKS, args.k):
+        spec = BENCHMARKS[name]
+        try:
+            result = run_benchmark(spec, spec["tiers"][args.tier], args.repeat)
+        except Exception as e:  # a benchmark missing from an older revision should not stop the others
+            errors[name] = f"{type(e).__name__}: {e}"
+            print(f"{name:<28} | failed: {errors[name]}")
+            if args.verbose:
+                traceback.print_exc()
+            continue
+        results[name] = result
+        print(f"{name:<28} | {result['best']:>9.3f} | {result['median']:>9.3f} | {result['rate']:>10,.0f} {spec['unit']}/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results, "errors": errors}, f, indent=2)
+        print(f"\nWrote {args.output}")
+    return 1 if errors and args.strict else 0
+
+
+def compare(before, after, threshold):
+    """Print a comparison of two result files and return the names of benchmarks that got slower than `threshold`."""
+    label_a = (before["meta"].get("revision") or "before")[:10]
+    label_b = (after["meta"].get("revision") or "after")[:10]
+    print(f"{'benchmark':<28} | {label_a:>10} s | {label_b:>10} s | {'change':>8} |")
+    print("-" * 76)
+    regressions = []
+    for name in sorted(set(before["results"]) | set(after["results"])):
+        a, b = before["results"].get(name), after["results"].get(name)
+        if a is None or b is None:
+            print(f"{name:<28} | {a['best'] if a else float('nan'):>12.3f} | {b['best'] if b else float('nan'):>12.3f} | {'n/a':>8} |")
+            continue
+        if a["params"] != b["params"]:
+            print(f"{name:<28} | parameters differ, not compared")
+            continue
+        ratio = b["best"] / a["best"]
+        verdict = ""
+        if ratio > 1 + threshold:
+            verdict = "slower"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        print(f"{name:<28} | {a['best']:>12.3f} | {b['best']:>12.3f} | {ratio:>7.2f}x | {verdict}")
+    return regressions
+
+
+def cmd_compare(args):
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    regressions = compare(before, after, args.threshold)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def cmd_revisions(args):
+    root = git("rev-parse", "--show-toplevel")
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="dsi-bench-")
+    os.makedirs(output_dir, exist_ok=True)
+    result_files = []
+    for rev in (args.before, args.after):
+        sha = git("rev-parse", "--verify", f"{rev}^{{commit}}", cwd=root)
+        output = os.path.join(output_dir, f"bench-{sha[:10]}-{args.tier}.json")
+        with tempfile.TemporaryDirectory(prefix="dsi-rev-") as worktree:
+            git("worktree", "add", "--detach", worktree, sha, cwd=root)
+            try:
+                env = dict(os.environ, PYTHONPATH=os.pathsep.join([worktree, os.environ.get("PYTHONPATH", "")]).rstrip(os.pathsep))
+                command = [sys.executable, os.path.abspath(__file__), "run", "--tier", args.tier,
+                           "--repeat", str(args.repeat), "--output", output]
+                if args.k:
+                    command += ["-k", *args.k]
+                print(f"\n== {rev} ({sha[:10]}) ==")
+                subprocess.run(command, cwd=worktree, env=env, check=True)
+            finally:
+                git("worktree", "remove", "--force", worktree, cwd=root)
+        result_files.append(output)
+
+    print()
+    with open(result_files[0]) as f:
+        before = json.load(f)
+    with open(result_files[1]) as f:
+        after = json.load(f)
+    regressions = compare(before, after, args.threshold)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="list the benchmarks and their size tiers")
+
+    def add_run_options(p):
+        p.add_argument("--tier", choices=["small", "medium", "large"], default="small", help="input size tier")
+        p.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the fastest is reported")
+        p.add_argument("-k", nargs="+", metavar="PATTERN", help="only run benchmarks whose name contains one of the patterns")
+
+    def add_compare_options(p):
+        p.add_argument("--threshold", type=float, default=0.1, help="relative change reported as slower/faster")
+        p.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 if any benchmark got slower")
+
+    p = sub.add_parser("run", help="run the suite on the installed dsi package")
+    add_run_options(p)
+    p.add_argument("--output", help="write the results to this JSON file")
+    p.add_argument("--strict", action="store_true", help="exit with status 1 if any benchmark failed")
+    p.add_argument("-v", "--verbose", action="store_true", help="print tracebacks of failed benchmarks")
+
+    p = sub.add_parser("compare", help="compare two JSON result files")
+    p.add_argument("before")
+    p.add_argument("after")
+    add_compare_options(p)
+
+    p = sub.add_parser("revisions", help="run the suite on two git revisions and compare them")
+    p.add_argument("before", help="baseline revision, e.g. main")
+    p.add_argument("after", help="revision to compare, e.g. HEAD")
+    p.add_argument("--output-dir", help="folder for the two JSON result files (default: a new temporary folder)")
+    add_run_options(p)
+    add_compare_options(p)
+
+    args = parser.parse_args()
+    commands = {"list": cmd_list, "run": cmd_run, "compare": cmd_compare, "revisions": cmd_revisions}
+    sys.exit(commands[args.command](args) or 0)
+
+
+if __name__ == "__main__":
+    main()
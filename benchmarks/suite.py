@@ -0,0 +1,130 @@
+"""
+Benchmarks of the DSI hot paths, run by ``benchmarks/run.py``.
+
+Each benchmark is a setup function registered with ``@benchmark``. It receives a scratch folder and the
+parameters of the selected size tier, prepares its input (not timed), and returns the function to time
+together with the number of items (rows, files, ...) one call processes. Only public APIs that exist in
+older revisions are used, so the same suite can compare any two revisions.
+"""
+import io
+import os
+from contextlib import redirect_stdout
+from itertools import count
+
+from generators import directory_tree, small_files, tall_table, wide_table
+
+BENCHMARKS = {}
+TIERS = ["small", "medium", "large"]
+
+
+def benchmark(name, unit, tiers):
+    """Register a benchmark. `tiers` maps each tier name to the keyword arguments of the setup function."""
+    def register(setup):
+        BENCHMARKS[name] = {"setup": setup, "unit": unit, "tiers": tiers, "doc": (setup.__doc__ or "").strip()}
+        return setup
+    return register
+
+
+def fresh_paths(folder, suffix):
+    """Yield a new file path in `folder` for every timed run, so each run starts from an empty database."""
+    for i in count():
+        yield os.path.join(folder, f"run_{i}{suffix}")
+
+
+def quiet(fn, *args, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def ingest(backend_class, collection, paths):
+    def run():
+        store = backend_class(next(paths))
+        store.ingest_artifacts(collection)
+        store.close()
+    return run
+
+
+@benchmark("sqlite_ingest_tall", "rows", {"small": dict(rows=20_000), "medium": dict(rows=200_000), "large": dict(rows=2_000_000)})
+def sqlite_ingest_tall(tmp, rows):
+    """Sqlite.ingest_artifacts() of a 4-column table."""
+    from dsi.backends.sqlite import Sqlite
+    return ingest(Sqlite, tall_table(rows), fresh_paths(tmp, ".db")), rows
+
+
+@benchmark("sqlite_ingest_wide", "rows", {"small": dict(rows=500), "medium": dict(rows=5_000), "large": dict(rows=50_000)})
+def sqlite_ingest_wide(tmp, rows):
+    """Sqlite.ingest_artifacts() of a 200-column table."""
+    from dsi.backends.sqlite import Sqlite
+    return ingest(Sqlite, wide_table(rows), fresh_paths(tmp, ".db")), rows
+
+
+@benchmark("duckdb_ingest_tall", "rows", {"small": dict(rows=20_000), "medium": dict(rows=200_000), "large": dict(rows=2_000_000)})
+def duckdb_ingest_tall(tmp, rows):
+    """DuckDB.ingest_artifacts() of a 4-column table."""
+    from dsi.backends.duckdb import DuckDB
+    return ingest(DuckDB, tall_table(rows), fresh_paths(tmp, ".duckdb")), rows
+
+
+@benchmark("sqlite_find_cell", "rows", {"small": dict(rows=50_000), "medium": dict(rows=500_000), "large": dict(rows=2_000_000)})
+def sqlite_find_cell(tmp, rows):
+    """Sqlite.find_cell() for a value that matches half of the rows."""
+    from dsi.backends.sqlite import Sqlite
+    store = Sqlite(os.path.join(tmp, "find.db"))
+    store.ingest_artifacts(tall_table(rows))
+    return lambda: store.find_cell("run_1"), rows
+
+
+@benchmark("sqlite_summary", "rows", {"small": dict(rows=50_000), "medium": dict(rows=500_000), "large": dict(rows=2_000_000)})
+def sqlite_summary(tmp, rows):
+    """Sqlite.summary() statistics of a 12-column table."""
+    from dsi.backends.sqlite import Sqlite
+    store = Sqlite(os.path.join(tmp, "summary.db"))
+    store.ingest_artifacts(tall_table(rows, num_cols=12))
+    return lambda: store.summary("bench"), rows
+
+
+@benchmark("sync_index", "files", {"small": dict(depth=2, fanout=4, files=20), "medium": dict(depth=3, fanout=6, files=20),
+                                   "large": dict(depth=4, fanout=6, files=30)})
+def sync_index(tmp, depth, fanout, files):
+    """Sync.index() of a fresh project over a deep directory tree."""
+    from dsi.sync import Sync
+    data = os.path.join(tmp, "tree")
+    num_files = directory_tree(data, depth, fanout, files)
+    paths = fresh_paths(tmp, ".db")
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            s = quiet(Sync, os.path.basename(next(paths)))
+            quiet(s.index, data, os.path.join(tmp, "remote"))
+        finally:
+            os.chdir(cwd)
+    return run, num_files
+
+
+def reader(name, files_kwarg, paths, **kwargs):
+    from dsi.core import Terminal
+
+    def run():
+        terminal = Terminal()
+        quiet(terminal.load_module, "plugin", name, "reader", **{files_kwarg: paths}, **kwargs)
+    return run
+
+
+@benchmark("csv_reader_many_files", "files", {"small": dict(files=100), "medium": dict(files=1_000), "large": dict(files=10_000)})
+def csv_reader_many_files(tmp, files):
+    """Csv reader over many 10-row per-run files."""
+    return reader("Csv", "filenames", small_files(os.path.join(tmp, "csv"), files), table_name="runs"), files
+
+
+@benchmark("bueno_reader_many_files", "files", {"small": dict(files=100), "medium": dict(files=1_000), "large": dict(files=10_000)})
+def bueno_reader_many_files(tmp, files):
+    """Bueno reader over many 20-metric files."""
+    return reader("Bueno", "filenames", small_files(os.path.join(tmp, "bueno"), files, num_rows=20, fmt="bueno")), files
+
+
+@benchmark("parquet_reader_many_files", "files", {"small": dict(files=50), "medium": dict(files=500), "large": dict(files=5_000)})
+def parquet_reader_many_files(tmp, files):
+    """Parquet reader over many 10-row per-run files."""
+    return reader("Parquet", "filenames", small_files(os.path.join(tmp, "parquet"), files, fmt="parquet"), table_name="runs"), files
@@ -1,10 +1,16 @@
 import duckdb
 import re
+import os
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
 
 from collections import OrderedDict
 from dsi.backends.filesystem import Filesystem
+from dsi.utils.columnar import Column
+from dsi.utils.stats_catalog import STAT_FIELDS, StatsCatalog, updated_table
+from dsi.utils.tracing import collection_rows, frame_bytes, span
+from dsi.utils.type_inference import sample_size_for_confidence, value_types
 
 # Holds table name and data properties
 class DataType:
@@ -43,15 +49,28 @@ class DuckDB(Filesystem):
     """
     runTable = False
     read_only = False
+    type_sample_confidence = None
 
     def __init__(self, filename, **kwargs):
         """
         Initializes a DuckDB backend with a user inputted filename, and creates other internal variables
+
+        Pass `stats_catalog=True` to keep the column statistics of `summary()` in a catalog stored next to the database 
+        in `<filename>-stats`, so they are only recomputed for tables that changed. A catalog created earlier for this file 
+        is picked up automatically.
         """
+        stats_catalog = kwargs.pop("stats_catalog", False)
         self.filename = filename
         self.con = duckdb.connect(filename, **kwargs)
         self.cur = self.con.cursor()
         self.runTable = DuckDB.runTable
+        self.type_sample_confidence = DuckDB.type_sample_confidence
+        self.schema_cache = {}
+        self.stats_catalog = None
+        stats_filename = ":memory:" if filename in ("", ":memory:") else f"{filename}-stats"
+        if stats_catalog or (stats_filename != ":memory:" and os.path.exists(stats_filename)):
+            db_files = [] if stats_filename == ":memory:" else [filename, f"{filename}.wal"]
+            self.stats_catalog = StatsCatalog(stats_filename, db_files)
         
         keywords_df = self.cur.execute("SELECT * FROM duckdb_keywords();").fetchdf()
         filtered_df = keywords_df[keywords_df['keyword_category'] != 'unreserved']
@@ -74,11 +93,19 @@ class DuckDB(Filesystem):
         DUCKDB_INT_MIN = -2147483648
         DUCKDB_INT_MAX =  2147483647
 
-        non_null = [x for x in input_list if x is not None]
-
-        if not non_null:
+        col_types = value_types(input_list)
+        if not col_types:
             return " VARCHAR", [None if x is None else str(x) for x in input_list]
 
+        if all(issubclass(t, (int, float)) for t in col_types):
+            if any(issubclass(t, float) for t in col_types):
+                if isinstance(input_list, Column):  # float64 already, passed to Arrow as is
+                    return " DOUBLE", input_list
+                return " DOUBLE", [None if x is None else float(x) for x in input_list]
+            return self.integer_type(input_list)
+
+        non_null = [x for x in input_list if x is not None]
+
         special_floats = ["Infinity", "-Infinity", "NaN"]
         if all(isinstance(x, (int, float)) or (x in special_floats) for x in non_null):
             if any(isinstance(x, int) and (x < DUCKDB_BIGINT_MIN or x > DUCKDB_BIGINT_MAX) for x in non_null):
@@ -132,6 +159,87 @@ class DuckDB(Filesystem):
 
             return f" {elem_type}[]", coerced_lists
         return " VARCHAR", [None if x is None else str(x) for x in input_list]
+
+    def integer_type(self, input_list):
+        """
+        **Internal use only. Do not call**
+
+        Picks the smallest DuckDB type that holds a list of Python ints, from the minimum and maximum value.
+
+        `input_list` : list
+            A list of ints and None values.
+
+        Return: tuple
+            " INTEGER" or " BIGINT" with the unchanged list, or " DOUBLE" with the values converted to float if they exceed BIGINT.
+        """
+        DUCKDB_BIGINT_MIN = -9223372036854775808
+        DUCKDB_BIGINT_MAX =  9223372036854775807
+        DUCKDB_INT_MIN = -2147483648
+        DUCKDB_INT_MAX =  2147483647
+
+        if isinstance(input_list, Column) and input_list.dtype != object:
+            low, high = input_list.value_range()
+        else:
+            non_null = [x for x in input_list if x is not None] if None in input_list else input_list
+            low, high = min(non_null), max(non_null)
+        if low < DUCKDB_BIGINT_MIN or high > DUCKDB_BIGINT_MAX:
+            return " DOUBLE", [None if x is None else float(x) for x in input_list]
+        if low < DUCKDB_INT_MIN or high > DUCKDB_INT_MAX:
+            return " BIGINT", input_list
+        return " INTEGER", input_list
+
+    def infer_column_type(self, table_name, column_name, input_list):
+        """
+        **Internal use only. Do not call**
+
+        Returns the DuckDB type and coerced data of one column, reusing the type cached from earlier ingests into the same table.
+
+        The cached type is reused when the column holds exactly the same Python types as last time and, for integer columns,
+        the values still need the same integer width. Any conflict falls back to a full scan with `sql_type()`, whose result
+        replaces the cached entry. Only scalar columns are cached; STRUCT and LIST columns are always fully scanned.
+        If `type_sample_confidence` is set, the Python types are read from a sample of the column sized for that confidence,
+        so a value of a type the sample missed is cast by DuckDB on insert, which raises an error if the cast is not possible.
+
+        `table_name` : str
+            Name of the table the column belongs to.
+
+        `column_name` : str
+            Name of the column.
+
+        `input_list` : list
+            The column data.
+
+        Return: tuple
+            The DuckDB type string and the coerced list, as returned by `sql_type()`.
+        """
+        sample_size = None
+        if self.type_sample_confidence is not None:
+            sample_size = sample_size_for_confidence(self.type_sample_confidence)
+        col_types = value_types(input_list, sample_size)
+
+        numeric = all(issubclass(t, (int, float)) for t in col_types)
+        cached = self.schema_cache.get((table_name, column_name))
+        if cached is not None and cached[1] == col_types:
+            if cached[0] == " VARCHAR":
+                # strings that are all "Infinity"/"NaN" next to numbers would make the column DOUBLE
+                special_floats = ["Infinity", "-Infinity", "NaN"]
+                if not all(issubclass(t, (int, float, str)) for t in col_types) or \
+                        any(isinstance(x, str) and x not in special_floats for x in input_list):
+                    return cached[0], [None if x is None else str(x) for x in input_list]
+            elif numeric and any(issubclass(t, float) for t in col_types):
+                return cached[0], [None if x is None else float(x) for x in input_list]
+            elif numeric:
+                try:
+                    col_type, col_list = self.integer_type(input_list)
+                    if col_type == cached[0]:
+                        return col_type, col_list
+                except TypeError: # a value the sample missed is not an int
+                    pass
+
+        col_type, col_list = self.sql_type(input_list)
+        if col_type == " VARCHAR" or (numeric and col_types):
+            self.schema_cache[(table_name, column_name)] = (col_type, col_types)
+        return col_type, col_list
     
     def duckdb_compatible_name(self, name):
         pattern = r"^[A-Za-z_][A-Za-z_0-9_]*$"
@@ -201,7 +309,26 @@ class DuckDB(Filesystem):
                 raise duckdb.Error(e)
             self.types = types
 
-    
+    def arrow_table_helper(self, properties):
+        """
+        **Internal use only. Do not call**
+
+        Converts the column buffers of a table into a pyarrow Table so they can be registered with DuckDB and
+        inserted with a single ``INSERT ... SELECT`` instead of row by row.
+
+        `properties` : dict
+            Column names mapped to the data lists returned by `sql_type()`.
+
+        Return: pyarrow.Table or None
+            Columns are named ``c0, c1, ...`` in the order of `properties`.
+            Returns None if a column cannot be represented as a single Arrow type, in which case the caller inserts rows directly.
+        """
+        try:
+            arrays = [pa.array(col_list) for col_list in properties.values()]
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            return None
+        return pa.Table.from_arrays(arrays, names=[f"c{i}" for i in range(len(arrays))])
+
     def ingest_artifacts(self, collection, isVerbose=False):    
         """
         Primary function to ingest a collection of tables into the defined DuckDB database.
@@ -306,26 +433,27 @@ class DuckDB(Filesystem):
             sql_table = tableName.replace(' ', '_').replace('-', '_')
             types.name = self.duckdb_compatible_name(sql_table)
 
-            foreign_query = ""
-            for key in tableData:
-                sql_key = key.replace('-', '_')
-                sql_key = self.duckdb_compatible_name(re.sub(r'[\r\n]+', ' ', sql_key))
-                comboTuple = (tableName, key)
-                dsi_name = "dsi_relations"
-                if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["foreign_key"]:
-                    foreignIndex = artifacts[dsi_name]["foreign_key"].index(comboTuple)
-                    primaryTuple = artifacts[dsi_name]['primary_key'][foreignIndex]
-                    primary_table = self.duckdb_compatible_name(primaryTuple[0].replace(' ', '_').replace('-', '_'))
-                    primary_col = self.duckdb_compatible_name(re.sub(r'[\r\n]+', ' ', primaryTuple[1].replace('-', '_')))
-                    foreign_query += f", FOREIGN KEY ({sql_key}) REFERENCES {primary_table} ({primary_col})"
+            with span("type_inference", table=tableName, columns=len(tableData)):
+                foreign_query = ""
+                for key in tableData:
+                    sql_key = key.replace('-', '_')
+                    sql_key = self.duckdb_compatible_name(re.sub(r'[\r\n]+', ' ', sql_key))
+                    comboTuple = (tableName, key)
+                    dsi_name = "dsi_relations"
+                    if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["foreign_key"]:
+                        foreignIndex = artifacts[dsi_name]["foreign_key"].index(comboTuple)
+                        primaryTuple = artifacts[dsi_name]['primary_key'][foreignIndex]
+                        primary_table = self.duckdb_compatible_name(primaryTuple[0].replace(' ', '_').replace('-', '_'))
+                        primary_col = self.duckdb_compatible_name(re.sub(r'[\r\n]+', ' ', primaryTuple[1].replace('-', '_')))
+                        foreign_query += f", FOREIGN KEY ({sql_key}) REFERENCES {primary_table} ({primary_col})"
                 
-                col_type, col_list = self.sql_type(tableData[key])
-                types.properties[sql_key] = col_list
+                    col_type, col_list = self.infer_column_type(types.name, sql_key, tableData[key])
+                    types.properties[sql_key] = col_list
                 
-                if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["primary_key"]:
-                    types.unit_keys.append(sql_key + col_type + " PRIMARY KEY")
-                else:
-                    types.unit_keys.append(sql_key + col_type)
+                    if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["primary_key"]:
+                        types.unit_keys.append(sql_key + col_type + " PRIMARY KEY")
+                    else:
+                        types.unit_keys.append(sql_key + col_type)
             
             self.ingest_table_helper(types, foreign_query)
             
@@ -343,13 +471,28 @@ class DuckDB(Filesystem):
                 if isVerbose:
                     print(str_query)
                 
-                rows = zip(*types.properties.values())
-                try:
-                    self.cur.executemany(str_query,rows)
-                except duckdb.Error as e:
-                    self.cur.execute("ROLLBACK")
-                    self.cur.execute("CHECKPOINT")
-                    raise duckdb.Error(e)
+                with span("insert", table=tableName, rows=collection_rows({tableName: types.properties})):
+                    try:
+                        arrow_data = self.arrow_table_helper(types.properties)
+                        if arrow_data is None:
+                            rows = zip(*types.properties.values())
+                            self.cur.executemany(str_query,rows)
+                        else:
+                            self.cur.register("dsi_arrow_ingest", arrow_data)
+                            try:
+                                select_cols = ', '.join(f'"{c}"' for c in arrow_data.column_names)
+                                if self.runTable:
+                                    select_cols = f"{run_id}, {select_cols}"
+                                    insert_query = "INSERT INTO {} (run_id, {}) SELECT {} FROM dsi_arrow_ingest;".format(str(types.name), col_names, select_cols)
+                                else:
+                                    insert_query = "INSERT INTO {} ({}) SELECT {} FROM dsi_arrow_ingest;".format(str(types.name), col_names, select_cols)
+                                self.cur.execute(insert_query)
+                            finally:
+                                self.cur.unregister("dsi_arrow_ingest")
+                    except duckdb.Error as e:
+                        self.cur.execute("ROLLBACK")
+                        self.cur.execute("CHECKPOINT")
+                        raise duckdb.Error(e)
                 
             self.types = types # This will only copy the last table from artifacts (collections input)            
 
@@ -379,14 +522,16 @@ class DuckDB(Filesystem):
             self.cur.execute("ROLLBACK")
             self.cur.execute("FORCE CHECKPOINT")
             raise duckdb.Error(e)
+        self.stats_changed_helper(list(artifacts.keys()) + ["runTable", "dsi_units"])
 
     
-    def query_artifacts(self, query, isVerbose=False, dict_return = False, **kwargs):
+    def query_artifacts(self, query, isVerbose=False, dict_return = False, arrow_return = False, stream = False, chunk_rows = 100000, **kwargs):
         """
         Executes a SQL query on the DuckDB backend.
 
         Supports:
-        - SELECT / PRAGMA: returns DataFrame or OrderedDict depending on dict_return
+        - SELECT / PRAGMA: returns DataFrame, OrderedDict, Arrow record batches or an iterator of DataFrames 
+          depending on dict_return, arrow_return and stream
         - UPDATE / ALTER: executes command and returns None
 
         `query` : str
@@ -399,17 +544,49 @@ class DuckDB(Filesystem):
         `dict_return` : bool, optional, default=False
             If True, returns the result as an OrderedDict.
             If False, returns the result as a pandas DataFrame.
+
+        `arrow_return` : bool, optional, default=False
+            If True, returns the result as a pyarrow.RecordBatchReader that streams record batches straight from DuckDB
+            without building a DataFrame. Cannot be combined with `dict_return`.
+
+        `stream` : bool, optional, default=False
+            If True, returns an iterator of DataFrames read chunk by chunk from a database cursor, 
+            so only one chunk is held in memory at a time. Cannot be combined with `dict_return`.
+            If `arrow_return` is also True, the RecordBatchReader yields record batches of `chunk_rows` rows instead.
+
+        `chunk_rows` : int, optional, default=100000
+            Only used when `stream` is True. Number of rows per chunk. 
+            DataFrame chunks are rounded up to a multiple of DuckDB's 2048-row vector size.
         
-        Return : pandas.DataFrame or OrderedDict or None
+        Return : pandas.DataFrame or OrderedDict or pyarrow.RecordBatchReader or iterator of pandas.DataFrame or None
             - If `query` includes UPDATE or ALTER: returns nothing
+            - If `arrow_return` is True: returns a RecordBatchReader
+            - If `stream` is True: returns an iterator of DataFrames
             - If `dict_return` is False: returns a DataFrame
             - If `dict_return` is True: returns an OrderedDict
         """
+        if dict_return and (arrow_return or stream):
+            raise ValueError("Cannot set dict_return together with arrow_return or stream")
         data = None
         command = query.strip().split(None, 1)[0].lower()
         if command in {"select", "pragma"}:
             try:
-                data = self.cur.execute(query).fetch_df()
+                if arrow_return or stream:
+                    # separate cursor so the result stays valid while other queries run on self.cur
+                    result = self.con.cursor().execute(query)
+                    if isVerbose:
+                        print(query)
+                    if not arrow_return:
+                        return self.stream_helper(result, chunk_rows)
+                    batch_rows = chunk_rows if stream else 1000000
+                    if hasattr(result, "to_arrow_reader"):
+                        return result.to_arrow_reader(batch_rows)
+                    return result.fetch_record_batch(batch_rows)
+                with span("sql"):
+                    result = self.cur.execute(query)
+                with span("to_dataframe") as convert_span:
+                    data = result.fetch_df()
+                    convert_span.set(rows=len(data), bytes=frame_bytes(data))
                 if isVerbose:
                     print(data)
             except Exception as e:
@@ -419,6 +596,10 @@ class DuckDB(Filesystem):
                     print(f"WARNING: {table_name} in this database")
                     if dict_return:
                         return OrderedDict()
+                    if arrow_return:
+                        return pa.RecordBatchReader.from_batches(pa.schema([]), [])
+                    if stream:
+                        return iter([])
                     return pd.DataFrame()
                 raise
         elif command in {"update", "alter"}:
@@ -428,6 +609,8 @@ class DuckDB(Filesystem):
                 self.cur.execute(query, query_params)
                 self.cur.execute("COMMIT")
                 self.cur.execute("FORCE CHECKPOINT")
+                updated = self.updated_table_helper(query) if command == "update" else None
+                self.stats_changed_helper([updated] if updated else None)
                 return None
             except duckdb.Error:
                 try:
@@ -444,11 +627,31 @@ class DuckDB(Filesystem):
             if len(tables) > 1:
                 raise RuntimeError("Can only return ordered dictionary if querying one table")
             
-            return OrderedDict(data.to_dict(orient='list'))
+            with span("to_dict", rows=len(data)):
+                return OrderedDict(data.to_dict(orient='list'))
         else:
             return data
     
-    def get_table(self, table_name, dict_return = False):
+    def stream_helper(self, result, chunk_rows):
+        """
+        **Internal use only. Do not call**
+
+        Yields the rows of an executed DuckDB query as DataFrames of about `chunk_rows` rows, 
+        converted the same way as `fetchdf()` so column types match the non-streaming result.
+        An empty result yields one empty DataFrame that still carries the column names.
+        """
+        vectors_per_chunk = max(1, -(-chunk_rows // 2048))
+        first = True
+        while True:
+            chunk = result.fetch_df_chunk(vectors_per_chunk)
+            if chunk.empty and not first:
+                break
+            first = False
+            yield chunk
+            if chunk.empty:
+                break
+
+    def get_table(self, table_name, dict_return = False, arrow_return = False):
         """
         Retrieves all data from a specified table without requiring knowledge of SQL.
         
@@ -461,11 +664,15 @@ class DuckDB(Filesystem):
             If True, returns the result as an OrderedDict.
             If False, returns the result as a pandas DataFrame.
 
-        Return : pandas.DataFrame or OrderedDict
+        `arrow_return` : bool, optional, default=False
+            If True, returns the result as a pyarrow.RecordBatchReader. Cannot be combined with `dict_return`.
+
+        Return : pandas.DataFrame or OrderedDict or pyarrow.RecordBatchReader
+            - If `arrow_return` is True: returns a RecordBatchReader
             - If `dict_return` is False: returns a DataFrame
             - If `dict_return` is True: returns an OrderedDict
         """
-        return self.query_artifacts(query=f"SELECT * FROM {table_name}", dict_return=dict_return)
+        return self.query_artifacts(query=f"SELECT * FROM {table_name}", dict_return=dict_return, arrow_return=arrow_return)
     
     def get_table_names(self, query):
         """
@@ -926,6 +1133,33 @@ class DuckDB(Filesystem):
         df = df.astype(object).where(df.notna(), None)
         return df
     
+    def stats_changed_helper(self, tables = None):
+        """
+        **Internal use only. Do not call**
+
+        Increments the change counter of `tables` in the statistics catalog, if there is one, after a write to them was committed.
+
+        `tables` : list of str, optional
+            Names of the changed tables, quoted or not. If None, every table is marked as changed.
+        """
+        if self.stats_catalog is not None:
+            self.stats_catalog.bump(tables)
+
+    def updated_table_helper(self, query):
+        """
+        **Internal use only. Do not call**
+
+        Returns the name of the table an UPDATE `query` writes to, as stored in the database, or None if it cannot be identified.
+        The name in the query is matched case-insensitively and without quotes or a schema prefix.
+        """
+        name = updated_table(query)
+        if name is None:
+            return None
+        tables = self.cur.execute("""SELECT table_name FROM information_schema.tables
+                                             WHERE table_schema = 'main' AND table_type = 'BASE TABLE'""").fetchall()
+        matches = [t[0] for t in tables if t[0].lower() == name.lower()]
+        return matches[0] if len(matches) == 1 else None
+
     def summary(self, table_name = None):
         """
         Returns numerical metadata from tables in the first activated backend.
@@ -964,37 +1198,75 @@ class DuckDB(Filesystem):
 
         Generates and returns summary metadata for a specific table in the DuckDB backend.
         """
-        col_info = self.cur.execute(f"PRAGMA table_info({table_name})").fetchall()
+        headers = ['column', 'type', 'unique', 'min', 'max', 'avg', 'std_dev']
+        rows = self.column_stats_helper(table_name)
+        return headers, [row[:7] for row in rows]
+
+    def column_stats(self, table_name):
+        """
+        Returns the statistics of every column of a table: the `summary()` metadata plus the number of non-null and null values.
 
+        `table_name` : str
+            Name of the table.
+
+        Return: pandas.DataFrame
+            One row per column, with the columns 'column', 'type', 'unique', 'min', 'max', 'avg', 'std_dev', 'count' and 'null_count'.
+        """
+        table_name = self.duckdb_compatible_name(table_name.replace(' ', '_'))
+        duckdb_table_name = table_name[1:-1] if table_name[0] == '"' and table_name[-1] == '"' else table_name
+        if self.cur.execute(f"""SELECT COUNT(*) FROM information_schema.tables 
+                            WHERE table_name = '{duckdb_table_name}'""").fetchone()[0] == 0:
+            raise ValueError(f"'{table_name}' does not exist in this DuckDB database")
+        return pd.DataFrame(self.column_stats_helper(table_name), columns=STAT_FIELDS, dtype=object)
+
+    def column_stats_helper(self, table_name):
+        """
+        **Internal use only. Do not call**
+
+        Returns the statistics of every column of `table_name` as lists ordered like `dsi.utils.stats_catalog.STAT_FIELDS`.
+        With a statistics catalog, they are read from it if the table did not change since they were stored, and stored otherwise.
+        """
+        key = table_name[1:-1] if table_name[0] == '"' and table_name[-1] == '"' else table_name
+        rows = self.stats_catalog.get(key) if self.stats_catalog is not None else None
+        if rows is None:
+            rows = self.compute_stats_helper(table_name)
+            if self.stats_catalog is not None:
+                self.stats_catalog.put(key, rows)
+        return rows
+
+    def compute_stats_helper(self, table_name):
+        """
+        **Internal use only. Do not call**
+
+        Computes the column statistics of `table_name` in one table scan per 100 columns.
+        """
+        col_info = self.cur.execute(f"PRAGMA table_info({table_name})").fetchall()
         numeric_types = {'INTEGER', 'REAL', 'FLOAT', 'NUMERIC', 'DECIMAL', 'DOUBLE', 'BIGINT'}
-        headers = ['column', 'type', 'unique', 'min', 'max', 'avg', 'std_dev']
         rows = []
 
-        for col in col_info:
-            col_name = col[1]
-            col_type = col[2].upper()
-            unique_vals = self.cur.execute(f"SELECT COUNT(DISTINCT {self.duckdb_compatible_name(col_name)}) FROM {table_name};").fetchone()[0]
-            is_primary = col[5] > 0
-            display_name = f"{col_name}*" if is_primary else col_name
-
-            if col_type in numeric_types:
-                min_val, max_val, avg_val, std_dev = self.cur.execute(f"""
-                    SELECT
-                        MIN("{col_name}"),
-                        MAX("{col_name}"),
-                        AVG("{col_name}"),
-                        STDDEV_SAMP("{col_name}")
-                    FROM {table_name}
-                    WHERE "{col_name}" IS NOT NULL
-                """).fetchone()
-            else:
-                min_val = max_val = avg_val = std_dev = None
-            
-            if avg_val is not None and std_dev is None:
-                std_dev = 0
-            rows.append([display_name, col_type, unique_vals, min_val, max_val, avg_val, std_dev])
+        for start in range(0, len(col_info), 100):
+            batch = col_info[start:start + 100]
+            numeric = [col[2].upper() in numeric_types for col in batch]
+            exprs = ["COUNT(*)"]
+            for col, is_numeric in zip(batch, numeric):
+                exprs += [f"COUNT(DISTINCT {self.duckdb_compatible_name(col[1])})", f'COUNT("{col[1]}")']
+                if is_numeric:
+                    exprs += [f'MIN("{col[1]}")', f'MAX("{col[1]}")', f'AVG("{col[1]}")', f'STDDEV_SAMP("{col[1]}")']
+            values = iter(self.cur.execute(f"SELECT {', '.join(exprs)} FROM {table_name};").fetchone())
+            num_rows = next(values)
+
+            for col, is_numeric in zip(batch, numeric):
+                unique_vals, count = next(values), next(values)
+                if is_numeric:
+                    min_val, max_val, avg_val, std_dev = next(values), next(values), next(values), next(values)
+                else:
+                    min_val = max_val = avg_val = std_dev = None
+                if avg_val is not None and std_dev is None:
+                    std_dev = 0
+                display_name = f"{col[1]}*" if col[5] > 0 else col[1]
+                rows.append([display_name, col[2].upper(), unique_vals, min_val, max_val, avg_val, std_dev, count, num_rows - count])
 
-        return headers, rows
+        return rows
 
     def overwrite_table(self, table_name, collection):
         """
@@ -1072,6 +1344,7 @@ class DuckDB(Filesystem):
         for table_name in ordered_tables:
             temp_name = table_name[1:-1] if table_name[0] == '"' and table_name[-1] == '"' else table_name
             self.con.execute(f'DROP TABLE IF EXISTS "{temp_name}" CASCADE')
+        self.stats_changed_helper(list(ordered_tables))
 
         temp_runTable_bool = self.runTable
         self.runTable = False
@@ -1163,4 +1436,6 @@ class DuckDB(Filesystem):
 
         Return: None
         """
-        self.con.close()
\ No newline at end of file
+        self.con.close()
+        if self.stats_catalog is not None:
+            self.stats_catalog.close()
\ No newline at end of file
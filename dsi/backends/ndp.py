@@ -5,12 +5,14 @@ Read-only backend that pulls metadata from CKAN-based NDP instances
 and exposes it as in-memory DSI tables: datasets and resources.
 """
 
-import requests
 import pandas as pd
 from collections import OrderedDict
 from urllib.parse import urlparse
 
-from dsi.backends.webserver import Webserver
+import re
+import sqlite3
+from dsi.backends.webserver import Webserver, CacheEngine
+from dsi.utils.http_client import HttpClient, default_cache_dir
 
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -79,6 +81,20 @@ class NDP(Webserver):
                 API key for authentication
             - verify_ssl : bool, optional
                 Toggle SSL verification (default False)
+            - page_size : int, optional
+                Datasets requested per CKAN page. Pages after the first are fetched concurrently (default 100)
+            - max_workers : int, optional
+                Pooled connections and concurrent page requests (default 8)
+            - retries : int, optional
+                Retries with exponential backoff for failed requests (default 3)
+            - cache_dir : str, optional
+                Folder for cached CKAN responses (default ~/.cache/dsi/ndp). Set `use_cache` False to disable the cache
+            - cache_ttl : float, optional
+                Seconds a cached response is reused before it is revalidated with CKAN using its ETag (default 600)
+            - use_cache : bool, optional
+                Toggle the on-disk response cache (default True, or False if `api_key` is set).
+                Cached responses are stored unencrypted, readable by the owner only, so responses to requests made
+                with `api_key` are only cached if `use_cache` is set to True explicitly
         """
         DEFAULT_URL = "https://nationaldataplatform.org/catalog"
 
@@ -100,6 +116,19 @@ class NDP(Webserver):
         if self.api_key:
             self.headers["Authorization"] = self.api_key
 
+        self.page_size = kwargs.get("page_size", 100)
+        cache_dir = kwargs.get("cache_dir") or default_cache_dir("ndp")
+        self.client = HttpClient(
+            headers=self.headers,
+            verify=self.verify_ssl,
+            timeout=kwargs.get("timeout", 30),
+            retries=kwargs.get("retries", 3),
+            backoff=kwargs.get("backoff", 0.5),
+            pool_size=kwargs.get("max_workers", 8),
+            cache_dir=cache_dir if kwargs.get("use_cache", not self.api_key) else None,
+            cache_ttl=kwargs.get("cache_ttl", 600)
+        )
+
         # Data storage (tiered structure)
         # Tier 1: datasets, Tier 2: per-dataset resource tables
         self._cache = OrderedDict()
@@ -107,6 +136,9 @@ class NDP(Webserver):
         self._dataset_id_map = {}
         self._dataset_title_map = {}
 
+        # Embedded SQL engine over the cached tables, rebuilt after each fetch
+        self._sql = CacheEngine()
+
         self._loaded = False
         self.params = params or {}
 
@@ -146,15 +178,7 @@ class NDP(Webserver):
         try:
             test_url = f"{self.base_url}/api/3/action/status_show"
             
-            response = requests.get(
-                test_url,
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=2
-            )
-            
-            response.raise_for_status()
-            data = response.json()
+            data = self.client.get_json(test_url, use_cache=False, retries=0, timeout=2)
             
             if not data.get("success"):
                 raise RuntimeError(
@@ -212,7 +236,7 @@ class NDP(Webserver):
                 - formats : list, optional
                 - limit : int, optional
         """
-        query_params = {"rows": params.get("limit", 100)}
+        query_params = {}
 
         q_parts, fq_parts = [], []
 
@@ -235,9 +259,9 @@ class NDP(Webserver):
         if fq_parts:
             query_params["fq"] = " AND ".join(fq_parts)
 
-        result = self._request("package_search", query_params)
+        datasets = self._package_search(query_params, params.get("limit", 100))
 
-        dataset_rows, resource_map, id_map = self._extract_tables(result.get("results", []))
+        dataset_rows, resource_map, id_map = self._extract_tables(datasets)
 
         # Tier 1: datasets
         self._cache["datasets"] = self._rows_to_table(dataset_rows)
@@ -252,6 +276,7 @@ class NDP(Webserver):
             self._cache[table_name] = self._rows_to_table(rows)
             self._resource_tables.append(table_name)
 
+        self._sql.invalidate()
         self._loaded = True
 
 
@@ -321,22 +346,74 @@ class NDP(Webserver):
         dict
             Result data from CKAN API response
         """
+        return self._request_many(endpoint, [params])[0]
+
+
+    def _request_many(self, endpoint, params_list):
+        """
+        Execute several GET requests against one CKAN API endpoint concurrently.
+
+        Parameters
+        ----------
+        `endpoint` : str
+            CKAN API endpoint name
+        `params_list` : list of dict
+            Query parameters of each request
+
+        Returns
+        -------
+        list
+            Result data of each CKAN API response, in the order of `params_list`
+        """
         url = f"{self.base_url}/api/3/action/{endpoint}"
 
-        r = requests.get(
-            url,
-            params=params,
-            headers=self.headers,
-            verify=self.verify_ssl
-        )
+        results = []
+        for data in self.client.get_json_many(url, params_list):
+            if not data.get("success"):
+                raise RuntimeError(f"CKAN API failure at {endpoint}: {data}")
+            results.append(data["result"])
 
-        r.raise_for_status()
-        data = r.json()
+        return results
 
-        if not data.get("success"):
-            raise RuntimeError(f"CKAN API failure at {endpoint}: {data}")
 
-        return data["result"]
+    def _package_search(self, query_params, limit):
+        """
+        Page through CKAN package_search with `start`/`rows` until `limit` datasets are collected.
+
+        The first page reports the total match count, then all remaining pages are fetched concurrently.
+
+        Parameters
+        ----------
+        `query_params` : dict
+            package_search parameters other than `start` and `rows`
+        `limit` : int
+            Maximum number of datasets to return
+
+        Returns
+        -------
+        list
+            Dataset dictionaries in CKAN's result order
+        """
+        page_size = max(1, min(self.page_size, limit)) if limit > 0 else 0
+        first = self._request("package_search", {**query_params, "start": 0, "rows": page_size})
+        datasets = first.get("results", [])
+
+        total = min(limit, first.get("count", len(datasets)))
+        if page_size and len(datasets) == page_size and total > page_size:
+            pages = [{**query_params, "start": start, "rows": min(page_size, total - start)}
+                     for start in range(page_size, total, page_size)]
+            for result in self._request_many("package_search", pages):
+                datasets.extend(result.get("results", []))
+
+        # results can shift between pages if the catalog changes mid-search
+        seen = set()
+        unique = []
+        for ds in datasets:
+            key = ds.get("id") or id(ds)
+            if key not in seen:
+                seen.add(key)
+                unique.append(ds)
+        return unique[:limit]
 
 
     def _extract_tables(self, datasets):
@@ -466,7 +543,7 @@ class NDP(Webserver):
         
         if dict_return:
             return table
-        return pd.DataFrame(table)
+        return self._sql.frame(resolved_name, table).copy()
 
     
     def get_schema(self):
@@ -518,8 +595,6 @@ class NDP(Webserver):
         if not self._loaded:
             return []
         
-        import re
-        
         pattern = r'\b[a-zA-Z_][a-zA-Z0-9_-]*\b'
         words = re.findall(pattern, query)
         
@@ -538,10 +613,13 @@ class NDP(Webserver):
     # ----------------------------------------------------------------------
     def query_artifacts(self, query, dict_return=True, **kwargs):
         """
-        Query all tables using a pandas query string.
+        Query all tables using a pandas query string, or a SQL SELECT statement.
+
+        SQL statements run in an embedded SQLite engine that holds a copy of the cached tables.
+        Resource table names are dataset titles, so they must be double quoted in SQL.
 
         `query` : str
-            Pandas query string for filtering data
+            Pandas query string for filtering data, or a SQL SELECT statement
         `dict_return` : bool, optional, default True
             If True, returns dict format.
             If False, returns pandas DataFrames.
@@ -550,15 +628,22 @@ class NDP(Webserver):
             Additional keyword arguments
 
         Return : dict
-            Dictionary mapping table names to query results
+            Dictionary mapping table names to query results.
+            A SQL statement returns one pandas DataFrame instead.
         """
         if not self._loaded:
             raise RuntimeError("No data loaded. Cannot query empty backend.")
 
+        if re.match(r"\s*(select|with)\b", query, re.IGNORECASE):
+            try:
+                return self._sql.read_sql(query, self._cache)
+            except (pd.errors.DatabaseError, sqlite3.Error) as e:
+                raise ValueError(f"Query error: {e}")
+
         results = {}
 
         for t_name, table in self._cache.items():
-            df = pd.DataFrame(table)
+            df = self._sql.frame(t_name, table)
 
             if df.empty:
                 continue
@@ -625,22 +710,25 @@ class NDP(Webserver):
 
             for url in urls:
                 try:
-                    r = requests.head(
+                    r = self.client.request(
+                        "HEAD",
                         url,
                         allow_redirects=True,
                         headers=headers,
                         timeout=10,
-                        verify=self.verify_ssl
+                        retries=0
                     )
 
                     if r.status_code == 405:
-                        r = requests.get(
+                        r = self.client.request(
+                            "GET",
                             url,
                             stream=True,
                             headers=headers,
                             timeout=10,
-                            verify=self.verify_ssl
+                            retries=0
                         )
+                        r.close()
 
                     valid_list.append(200 <= r.status_code < 400)
 
@@ -649,6 +737,8 @@ class NDP(Webserver):
 
             table["url_valid"] = valid_list
 
+        self._sql.invalidate(self._resource_tables)
+
 
     # ----------------------------------------------------------------------
     # Find Methods
@@ -792,9 +882,10 @@ class NDP(Webserver):
                 continue
 
             cols = list(table_data.keys())
-            rows = zip(*table_data.values())
 
-            for row_idx, row in enumerate(rows):
+            # the SQL engine narrows the search to rows that may match
+            for row_idx in self._sql.find_rows(table_name, table_data, query_object):
+                row = [table_data[col][row_idx] for col in cols]
                 for col_idx, cell in enumerate(row):
 
                     match = False
@@ -849,7 +940,7 @@ class NDP(Webserver):
             return list(self._cache.keys())
 
         for name, table in self._cache.items():
-            df = pd.DataFrame(table)
+            df = self._sql.frame(name, table)
             
             if name in self._resource_tables:
                 dataset_id = self._dataset_title_map.get(name, "N/A")
@@ -881,7 +972,7 @@ class NDP(Webserver):
             if not table:
                 raise ValueError(f"Table '{resolved_name}' is empty")
             
-            df = pd.DataFrame(table)
+            df = self._sql.frame(resolved_name, table)
             
             summary_dict = {
                 "table_name": resolved_name,
@@ -900,7 +991,7 @@ class NDP(Webserver):
         summary_dfs = []
         
         for name, table in self._cache.items():
-            df = pd.DataFrame(table)
+            df = self._sql.frame(name, table)
             
             summary_dict = {
                 "table_name": name,
@@ -945,7 +1036,7 @@ class NDP(Webserver):
         if not table:
             raise ValueError(f"Table '{resolved_name}' is empty")
 
-        df = pd.DataFrame(table)
+        df = self._sql.frame(resolved_name, table).copy(deep=False)
 
         if display_cols:
             missing_cols = set(display_cols) - set(df.columns)
@@ -988,6 +1079,8 @@ class NDP(Webserver):
         self._dataset_id_map = {}
         self._dataset_title_map = {}
         self._loaded = False
+        self._sql.close()
+        self.client.close()
 
 
     # ----------------------------------------------------------------------
@@ -6,18 +6,29 @@ data catalog and exposes it as in-memory DSI tables: datasets and resources.
 """
 
 import re
+import sqlite3
+import sys
 import operator
 import pandas as pd
 from pathlib import Path
+from contextlib import closing
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
-from dsi.backends.webserver import Webserver
+from dsi.backends.webserver import Webserver, CacheEngine
 
 import urllib3
 from urllib.parse import urljoin
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# T2 DBs larger than this many bytes are only downloaded after the user confirms
+T2_DOWNLOAD_LIMIT = 10485760
+
+# SQL string literals and comments (no groups), or an identifier: double quoted, backticked, bracketed or bare
+SQL_TOKEN = re.compile(r"""'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/"""
+                       r'''|"((?:[^"]|"")+)"|`([^`]+)`|\[([^\]]+)\]|(?<![\w$])([A-Za-z_][\w$]*)''', re.DOTALL)
+
 # ----------------------------------------------------------------------
 # Value Object (used for search results)
 # ----------------------------------------------------------------------
@@ -80,6 +91,20 @@ class Oceans11(Webserver):
             Additional keyword arguments:
             
             - workspace : str, optional
+                Folder where the catalog and T2 databases are downloaded.
+            - lazy : bool, optional, default False
+                If True, T2 databases stay on disk and are ATTACHed to an in-process SQLite engine
+                the first time one of their tables is used, so memory does not grow with the
+                number of selected datasets.
+                If False, every T2 table is loaded into memory.
+            - max_attached : int, optional, default 10
+                Lazy mode only. Maximum number of T2 databases attached at once; the least
+                recently used one is detached when another is needed. 10 is SQLite's default limit.
+            - download_workers : int, optional, default 4
+                Number of T2 databases downloaded concurrently. Databases larger than the 10 MB download limit
+                are confirmed one at a time before any download starts.
+            - chunk_rows : int, optional, default 100000
+                Lazy mode only. Rows read at a time when a pandas query string filters a T2 table.
                     
         """         
         DEFAULT_URL = "https://oceans11.lanl.gov/dataCatalog/oceans11.db"
@@ -98,6 +123,11 @@ class Oceans11(Webserver):
             raise ValueError("Oceans11 catalog URL must be http or https")
 
         self.base_url = base_url.rstrip("/")
+        self.lazy = kwargs.get("lazy", False)
+        self.max_attached = kwargs.get("max_attached", 10)
+        self.download_workers = kwargs.get("download_workers", 4)
+        self._confirmed_downloads = set()
+        self.chunk_rows = kwargs.get("chunk_rows", 100000)
 
         # skip data retrieval if only checking connection to oceans11
         if kwargs.get("only_validate", False):
@@ -110,6 +140,14 @@ class Oceans11(Webserver):
         self._dataset_id_map = {}
         self._dataset_title_map = {}
 
+        # Lazy T2 tables: table name -> (T2 db path, table name inside that db)
+        self._t2_sources = OrderedDict()
+        # Embedded SQL engine over the cached tables, and the T2 dbs attached to it:
+        # db path -> (schema alias, view names), oldest first
+        self._sql = CacheEngine()
+        self._attached = OrderedDict()
+        self._num_attaches = 0
+
         self._loaded = False
         self.catalog_path = None # the local path for the T1 catalog. 
         self.params = params or {}
@@ -238,19 +276,27 @@ class Oceans11(Webserver):
 
         url_column = "t2db_url"
         # Download/load T2 DBs only for selected records
-        for record in unique_records:
-            t2db_url = record.get(url_column)
-
-            if not t2db_url:
-                continue
+        t2_records = [record for record in unique_records if record.get(url_column)]
+        t2_urls = [record[url_column] for record in t2_records]
+        if len(t2_urls) > 1 and self.download_workers > 1:
+            # download workers must not prompt at the same time, so large downloads are confirmed here first
+            self._confirm_t2_downloads(t2_urls)
+            with ThreadPoolExecutor(max_workers=min(self.download_workers, len(t2_urls))) as executor:
+                t2db_paths = list(executor.map(self._download_t2_db, t2_urls))
+        else:
+            t2db_paths = [self._download_t2_db(t2db_url) for t2db_url in t2_urls]
 
-            t2db_path = self._download_t2_db(t2db_url)
+        for record, t2db_path in zip(t2_records, t2db_paths):
             record["t2db_path"] = t2db_path
 
-            self._load_t2_tables(record, t2db_path)
+            if self.lazy:
+                self._register_t2_tables(record, t2db_path)
+            else:
+                self._load_t2_tables(record, t2db_path)
 
         # Tier 1: selected rows only
         self._cache["records"] = self._rows_to_table(unique_records)
+        self._reset_engine()
 
         self._dataset_id_map = {
             row.get("osti_id"): row
@@ -387,22 +433,46 @@ class Oceans11(Webserver):
     # ---------------------------------------------------
     # Data Load Helpers - T2
     # ---------------------------------------------------
+    def _t2_full_url(self, t2db_url):
+        return urljoin("https://oceans11.lanl.gov/dataCatalog/", t2db_url)
+
+    def _confirm_t2_downloads(self, t2db_urls):
+        """
+        Ask, one T2 DB at a time, whether T2 DBs above the download limit should be downloaded, so that
+        concurrent downloads do not prompt at the same time. Confirmed downloads do not prompt again.
+        The file sizes are requested concurrently.
+        """
+        from dsi.utils.federated.federate_datasets import confirm_large_download
+        from dsi.utils.web_utils import get_url_file_size
+
+        def size(t2db_url):
+            try:
+                return get_url_file_size(self._t2_full_url(t2db_url))
+            except Exception:
+                return 0 # the download reports the error
+
+        with ThreadPoolExecutor(max_workers=min(self.download_workers, len(t2db_urls))) as executor:
+            sizes = list(executor.map(size, t2db_urls))
+        for t2db_url, filesize in zip(t2db_urls, sizes):
+            if not confirm_large_download(filesize, T2_DOWNLOAD_LIMIT):
+                raise RuntimeError(f"Failed to download T2 DB: {self._t2_full_url(t2db_url)}")
+            self._confirmed_downloads.add(t2db_url)
+
     def _download_t2_db(self, t2db_url):
         """
         Download the T2 DBs identified from the search 
         """        
         from dsi.utils.federated.federate_datasets import pull_data
 
-        base_url = "https://oceans11.lanl.gov/dataCatalog/"
-
-        full_url = urljoin(base_url, t2db_url)
+        full_url = self._t2_full_url(t2db_url)
 
         info = pull_data(
             location_type="url",
             location=full_url,
             path=full_url,
             abs_path_workspace_folder=self.workspace,
-            host_username=""
+            username="",
+            download_limit=sys.maxsize if t2db_url in self._confirmed_downloads else T2_DOWNLOAD_LIMIT
         )
 
         if info is None or not info.get("local_path"):
@@ -443,6 +513,151 @@ class Oceans11(Webserver):
 
             self._resource_tables.append(cache_table_name)    
 
+    def _register_t2_tables(self, record, t2db_path):
+        """
+        Record the non-empty tables of a downloaded T2 DB without reading their rows.
+        They are attached to the SQL engine when first used.
+        """
+        dataset_key = (
+            record.get("osti_id")
+            or record.get("title")
+        )
+
+        with closing(sqlite3.connect(self._readonly_uri(t2db_path), uri=True)) as conn:
+            table_names = [
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+                )
+            ]
+            for table_name in table_names:
+                if conn.execute(f"SELECT 1 FROM {self._quote(table_name)} LIMIT 1").fetchone() is None:
+                    continue
+
+                cache_table_name = f"{dataset_key}_{table_name}"
+
+                self._t2_sources[cache_table_name] = (str(Path(t2db_path).resolve()), table_name)
+
+                self._resource_tables.append(cache_table_name)
+
+    # ---------------------------------------------------
+    # SQL Engine (cached tables and lazy T2 DBs)
+    # ---------------------------------------------------
+    def _readonly_uri(self, db_path):
+        return Path(db_path).resolve().as_uri() + "?mode=ro"
+
+    def _quote(self, name):
+        return CacheEngine.quote(name)
+
+    def _reset_engine(self):
+        """
+        Drop the SQL engine, including attached T2 DBs, so it is rebuilt from the current tables on next use.
+        """
+        self._sql.close()
+        self._attached.clear()
+
+    def _attach_tables(self, table_names):
+        """
+        Make sure the T2 DBs behind `table_names` are attached and each of their tables has a TEMP view
+        named after its DSI table name. Detaches the least recently used DBs to stay under `max_attached`.
+        """
+        conn = self._sql.connect()
+        paths = list(dict.fromkeys(self._t2_sources[name][0] for name in table_names if name in self._t2_sources))
+
+        if len(paths) > self.max_attached:
+            raise ValueError(f"Query uses tables from {len(paths)} T2 databases but only {self.max_attached} "
+                             "can be attached at once. Raise `max_attached` or split the query.")
+
+        for path in paths:
+            if path in self._attached:
+                self._attached.move_to_end(path)
+                continue
+
+            while len(self._attached) >= self.max_attached:
+                _, (old_alias, old_views) = self._attached.popitem(last=False)
+                for view in old_views:
+                    conn.execute(f"DROP VIEW temp.{self._quote(view)}")
+                conn.execute(f"DETACH DATABASE {old_alias}")
+
+            alias = f"t2db_{self._num_attaches}"
+            self._num_attaches += 1
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (self._readonly_uri(path),))
+
+            views = [name for name, (t2db_path, _) in self._t2_sources.items() if t2db_path == path]
+            for view in views:
+                source_table = self._t2_sources[view][1]
+                conn.execute(f"CREATE TEMP VIEW {self._quote(view)} AS "
+                             f"SELECT * FROM {alias}.{self._quote(source_table)}")
+            self._attached[path] = (alias, views)
+
+    def _read_sql(self, statement, table_names, chunksize=None):
+        """
+        Run `statement` in the SQL engine after loading the cached tables and attaching the T2 tables it uses.
+        Returns a DataFrame, or an iterator of DataFrames if `chunksize` is set.
+        """
+        self._sql.load({name: self._cache[name] for name in table_names if name in self._cache})
+        self._attach_tables(table_names)
+        return pd.read_sql_query(statement, self._sql.conn, chunksize=chunksize)
+
+    # ---------------------------------------------------
+    # Table Access (in-memory or lazy T2)
+    # ---------------------------------------------------
+    def _table_names(self):
+        """Names of all tables, lazy T2 tables included."""
+        return list(self._t2_sources) + list(self._cache)
+
+    def _sql_table_names(self, statement):
+        """
+        Names of the tables a SQL `statement` refers to. Identifiers are matched whole and case-insensitively, and
+        string literals and comments are skipped, so a query on 'runs_2' does not also use the table 'runs'.
+        """
+        identifiers = set()
+        for quoted, backtick, bracket, bare in SQL_TOKEN.findall(statement):
+            identifiers.add((quoted.replace('""', '"') or backtick or bracket or bare).lower())
+        return [name for name in self._table_names() if name.lower() in identifiers]
+
+    def _has_table(self, table_name):
+        return table_name in self._cache or table_name in self._t2_sources
+
+    def _table_data(self, table_name):
+        """
+        Return a table as a column-oriented OrderedDict. Lazy T2 tables are read from disk and not kept.
+        """
+        if table_name in self._cache:
+            return self._cache[table_name]
+
+        df = self._read_sql(f"SELECT * FROM {self._quote(table_name)}", [table_name])
+        return OrderedDict(df.to_dict(orient="list"))
+
+    def _iter_tables(self):
+        """Yield (table name, column-oriented table) pairs, reading lazy T2 tables one at a time."""
+        for table_name in self._table_names():
+            yield table_name, self._table_data(table_name)
+
+    def _table_frames(self, table_name):
+        """
+        Yield a table as DataFrames indexed by row position. Lazy T2 tables are read `chunk_rows` rows at a time.
+        """
+        if table_name in self._cache:
+            yield self._sql.frame(table_name, self._cache[table_name])
+            return
+
+        offset = 0
+        for chunk in self._read_sql(f"SELECT * FROM {self._quote(table_name)}", [table_name], chunksize=self.chunk_rows):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+    def _table_shape(self, table_name):
+        """Return (number of rows, column names) of a table without reading lazy T2 tables into memory."""
+        if table_name in self._cache:
+            df = self._sql.frame(table_name, self._cache[table_name])
+            return len(df), list(df.columns)
+
+        quoted = self._quote(table_name)
+        columns = list(self._read_sql(f"SELECT * FROM {quoted} LIMIT 0", [table_name]).columns)
+        num_rows = self._sql.conn.execute(f"SELECT COUNT(*) FROM {quoted}").fetchone()[0]
+        return num_rows, columns
+
     # ----------------------------------------------------------------------
     # Table Name Resolution
     # ----------------------------------------------------------------------
@@ -467,7 +682,7 @@ class Oceans11(Webserver):
         ValueError
             If the identifier cannot be resolved to a table
         """
-        if identifier in self._cache:
+        if self._has_table(identifier):
             return identifier
 
         if identifier in self._dataset_id_map:
@@ -577,7 +792,7 @@ class Oceans11(Webserver):
         """
         Prints the number of cached tables.
         """
-        num = len(self._cache)
+        num = len(self._table_names())
         print(f"{num} tables loaded")
 
     def get_table(self, table_name, dict_return=False):
@@ -595,15 +810,16 @@ class Oceans11(Webserver):
 
         resolved_name = self._resolve_table_name(table_name)
 
-        if resolved_name not in self._cache:
+        if not self._has_table(resolved_name):
             raise ValueError(f"Table '{table_name}' not found")
 
-        table = self._cache[resolved_name]
-
         if dict_return:
-            return table
+            return self._table_data(resolved_name)
+
+        if resolved_name in self._cache:
+            return self._sql.frame(resolved_name, self._cache[resolved_name]).copy()
 
-        return pd.DataFrame(table)
+        return self._read_sql(f"SELECT * FROM {self._quote(resolved_name)}", [resolved_name])
 
     def get_schema(self):
         """
@@ -613,7 +829,7 @@ class Oceans11(Webserver):
             Each table's structural schema is combined into one large string.
         """
         schema_lines = []
-        for table_name, table in self._cache.items():
+        for table_name, table in self._iter_tables():
             cols = []
             for col_name, values in table.items():
                 dtype = "TEXT"
@@ -659,7 +875,7 @@ class Oceans11(Webserver):
         
         found_tables = []
         for word in words:
-            if word in self._cache:
+            if self._has_table(word):
                 found_tables.append(word)
             elif word in self._dataset_id_map:
                 found_tables.append(self._dataset_id_map[word])
@@ -674,8 +890,12 @@ class Oceans11(Webserver):
         """
         Query all tables using a pandas query string.
 
+        `query` can also be a SQL SELECT statement. It runs in an embedded SQLite engine that holds a copy of
+        the cached tables named in the statement; in lazy mode, their T2 databases are attached instead.
+        Table names that do not start with a letter, e.g. '1234_runs', must be double quoted in SQL.
+
         `query` : str
-            Pandas query string for filtering data
+            Pandas query string for filtering data, or a SQL SELECT statement
         `dict_return` : bool, optional, default True
             If True, returns dict format.
             If False, returns pandas DataFrames.
@@ -684,39 +904,45 @@ class Oceans11(Webserver):
             Additional keyword arguments
 
         Return : dict
-            Dictionary mapping table names to query results
+            Dictionary mapping table names to query results.
+            A SQL statement returns one pandas DataFrame instead.
         """
         if not self._loaded:
             raise RuntimeError("No data loaded. Cannot query empty backend.")
 
+        if re.match(r"\s*(select|with)\b", query, re.IGNORECASE):
+            table_names = self._sql_table_names(query)
+            try:
+                return self._read_sql(query, table_names)
+            except (pd.errors.DatabaseError, sqlite3.Error) as e:
+                raise ValueError(f"Query error: {e}")
+
         table_name = kwargs.get("table_name")
 
         if table_name:
             resolved = self._resolve_table_name(table_name)
 
-            if resolved not in self._cache:
+            if not self._has_table(resolved):
                 raise ValueError(f"Table '{table_name}' not found")
 
-            tables = {resolved: self._cache[resolved]}
+            table_names = [resolved]
         else:
-            tables = self._cache
+            table_names = self._table_names()
 
         results = {}
 
-        for t_name, table in tables.items():
-            df = pd.DataFrame(table)
-
-            if df.empty:
-                continue
+        for t_name in table_names:
+            matches = []
 
             try:
-                result_df = df.query(query, engine="python")
+                for df in self._table_frames(t_name):
+                    if df.empty:
+                        continue
 
-                if not result_df.empty:
-                    results[t_name] = (
-                        result_df.to_dict(orient="list")
-                        if dict_return else result_df
-                    )
+                    result_df = df.query(query, engine="python")
+
+                    if not result_df.empty:
+                        matches.append(result_df)
 
             except pd.errors.UndefinedVariableError:
                 continue
@@ -724,6 +950,13 @@ class Oceans11(Webserver):
             except Exception as e:
                 raise ValueError(f"Query error in {t_name}: {e}")
 
+            if matches:
+                result_df = matches[0] if len(matches) == 1 else pd.concat(matches)
+                results[t_name] = (
+                    result_df.to_dict(orient="list")
+                    if dict_return else result_df
+                )
+
         if not results:
             raise ValueError(f"Query returned no results: '{query}'")
 
@@ -815,7 +1048,7 @@ class Oceans11(Webserver):
 
         results = []
 
-        for table_name, table in self._cache.items():
+        for table_name, table in self._iter_tables():
 
             columns = list(table.keys())
 
@@ -880,7 +1113,7 @@ class Oceans11(Webserver):
 
         query = str(query_object).lower()
 
-        for table_name in self._cache.keys():
+        for table_name in self._table_names():
             if query in table_name.lower():
                 results.append(
                     ValueObject(
@@ -921,7 +1154,7 @@ class Oceans11(Webserver):
 
         query = str(query_object).lower()
 
-        for table_name, table in self._cache.items():
+        for table_name, table in self._iter_tables():
 
             for col_name, values in table.items():
 
@@ -973,7 +1206,7 @@ class Oceans11(Webserver):
 
         query = str(query_object).lower()
 
-        for table_name, table in self._cache.items():
+        for table_name, table in self._iter_tables():
 
             columns = list(table.keys())
 
@@ -1064,7 +1297,7 @@ class Oceans11(Webserver):
 
         results = []
 
-        for table_name, table in self._cache.items():
+        for table_name, table in self._iter_tables():
 
             if column_name not in table:
                 continue
@@ -1123,15 +1356,15 @@ class Oceans11(Webserver):
         """
 
         if collection:
-            return list(self._cache.keys())
+            return self._table_names()
 
-        for name, table in self._cache.items():
-            df = pd.DataFrame(table)
+        for name in self._table_names():
+            num_rows, columns = self._table_shape(name)
 
             if name in self._resource_tables:
-                print(f"{name} [T2]: ({len(df)} rows, {len(df.columns)} cols)")
+                print(f"{name} [T2]: ({num_rows} rows, {len(columns)} cols)")
             else:
-                print(f"{name}: ({len(df)} rows, {len(df.columns)} cols)")
+                print(f"{name}: ({num_rows} rows, {len(columns)} cols)")
 
 
     def summary(self, table_name=None):
@@ -1152,18 +1385,16 @@ class Oceans11(Webserver):
 
         if table_name:
             resolved_name = self._resolve_table_name(table_name)
-            table = self._cache.get(resolved_name)
+            num_rows, columns = self._table_shape(resolved_name) if self._has_table(resolved_name) else (0, [])
 
-            if not table:
+            if not columns:
                 raise ValueError(f"Table '{resolved_name}' is empty or not found")
 
-            df = pd.DataFrame(table)
-
             summary_dict = {
                 "table_name": resolved_name,
-                "num_rows": len(df),
-                "num_columns": len(df.columns),
-                "columns": list(df.columns),
+                "num_rows": num_rows,
+                "num_columns": len(columns),
+                "columns": columns,
             }
 
             if resolved_name in self._resource_tables:
@@ -1176,14 +1407,14 @@ class Oceans11(Webserver):
         table_names = []
         summary_dfs = []
 
-        for name, table in self._cache.items():
-            df = pd.DataFrame(table)
+        for name in self._table_names():
+            num_rows, columns = self._table_shape(name)
 
             summary_dict = {
                 "table_name": name,
-                "num_rows": len(df),
-                "num_columns": len(df.columns),
-                "columns": list(df.columns),
+                "num_rows": num_rows,
+                "num_columns": len(columns),
+                "columns": columns,
                 "tier": "T2" if name in self._resource_tables else "T1",
             }
 
@@ -1217,12 +1448,19 @@ class Oceans11(Webserver):
 
         resolved_name = self._resolve_table_name(table_name)
 
-        table = self._cache.get(resolved_name)
+        if resolved_name in self._t2_sources:
+            # read only the displayed rows of a lazy T2 table
+            max_rows = self._table_shape(resolved_name)[0]
+            limit = f" LIMIT {int(num_rows)}" if num_rows else ""
+            df = self._read_sql(f"SELECT * FROM {self._quote(resolved_name)}{limit}", [resolved_name])
+        else:
+            table = self._cache.get(resolved_name)
 
-        if not table:
-            raise ValueError(f"Table '{resolved_name}' is empty")
+            if not table:
+                raise ValueError(f"Table '{resolved_name}' is empty")
 
-        df = pd.DataFrame(table)
+            df = pd.DataFrame(table)
+            max_rows = len(df)
 
         if display_cols:
             missing_cols = set(display_cols) - set(df.columns)
@@ -1236,7 +1474,7 @@ class Oceans11(Webserver):
             df = df[display_cols]
 
         # Store original row count before limiting rows
-        df.attrs["max_rows"] = len(df)
+        df.attrs["max_rows"] = max_rows
 
         if num_rows:
             df = df.head(num_rows)
@@ -1267,6 +1505,9 @@ class Oceans11(Webserver):
         Close Oceans11 backend and clear loaded state.
         """
 
+        self._reset_engine()
+        self._t2_sources.clear()
+
         self._cache.clear()
         self._resource_tables.clear()
         self._dataset_id_map.clear()
@@ -5,12 +5,18 @@ Read-only access that pulls metadata from REST-based OSTI backend
 and exposes it as an in-memory DSI table: records
 """
 
+import queue
+import re
+import sqlite3
+import time
 import requests
 import pandas as pd
 from urllib.parse import urlparse
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from dsi.backends.webserver import Webserver
+from dsi.backends.webserver import Webserver, CacheEngine
+from dsi.utils.http_client import HttpClient
 
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -97,6 +103,17 @@ class OSTI(Webserver):
                 API key for authentication
             - verify_ssl : bool, optional
                 Toggle SSL verification (default False)
+            - max_workers : int, optional
+                Queries in `params` fetched at the same time (default 4)
+            - max_records : int or None, optional
+                Records fetched per query. Queries without an explicit "page" are paged until this many records 
+                or the last page (default 1000). None pages every query to completion
+            - rate_limit : float or None, optional
+                Maximum requests per second sent to OSTI across all queries (default None, no limit beyond `max_workers`)
+            - retries : int, optional
+                Retries with exponential backoff for failed requests (default 3)
+
+        Per-query page counts, record counts and latencies of the last load are stored in `query_stats`.
         """        
 
         DEFAULT_URL = "https://www.osti.gov/api/v1"
@@ -120,8 +137,23 @@ class OSTI(Webserver):
         if self.api_key:
             self.headers["Authorization"] = self.api_key
 
+        self.max_workers = kwargs.get("max_workers", 4)
+        self.max_records = kwargs.get("max_records", 1000)
+        self.query_stats = []
+        self.client = HttpClient(
+            headers=self.headers,
+            verify=self.verify_ssl,
+            timeout=kwargs.get("timeout", 30),
+            retries=kwargs.get("retries", 3),
+            backoff=kwargs.get("backoff", 0.5),
+            pool_size=self.max_workers,
+            rate_limit=kwargs.get("rate_limit")
+        )
+
         # In-memory storage (DSI format)
         self._cache = OrderedDict()
+        # Embedded SQL engine over the cached tables, rebuilt after each fetch
+        self._sql = CacheEngine()
 
         self._loaded = False
         self.params = params or {}
@@ -162,17 +194,12 @@ class OSTI(Webserver):
             # test_url = f"{self.base_url}/records"
             test_url = self.base_url + "/records"
 
-            response = requests.get(
+            data = self.client.get_json(
                 test_url,
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=2,
-                params={"rows": 1}  # minimal request
-
+                params={"rows": 1},  # minimal request
+                retries=0,
+                timeout=2
             )
-            response.raise_for_status()
-
-            data = response.json()
 
             # OSTI returns a list of records for /records
             if not isinstance(data, list):
@@ -205,39 +232,80 @@ class OSTI(Webserver):
         else:
             raise TypeError("params must be a dict or a list of dicts")
 
-        all_records = []
+        # Queries run concurrently and push each page into a queue as it arrives, so records are 
+        # deduplicated while other queries are still fetching. Ranks keep the order of a serial fetch
+        pages = queue.Queue()
+        self.query_stats = [None] * len(query_list)
 
-        for query_params in query_list:
-            records = self._run_single_query(query_params)
-            all_records.extend(records)
+        def fetch(index, query_params):
+            start = time.perf_counter()
+            num_pages, num_records = 0, 0
+            try:
+                for page_num, records in enumerate(self._run_single_query(query_params)):
+                    pages.put((index, page_num, records))
+                    num_pages += 1
+                    num_records += len(records)
+            finally:
+                self.query_stats[index] = {"params": query_params, "pages": num_pages, "records": num_records,
+                                           "seconds": time.perf_counter() - start}
+                pages.put((index, None, None))
+
+        merged = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(query_list)))) as executor:
+            futures = [executor.submit(fetch, index, query_params) for index, query_params in enumerate(query_list)]
+            finished = 0
+            while finished < len(futures):
+                index, page_num, records = pages.get()
+                if records is None:
+                    finished += 1
+                    continue
+                self._merge_records(merged, (index, page_num), records)
+            for future in futures:
+                future.result()
 
-        unique_records = self._deduplicate_records(all_records)
+        unique_records = [rec for _, rec in sorted(merged.values(), key=lambda item: item[0])]
 
         record_rows = self._extract_tables(unique_records)
         self._cache["records"] = self._rows_to_table(record_rows)
+        self._sql.invalidate()
 
         self._loaded = True
 
     def _run_single_query(self, params):
         """
-        Run one OSTI query and normalize the response to a list of records.
+        Run one OSTI query and yield each page of its response as a list of records.
+
+        A query with an explicit "page" fetches only that page. Otherwise pages are fetched until one is short 
+        or `max_records` records were fetched.
         """
 
         if "osti_id" in params and len(params) == 1:
-            result = self._request(f"records/{params['osti_id']}")
-
-            if isinstance(result, dict):
-                return [result]
+            yield self._normalize_records(self._request(f"records/{params['osti_id']}"))
+            return
 
-            if isinstance(result, list):
-                return result
+        request_params = self._build_request_params(params)
 
-            return []
+        if "page" in params:
+            yield self._normalize_records(self._request("records", request_params))
+            return
 
-        request_params = self._build_request_params(params)
+        rows = int(request_params["rows"])
+        num_records = 0
+        while True:
+            records = self._normalize_records(self._request("records", request_params))
+            if self.max_records is not None:
+                records = records[:self.max_records - num_records]
+            num_records += len(records)
+            yield records
 
-        result = self._request("records", request_params)
+            if len(records) < rows or (self.max_records is not None and num_records >= self.max_records):
+                return
+            request_params = {**request_params, "page": int(request_params["page"]) + 1}
 
+    def _normalize_records(self, result):
+        """
+        Normalize an OSTI response to a list of records.
+        """
         if isinstance(result, list):
             return result
 
@@ -294,29 +362,25 @@ class OSTI(Webserver):
 
         return request_params
     
-    def _deduplicate_records(self, records):
+    def _merge_records(self, merged, rank, records):
         """
-        Deduplicate OSTI records using osti_id when available.
-        """
-
-        seen = set()
-        unique_records = []
+        Deduplicate one page of records into `merged` as it arrives. Each record is keyed by its `osti_id`, or by its
+        `doi` if it has no `osti_id`, or by its `title` if it has neither; records with none of these are all kept.
 
-        for rec in records:
+        `merged` maps each key to (rank, record). When a key is seen twice, the record from the page with the 
+        lower `rank`, e.g. (query index, page number), is kept, so the result does not depend on arrival order.
+        """
+        for pos, rec in enumerate(records):
             if not isinstance(rec, dict):
                 continue
 
+            rec_rank = rank + (pos,)
             key = rec.get("osti_id") or rec.get("doi") or rec.get("title")
-
             if key is None:
-                unique_records.append(rec)
-                continue
-
-            if key not in seen:
-                seen.add(key)
-                unique_records.append(rec)
+                key = ("unkeyed",) + rec_rank
 
-        return unique_records    
+            if key not in merged or rec_rank < merged[key][0]:
+                merged[key] = (rec_rank, rec)
 
 # ---------------------------------------------------
 # API Helpers
@@ -340,15 +404,7 @@ class OSTI(Webserver):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         try:
-            response = requests.get(
-                url,
-                params=params or {},
-                headers=self.headers,
-                verify=self.verify_ssl,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(url, params=params or {})
         
         except requests.exceptions.HTTPError as e:
             self._loaded = False
@@ -532,7 +588,7 @@ class OSTI(Webserver):
         if dict_return:
             return table
 
-        return pd.DataFrame(table)
+        return self._sql.frame("records", table).copy()
 
     def get_schema(self):
         """
@@ -587,10 +643,12 @@ class OSTI(Webserver):
     # ---------------------------------------------------
     def query_artifacts(self, query, dict_return=True, **kwargs):
         """
-        Query all tables using pandas.query()
+        Query all tables using pandas.query(), or a SQL SELECT statement.
+
+        SQL statements run in an embedded SQLite engine that holds a copy of the 'records' table.
 
         `query` : str
-            Pandas query string for filtering data
+            Pandas query string for filtering data, or a SQL SELECT statement
         `dict_return` : bool, optional, default True
             If True, returns dict format.
             If False, returns pandas DataFrames.
@@ -599,7 +657,8 @@ class OSTI(Webserver):
             Additional keyword arguments
 
         Return : dict
-            Dictionary mapping table names to query results
+            Dictionary mapping table names to query results.
+            A SQL statement returns one pandas DataFrame instead.
         """
         if not self._loaded:
             raise RuntimeError("No metadata loaded. Cannot query empty backend.")
@@ -607,7 +666,13 @@ class OSTI(Webserver):
         if "records" not in self._cache:
             raise RuntimeError("No records table loaded.")
 
-        df = pd.DataFrame(self._cache["records"])
+        if re.match(r"\s*(select|with)\b", query, re.IGNORECASE):
+            try:
+                return self._sql.read_sql(query, self._cache)
+            except (pd.errors.DatabaseError, sqlite3.Error) as e:
+                raise ValueError(f"Query error: {e}") from None
+
+        df = self._sql.frame("records", self._cache["records"])
 
         if df.empty:
             raise ValueError(f"Query returned no results: '{query}'")
@@ -719,6 +784,7 @@ class OSTI(Webserver):
 
         # write back to cache
         self._cache["records"] = df.to_dict(orient="list")
+        self._sql.invalidate()
 
 
     # ----------------------------------------------------------------------
@@ -865,9 +931,10 @@ class OSTI(Webserver):
                 continue
 
             cols = list(table_data.keys())
-            rows = zip(*table_data.values())
 
-            for row_idx, row in enumerate(rows):
+            # the SQL engine narrows the search to rows that may match
+            for row_idx in self._sql.find_rows(table_name, table_data, query_object):
+                row = [table_data[col][row_idx] for col in cols]
                 for col_idx, cell in enumerate(row):
                     match = False
 
@@ -918,7 +985,7 @@ class OSTI(Webserver):
             return list(self._cache.keys())
 
         for name, table in self._cache.items():
-            df = pd.DataFrame(table)
+            df = self._sql.frame(name, table)
             print(f"{name}: ({len(df)} rows, {len(df.columns)} cols)")
 
 
@@ -939,7 +1006,7 @@ class OSTI(Webserver):
         if table_name and table_name != "records":
             raise ValueError("OSTI backend only contains the 'records' table")
 
-        df = pd.DataFrame(self._cache["records"])
+        df = self._sql.frame("records", self._cache["records"])
 
         summary_dict = {
             "table_name": "records",
@@ -979,7 +1046,7 @@ class OSTI(Webserver):
         if "records" not in self._cache:
             raise ValueError("No OSTI records loaded")
 
-        df = pd.DataFrame(self._cache["records"])
+        df = self._sql.frame("records", self._cache["records"]).copy(deep=False)
 
         if df.empty:
             raise ValueError("The records table is empty")
@@ -1023,6 +1090,8 @@ class OSTI(Webserver):
         """
         self._cache = OrderedDict()
         self._loaded = False
+        self._sql.close()
+        self.client.close()
 
 
     # ----------------------------------------------------------------------
@@ -1,12 +1,21 @@
+import os
 import sqlite3
 import re
 import subprocess
 from datetime import datetime
 import textwrap
+import math
 import pandas as pd
 
 from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain, islice
 from dsi.backends.filesystem import Filesystem
+from dsi.utils.columnar import Column
+from dsi.utils.dsi_utils import files_fingerprint
+from dsi.utils.stats_catalog import STAT_FIELDS, StatsCatalog, updated_table
+from dsi.utils.tracing import collection_rows, frame_bytes, span
+from dsi.utils.type_inference import sample_size_for_confidence, value_types
 
 # Holds table name and data properties
 class DataType:
@@ -45,15 +54,30 @@ class Sqlite(Filesystem):
     """
     runTable = False
     read_only = False
+    type_sample_confidence = None
 
     def __init__(self, filename, **kwargs):
         """
         Initializes a SQLite backend with a user inputted filename, and creates other internal variables
+
+        Pass `fts_index=True` to build a full-text search index for `find()` (see `create_fts_index()`).
+        An index created earlier for this file is picked up and maintained automatically, and rebuilt if the database file 
+        changed since it was last updated.
+
+        Pass `stats_catalog=True` to keep the column statistics of `summary()` in a catalog stored next to the database 
+        in `<filename>-stats`, so they are only recomputed for tables that changed. A catalog created earlier for this file 
+        is picked up automatically.
         """
+        fts_index = kwargs.pop("fts_index", False)
+        stats_catalog = kwargs.pop("stats_catalog", False)
         self.filename = filename
         self.con = sqlite3.connect(filename, **kwargs)
         self.cur = self.con.cursor()
         self.runTable = Sqlite.runTable
+        self.type_sample_confidence = Sqlite.type_sample_confidence
+        self.schema_cache = {}
+        self.fts = False
+        self.fts_filename = ":memory:" if filename in ("", ":memory:") else f"{filename}-fts"
         self.sqlite_keywords = ["ABORT", "ACTION", "ADD", "AFTER", "ALL", "ALTER", "ALWAYS", "ANALYZE", "AND", "AS", "ASC", "ATTACH", 
                                 "AUTOINCREMENT", "BEFORE", "BEGIN", "BETWEEN", "BY", "CASCADE", "CASE", "CAST", "CHECK", "COLLATE", 
                                 "COLUMN", "COMMIT", "CONFLICT", "CONSTRAINT", "CREATE", "CROSS", "CURRENT", "CURRENT_DATE", "CURRENT_TIME", 
@@ -68,6 +92,13 @@ class Sqlite(Filesystem):
                                 "ROW", "ROWS", "SAVEPOINT", "SELECT", "SET", "TABLE", "TEMP", "TEMPORARY", "THEN", "TIES", "TO", "TRANSACTION", 
                                 "TRIGGER", "UNBOUNDED", "UNION", "UNIQUE", "UPDATE", "USING", "VACUUM", "VALUES", "VIEW", "VIRTUAL", "WHEN", 
                                 "WHERE", "WINDOW", "WITH", "WITHOUT"]
+        if fts_index or (self.fts_filename != ":memory:" and os.path.exists(self.fts_filename)):
+            self.create_fts_index()
+        self.stats_catalog = None
+        stats_filename = ":memory:" if filename in ("", ":memory:") else f"{filename}-stats"
+        if stats_catalog or (stats_filename != ":memory:" and os.path.exists(stats_filename)):
+            db_files = [] if stats_filename == ":memory:" else [filename, f"{filename}-wal"]
+            self.stats_catalog = StatsCatalog(stats_filename, db_files)
 
     def sql_type(self, input_list):
         """
@@ -84,13 +115,57 @@ class Sqlite(Filesystem):
         SQLITE_INT_MIN = -9223372036854775808
         SQLITE_INT_MAX =  9223372036854775807
 
-        if all(isinstance(x, int) for x in input_list if x is not None):
-            if any(x < SQLITE_INT_MIN or x > SQLITE_INT_MAX for x in input_list if x is not None):
+        col_types = value_types(input_list)
+        if all(issubclass(t, int) for t in col_types):
+            if isinstance(input_list, Column) and input_list.dtype != object:  # int64 or bool, always in range
+                return " INTEGER", input_list
+            non_null = [x for x in input_list if x is not None] if None in input_list else input_list
+            if non_null and (min(non_null) < SQLITE_INT_MIN or max(non_null) > SQLITE_INT_MAX):
                 return " FLOAT", [float(x) if x is not None else x for x in input_list]
             return " INTEGER", input_list
-        elif all(isinstance(x, float) for x in input_list if x is not None):
+        elif all(issubclass(t, float) for t in col_types):
             return " FLOAT", input_list
         return " VARCHAR", [str(x) if x is not None else x for x in input_list]
+
+    def infer_column_type(self, table_name, column_name, input_list):
+        """
+        **Internal use only. Do not call**
+
+        Returns the SQLite type and coerced data of one column, reusing the type cached from earlier ingests into the same table.
+
+        The cached type is reused when the column holds exactly the same Python types as last time. Any conflict falls back to a full scan with `sql_type()`, whose result replaces the cached entry.
+        If `type_sample_confidence` is set, the Python types are read from a sample of the column sized for that confidence,
+        so a value of a type the sample missed is stored under SQLite's type affinity rules instead of changing the column type.
+
+        `table_name` : str
+            Name of the table the column belongs to.
+
+        `column_name` : str
+            Name of the column.
+
+        `input_list` : list
+            The column data.
+
+        Return: tuple
+            The SQLite type string and the coerced list, as returned by `sql_type()`.
+        """
+        sample_size = None
+        if self.type_sample_confidence is not None:
+            sample_size = sample_size_for_confidence(self.type_sample_confidence)
+        col_types = value_types(input_list, sample_size)
+
+        # integer columns are not cached as their type depends on the value range, which sql_type() checks with min/max
+        integer = all(issubclass(t, int) for t in col_types)
+        cached = self.schema_cache.get((table_name, column_name))
+        if cached is not None and cached[1] == col_types and not integer:
+            if cached[0] == " FLOAT":
+                return cached[0], input_list
+            return cached[0], [str(x) if x is not None else x for x in input_list]
+
+        col_type, col_list = self.sql_type(input_list)
+        if not integer:
+            self.schema_cache[(table_name, column_name)] = (col_type, col_types)
+        return col_type, col_list
     
     def sqlite_compatible_name(self, name):
         if (name.startswith('"') and name.endswith('"')) or (name.upper() not in self.sqlite_keywords and name.isidentifier()):
@@ -151,8 +226,90 @@ class Sqlite(Filesystem):
                 raise sqlite3.Error(e)
             self.types = types
 
-    
-    def ingest_artifacts(self, collection, isVerbose=False):
+    @contextmanager
+    def bulk_load_pragmas(self, bulk_load = True):
+        """
+        **Internal use only. Do not call**
+
+        Context manager that relaxes the journal and synchronous pragmas of this connection for the duration of a bulk load.
+        The previous values are restored on exit, even if the load fails. Does nothing if `bulk_load` is False.
+
+        Only a new or empty database gets `journal_mode = MEMORY` and `synchronous = OFF`. A crash or power loss during the load 
+        can then corrupt the database file, which only holds the data being loaded. A database that already has tables keeps 
+        its on-disk journal and is only relaxed to `synchronous = NORMAL`, so its existing tables survive a crash.
+        A database in WAL mode keeps its journal mode, as WAL is already suited to large writes and switching out of it is persistent.
+
+        Raises a RuntimeError if a transaction is open, as changing these pragmas would require committing it.
+        """
+        if not bulk_load:
+            yield
+            return
+
+        if self.con.in_transaction:
+            raise RuntimeError("Cannot start a bulk load while a transaction is open. Commit or roll back first.")
+        old_journal = self.cur.execute("PRAGMA journal_mode;").fetchone()[0]
+        old_sync = self.cur.execute("PRAGMA synchronous;").fetchone()[0]
+        old_cache = self.cur.execute("PRAGMA cache_size;").fetchone()[0]
+        empty = self.cur.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()[0] == 0
+        relax_journal = empty and old_journal.lower() != "wal"
+        if relax_journal:
+            self.cur.execute("PRAGMA journal_mode = MEMORY;")
+        self.cur.execute(f"PRAGMA synchronous = {'OFF' if empty else min(old_sync, 1)};")
+        self.cur.execute("PRAGMA cache_size = -262144;") # 256 MB page cache
+        try:
+            yield
+        finally:
+            if self.con.in_transaction:
+                self.con.rollback()
+            if relax_journal:
+                self.cur.execute(f"PRAGMA journal_mode = {old_journal};")
+            self.cur.execute(f"PRAGMA synchronous = {old_sync};")
+            self.cur.execute(f"PRAGMA cache_size = {old_cache};")
+
+    def bulk_insert_helper(self, str_query, columns, batch_size = 100000):
+        """
+        **Internal use only. Do not call**
+
+        Inserts whole column buffers into a table using multi-row prepared INSERT statements.
+
+        Rows are pulled from the column buffers `batch_size` at a time, so the extra memory used stays bounded.
+        Each statement binds as many rows as the SQLite variable limit allows (up to 256 rows).
+
+        `str_query` : str
+            A single-row INSERT statement ending in ``VALUES (...);`` as built by `ingest_artifacts()`.
+
+        `columns` : list of lists
+            Column buffers of equal length, in the same order as the placeholders in `str_query`.
+
+        `batch_size` : int, optional, default=100000
+            Maximum number of rows passed to SQLite per batch.
+        """
+        num_cols = len(columns)
+        if num_cols == 0:
+            return
+        prefix, row_template = str_query[:str_query.rindex(" VALUES ")], str_query[str_query.rindex(" VALUES ") + 8:].rstrip(";")
+
+        try:
+            max_vars = self.con.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        except AttributeError: # Python < 3.11
+            max_vars = 999
+        rows_per_stmt = max(1, min(256, max_vars // num_cols))
+        batch_size = max(rows_per_stmt, batch_size - batch_size % rows_per_stmt)
+        multi_query = f"{prefix} VALUES {', '.join([row_template] * rows_per_stmt)};"
+
+        rows = zip(*columns)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            full = len(batch) - len(batch) % rows_per_stmt
+            if full:
+                self.cur.executemany(multi_query, (tuple(chain.from_iterable(batch[i:i + rows_per_stmt]))
+                                                   for i in range(0, full, rows_per_stmt)))
+            if full < len(batch):
+                self.cur.executemany(str_query, batch[full:])
+
+    def ingest_artifacts(self, collection, isVerbose=False, bulk_load=False, batch_size=100000):
         """
         Primary function to ingest a collection of tables into the defined SQLite database.
         
@@ -168,6 +325,17 @@ class Sqlite(Filesystem):
 
         `isVerbose` : bool, optional, default=False
             If True, prints all SQL insert statements during the ingest process for debugging or inspection purposes.
+
+        `bulk_load` : bool, optional, default=False
+            If True, loads each table's column buffers with multi-row prepared INSERT statements inside one transaction.
+            The journal and synchronous pragmas are relaxed for the duration of the load and restored afterwards.
+            Durability is only traded away fully for a new or empty database, where a crash mid-load can corrupt the file;
+            a database with existing tables keeps its on-disk journal (see `bulk_load_pragmas()`).
+            Raises a RuntimeError if the connection has an open transaction.
+            Recommended for tables with millions of rows. Data is identical to the default row-by-row path.
+
+        `batch_size` : int, optional, default=100000
+            Only used when `bulk_load` is True. Maximum number of rows sent to SQLite per batch, which bounds the extra memory used.
         """
         artifacts = collection
 
@@ -244,111 +412,126 @@ class Sqlite(Filesystem):
                 except Exception as e:
                     self.con.rollback()
                     raise sqlite3.Error(e)
-            
+
+                self.stats_changed_helper(all_schema_tables)
+                if self.fts:
+                    self.fts_update(list(all_schema_tables), reindex=True)
                 return #early return so dont make any other changes to db
             else:
                 print("WARNING: Complex schemas can only be ingested after all referenced data tables are loaded into a database.")
             
-        if self.runTable and artifacts:
-            runTable_create = "CREATE TABLE IF NOT EXISTS runTable (run_id INTEGER PRIMARY KEY AUTOINCREMENT, run_timestamp TEXT UNIQUE);"
-            self.cur.execute(runTable_create)
-
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            runTable_insert = f"INSERT INTO runTable (run_timestamp) VALUES ('{timestamp}');"
-            self.cur.execute(runTable_insert)
-
-        for tableName, tableData in artifacts.items():
-            if tableName == "dsi_relations" or tableName == "dsi_units":
-                continue
-
-            types = DataType()
-            types.properties = {}
-            types.unit_keys = []
-
-            sql_table = tableName.replace(' ', '_').replace('-', '_')
-            types.name = self.sqlite_compatible_name(sql_table)
-
-            foreign_query = ""
-            for key in tableData:
-                sql_key = key.replace('-', '_')
-                sql_key = self.sqlite_compatible_name(re.sub(r'[\r\n]+', ' ', sql_key))
-                comboTuple = (tableName, key)
-                dsi_name = "dsi_relations"
-                if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["foreign_key"]:
-                    foreignIndex = artifacts[dsi_name]["foreign_key"].index(comboTuple)
-                    primaryTuple = artifacts[dsi_name]['primary_key'][foreignIndex]
-                    primary_table = self.sqlite_compatible_name(primaryTuple[0].replace(' ', '_').replace('-', '_'))
-                    primary_col = self.sqlite_compatible_name(re.sub(r'[\r\n]+', ' ', primaryTuple[1].replace('-', '_')))
-                    foreign_query += f", FOREIGN KEY ({sql_key}) REFERENCES {primary_table} ({primary_col})"
+        ingested_tables = []
+        with self.bulk_load_pragmas(bulk_load):
+            if self.runTable and artifacts:
+                runTable_create = "CREATE TABLE IF NOT EXISTS runTable (run_id INTEGER PRIMARY KEY AUTOINCREMENT, run_timestamp TEXT UNIQUE);"
+                self.cur.execute(runTable_create)
+
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                runTable_insert = f"INSERT INTO runTable (run_timestamp) VALUES ('{timestamp}');"
+                self.cur.execute(runTable_insert)
+
+            for tableName, tableData in artifacts.items():
+                if tableName == "dsi_relations" or tableName == "dsi_units":
+                    continue
+
+                types = DataType()
+                types.properties = {}
+                types.unit_keys = []
+
+                sql_table = tableName.replace(' ', '_').replace('-', '_')
+                types.name = self.sqlite_compatible_name(sql_table)
+                ingested_tables.append(sql_table)
+
+                with span("type_inference", table=tableName, columns=len(tableData)):
+                    foreign_query = ""
+                    for key in tableData:
+                        sql_key = key.replace('-', '_')
+                        sql_key = self.sqlite_compatible_name(re.sub(r'[\r\n]+', ' ', sql_key))
+                        comboTuple = (tableName, key)
+                        dsi_name = "dsi_relations"
+                        if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["foreign_key"]:
+                            foreignIndex = artifacts[dsi_name]["foreign_key"].index(comboTuple)
+                            primaryTuple = artifacts[dsi_name]['primary_key'][foreignIndex]
+                            primary_table = self.sqlite_compatible_name(primaryTuple[0].replace(' ', '_').replace('-', '_'))
+                            primary_col = self.sqlite_compatible_name(re.sub(r'[\r\n]+', ' ', primaryTuple[1].replace('-', '_')))
+                            foreign_query += f", FOREIGN KEY ({sql_key}) REFERENCES {primary_table} ({primary_col})"
                 
-                col_type, col_list = self.sql_type(tableData[key])
-                types.properties[sql_key] = col_list
+                        col_type, col_list = self.infer_column_type(types.name, sql_key, tableData[key])
+                        types.properties[sql_key] = col_list
 
-                if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["primary_key"]:
-                    types.unit_keys.append(sql_key + col_type + " PRIMARY KEY")
-                else:
-                    types.unit_keys.append(sql_key + col_type)
+                        if dsi_name in artifacts.keys() and comboTuple in artifacts[dsi_name]["primary_key"]:
+                            types.unit_keys.append(sql_key + col_type + " PRIMARY KEY")
+                        else:
+                            types.unit_keys.append(sql_key + col_type)
             
-            self.ingest_table_helper(types, foreign_query)
+                self.ingest_table_helper(types, foreign_query)
             
-            # TODO: move this check to schema reader by allowing users to just create table without data
-            if not all(v == [""] for v in tableData.values()): # if table is just one row of empty strings, don't insert
-                col_names = ', '.join(types.properties.keys())
-                placeholders = ', '.join('?' * len(types.properties))
-
-                str_query = "INSERT INTO "
-                if self.runTable:
-                    run_id = self.cur.execute("SELECT run_id FROM runTable ORDER BY run_id DESC LIMIT 1;").fetchone()[0]
-                    str_query += "{} (run_id, {}) VALUES ({}, {});".format(str(types.name), col_names, run_id, placeholders)
-                else:
-                    str_query += "{} ({}) VALUES ({});".format(str(types.name), col_names, placeholders)
-                if isVerbose:
-                    print(str_query)
+                # TODO: move this check to schema reader by allowing users to just create table without data
+                if not all(v == [""] for v in tableData.values()): # if table is just one row of empty strings, don't insert
+                    col_names = ', '.join(types.properties.keys())
+                    placeholders = ', '.join('?' * len(types.properties))
+
+                    str_query = "INSERT INTO "
+                    if self.runTable:
+                        run_id = self.cur.execute("SELECT run_id FROM runTable ORDER BY run_id DESC LIMIT 1;").fetchone()[0]
+                        str_query += "{} (run_id, {}) VALUES ({}, {});".format(str(types.name), col_names, run_id, placeholders)
+                    else:
+                        str_query += "{} ({}) VALUES ({});".format(str(types.name), col_names, placeholders)
+                    if isVerbose:
+                        print(str_query)
                 
-                rows = zip(*types.properties.values())
-                try:
-                    self.cur.executemany(str_query,rows)
-                except sqlite3.Error as e:
-                    self.con.rollback()
-                    raise sqlite3.Error(e)
+                    with span("insert", table=tableName, rows=collection_rows({tableName: types.properties})):
+                        try:
+                            if bulk_load:
+                                self.bulk_insert_helper(str_query, list(types.properties.values()), batch_size)
+                            else:
+                                rows = zip(*types.properties.values())
+                                self.cur.executemany(str_query,rows)
+                        except sqlite3.Error as e:
+                            self.con.rollback()
+                            raise sqlite3.Error(e)
                 
-            self.types = types # This will only copy the last table from artifacts (collections input)
+                self.types = types # This will only copy the last table from artifacts (collections input)
 
-        dsi_units_data = self.cur.execute("PRAGMA table_info(dsi_units)").fetchall()
-        if len(dsi_units_data) == 3 and dsi_units_data[1][1] == "column": # old dsi_units table exists
-            self.cur.execute('ALTER TABLE dsi_units RENAME COLUMN column TO column_name;') # only committed in later try/catch clause
+            dsi_units_data = self.cur.execute("PRAGMA table_info(dsi_units)").fetchall()
+            if len(dsi_units_data) == 3 and dsi_units_data[1][1] == "column": # old dsi_units table exists
+                self.cur.execute('ALTER TABLE dsi_units RENAME COLUMN column TO column_name;') # only committed in later try/catch clause
             
-        if "dsi_units" in artifacts.keys():
-            create_query = "CREATE TABLE IF NOT EXISTS dsi_units (table_name TEXT, column_name TEXT, unit TEXT)"
-            self.cur.execute(create_query)
-            units_data = artifacts["dsi_units"]
-            for table_val, col_val, unit_val in zip(units_data["table_name"], units_data["column_name"], units_data["unit"]):
-                str_query = f"INSERT INTO dsi_units VALUES ('{table_val}', '{col_val}', '{unit_val}')"
-                unit_result = self.cur.execute(f"""SELECT unit FROM dsi_units 
-                                                WHERE table_name = '{table_val}' AND column_name = '{col_val}';""").fetchone()
-                if unit_result and unit_result[0] != unit_val: #checks if unit for same table and col exists in db and if units match
-                    self.con.rollback()
-                    raise TypeError(f"Cannot ingest different units for the column {col_val} in {table_val}")
-                elif not unit_result:
-                    try:
-                        self.cur.execute(str_query)
-                    except sqlite3.Error as e:
+            if "dsi_units" in artifacts.keys():
+                create_query = "CREATE TABLE IF NOT EXISTS dsi_units (table_name TEXT, column_name TEXT, unit TEXT)"
+                self.cur.execute(create_query)
+                units_data = artifacts["dsi_units"]
+                for table_val, col_val, unit_val in zip(units_data["table_name"], units_data["column_name"], units_data["unit"]):
+                    str_query = f"INSERT INTO dsi_units VALUES ('{table_val}', '{col_val}', '{unit_val}')"
+                    unit_result = self.cur.execute(f"""SELECT unit FROM dsi_units 
+                                                    WHERE table_name = '{table_val}' AND column_name = '{col_val}';""").fetchone()
+                    if unit_result and unit_result[0] != unit_val: #checks if unit for same table and col exists in db and if units match
                         self.con.rollback()
-                        raise sqlite3.Error(e)
+                        raise TypeError(f"Cannot ingest different units for the column {col_val} in {table_val}")
+                    elif not unit_result:
+                        try:
+                            self.cur.execute(str_query)
+                        except sqlite3.Error as e:
+                            self.con.rollback()
+                            raise sqlite3.Error(e)
         
-        try:
-            self.con.commit()
-        except Exception as e:
-            self.con.rollback()
-            raise sqlite3.Error(e)
+            try:
+                self.con.commit()
+            except Exception as e:
+                self.con.rollback()
+                raise sqlite3.Error(e)
+
+        self.stats_changed_helper(ingested_tables + ["runTable", "dsi_units"])
+        if self.fts:
+            self.fts_update(ingested_tables + ["runTable", "dsi_units"])
 
 
-    def query_artifacts(self, query, isVerbose=False, dict_return = False, **kwargs):
+    def query_artifacts(self, query, isVerbose=False, dict_return = False, stream = False, chunk_rows = 100000, **kwargs):
         """
         Executes a SQL query on the SQLite backend.
 
         Supports:
-        - SELECT / PRAGMA: returns DataFrame or OrderedDict depending on dict_return
+        - SELECT / PRAGMA: returns DataFrame, OrderedDict or an iterator of DataFrames depending on dict_return and stream
         - UPDATE / ALTER: executes command and returns None
 
         `query` : str
@@ -361,17 +544,33 @@ class Sqlite(Filesystem):
         `dict_return` : bool, optional, default=False
             If True, returns the result as an OrderedDict.
             If False, returns the result as a pandas DataFrame.
+
+        `stream` : bool, optional, default=False
+            If True, returns an iterator of DataFrames with at most `chunk_rows` rows each, read from a database cursor
+            so only one chunk is held in memory at a time. Cannot be combined with `dict_return`.
+
+        `chunk_rows` : int, optional, default=100000
+            Only used when `stream` is True. Maximum number of rows in each DataFrame chunk.
         
-        Return : pandas.DataFrame or OrderedDict or None
+        Return : pandas.DataFrame or OrderedDict or iterator of pandas.DataFrame or None
             - If `query` includes UPDATE or ALTER: returns nothing
+            - If `stream` is True: returns an iterator of DataFrames
             - If `dict_return` is False: returns a DataFrame
             - If `dict_return` is True: returns an OrderedDict
         """
+        if dict_return and stream:
+            raise ValueError("Cannot set both dict_return and stream to True")
         data = None
         command = query.strip().split(None, 1)[0].lower()
         if command in {"select", "pragma"}:
             try:
-                data = pd.read_sql_query(query, self.con) 
+                if stream:
+                    if isVerbose:
+                        print(query)
+                    return pd.read_sql_query(query, self.con, chunksize=chunk_rows)
+                with span("sql") as sql_span:
+                    data = pd.read_sql_query(query, self.con)
+                    sql_span.set(rows=len(data), bytes=frame_bytes(data))
                 if isVerbose:
                     print(data)
             except Exception as e:
@@ -381,6 +580,8 @@ class Sqlite(Filesystem):
                     print(f"WARNING: '{table_name}' does not exist in this database")
                     if dict_return:
                         return OrderedDict()
+                    if stream:
+                        return iter([])
                     return pd.DataFrame()
                 raise
         elif command in {"update", "alter"}:
@@ -388,10 +589,17 @@ class Sqlite(Filesystem):
             try:
                 self.cur.execute(query, query_params)
                 self.con.commit()
-                return None
             except sqlite3.Error:
                 self.con.rollback()
                 raise
+            updated = self.updated_table_helper(query) if command == "update" else None
+            self.stats_changed_helper([updated] if updated else None)
+            if self.fts:
+                if command == "update":
+                    self.fts_update([updated] if updated else None, reindex=True)
+                else:
+                    self.fts_update()
+            return None
         else:
             raise RuntimeError("Can only run SELECT, PRAGMA, UPDATE, or ALTER queries on the data")
         
@@ -399,7 +607,8 @@ class Sqlite(Filesystem):
             tables = self.get_table_names(query)
             if len(tables) > 1:
                 raise RuntimeError("Can only return ordered dictionary if querying one table")
-            return OrderedDict(data.to_dict(orient='list'))
+            with span("to_dict", rows=len(data)):
+                return OrderedDict(data.to_dict(orient='list'))
         else:
             return data
         
@@ -619,6 +828,131 @@ class Sqlite(Filesystem):
 
         return artifact
 
+    def stats_changed_helper(self, tables = None):
+        """
+        **Internal use only. Do not call**
+
+        Increments the change counter of `tables` in the statistics catalog, if there is one, after a write to them was committed.
+
+        `tables` : list of str, optional
+            Names of the changed tables, quoted or not. If None, every table is marked as changed.
+        """
+        if self.stats_catalog is not None:
+            self.stats_catalog.bump(tables)
+
+    def updated_table_helper(self, query):
+        """
+        **Internal use only. Do not call**
+
+        Returns the name of the table an UPDATE `query` writes to, as stored in the database, or None if it cannot be identified.
+        The name in the query is matched case-insensitively and without quotes or a schema prefix.
+        """
+        name = updated_table(query)
+        if name is None:
+            return None
+        tables = self.cur.execute("SELECT name FROM sqlite_master WHERE type ='table';").fetchall()
+        matches = [t[0] for t in tables if t[0].lower() == name.lower()]
+        return matches[0] if len(matches) == 1 else None
+
+    def create_fts_index(self):
+        """
+        Creates a full-text search index over all table names, column names and cell values, and keeps it up to date from then on.
+
+        The index is an FTS5 trigram index stored next to the database in a separate file, `<filename>-fts`, so the tables of
+        the database itself are unchanged. Once it exists, `find_table()`, `find_column()` and `find_cell()` use it to skip
+        the full scan for search terms of 3 or more characters, and return the same results as without it.
+        It is updated incrementally after every ingest and rebuilt for tables changed by `overwrite_table()` or UPDATE/ALTER queries.
+        When an existing index is attached, only the fingerprint of the database file it recorded is compared: the index is
+        used as is if it matches, and rebuilt if the file changed since, e.g. because the database was recreated or edited outside of DSI.
+        """
+        if not self.fts:
+            self.cur.execute("ATTACH DATABASE ? AS dsi_fts;", (self.fts_filename,))
+            self.cur.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS dsi_fts.cells 
+                                USING fts5(value, table_name UNINDEXED, column_name UNINDEXED, row_id UNINDEXED, tokenize = 'trigram');""")
+            self.cur.execute("""CREATE TABLE IF NOT EXISTS dsi_fts.indexed_tables 
+                                (table_name TEXT PRIMARY KEY, max_rowid INTEGER, num_rows INTEGER, num_cols INTEGER);""")
+            self.cur.execute("CREATE TABLE IF NOT EXISTS dsi_fts.meta (key TEXT PRIMARY KEY, value TEXT);")
+            self.con.commit()
+            self.fts = True
+            # an index last updated for a different state of the database file is rebuilt; a matching one is used as is
+            recorded = self.cur.execute("SELECT value FROM dsi_fts.meta WHERE key = 'fingerprint';").fetchone()
+            if recorded is None or recorded[0] != self.fts_fingerprint():
+                self.fts_update(reindex=True)
+            return
+        self.fts_update()
+
+    def fts_fingerprint(self):
+        """
+        **Internal use only. Do not call**
+
+        Returns a hash of the path, size and modification time of the database files, recorded in the full-text search index
+        after every update to detect a recreated database or changes made while the index was not attached.
+        """
+        if self.fts_filename == ":memory:":
+            return ""
+        return files_fingerprint([os.path.abspath(self.filename), os.path.abspath(self.filename) + "-wal"])
+
+    def fts_update(self, tables = None, reindex = False):
+        """
+        **Internal use only. Do not call**
+
+        Brings the full-text search index up to date for `tables` (all tables if None).
+        Rows appended since the last update are indexed incrementally; a table whose rows were deleted or whose columns changed,
+        or any table when `reindex` is True, is indexed again from scratch. Index entries of dropped tables are removed.
+
+        `tables` : list of str, optional, default=None
+            Table names as stored in the database.
+
+        `reindex` : bool, optional, default=False
+            If True, rebuilds the index entries of `tables` even if they look unchanged, e.g. after an UPDATE.
+        """
+        db_tables = [t[0] for t in self.cur.execute("SELECT name FROM sqlite_master WHERE type ='table';").fetchall() if t[0] != "sqlite_sequence"]
+        indexed = {t[0]: t[1:] for t in self.cur.execute("SELECT * FROM dsi_fts.indexed_tables;").fetchall()}
+
+        for table in set(indexed) - set(db_tables):
+            self.cur.execute("DELETE FROM dsi_fts.cells WHERE table_name = ?;", (table,))
+            self.cur.execute("DELETE FROM dsi_fts.indexed_tables WHERE table_name = ?;", (table,))
+
+        for table in (db_tables if tables is None else [t for t in tables if t in db_tables]):
+            sql_table = self.sqlite_compatible_name(table)
+            col_names = [col[1] for col in self.cur.execute(f"PRAGMA table_info({sql_table});").fetchall()]
+            max_rowid, num_rows = self.cur.execute(f"SELECT MAX(rowid), COUNT(*) FROM {sql_table};").fetchone()
+            max_rowid = max_rowid or 0
+
+            start_rowid = None
+            if table in indexed and not reindex:
+                old_max_rowid, old_num_rows, old_num_cols = indexed[table]
+                if (old_max_rowid, old_num_rows, old_num_cols) == (max_rowid, num_rows, len(col_names)):
+                    continue
+                new_rows = self.cur.execute(f"SELECT COUNT(*) FROM {sql_table} WHERE rowid > ?;", (old_max_rowid,)).fetchone()[0]
+                if old_num_cols == len(col_names) and num_rows - old_num_rows == new_rows:
+                    start_rowid = old_max_rowid # rows were only appended
+
+            if start_rowid is None:
+                self.cur.execute("DELETE FROM dsi_fts.cells WHERE table_name = ?;", (table,))
+                self.cur.execute("INSERT INTO dsi_fts.cells (value, table_name) VALUES (?, ?);", (table, table))
+                self.cur.executemany("INSERT INTO dsi_fts.cells (value, table_name, column_name) VALUES (?, ?, ?);",
+                                     [(col, table, col) for col in col_names])
+                start_rowid = 0
+            for col in col_names:
+                sql_col = self.sqlite_compatible_name(col)
+                self.cur.execute(f"""INSERT INTO dsi_fts.cells (value, table_name, column_name, row_id) 
+                                     SELECT CAST({sql_col} AS TEXT), ?, ?, rowid FROM {sql_table} 
+                                     WHERE rowid > ? AND {sql_col} IS NOT NULL;""", (table, col, start_rowid))
+            self.cur.execute("INSERT OR REPLACE INTO dsi_fts.indexed_tables VALUES (?, ?, ?, ?);", (table, max_rowid, num_rows, len(col_names)))
+        self.con.commit()
+        self.cur.execute("INSERT OR REPLACE INTO dsi_fts.meta VALUES ('fingerprint', ?);", (self.fts_fingerprint(),))
+        self.con.commit()
+
+    def fts_usable(self, query_object):
+        """
+        **Internal use only. Do not call**
+
+        Returns True if the full-text search index exists and can narrow down a search for `query_object`.
+        The trigram index needs at least 3 characters to look up.
+        """
+        return self.fts and len(str(query_object)) >= 3
+
     def find(self, query_object):
         """
         Searches for all instances of `query_object` in the SQLite database at the table, column, and cell levels. 
@@ -669,6 +1003,13 @@ class Sqlite(Filesystem):
         tableList = [self.sqlite_compatible_name(table[0]) for table in tableList if table[0] != "sqlite_sequence"]
 
         if isinstance(query_object, str):
+            if self.fts_usable(query_object) and '"' not in query_object:
+                fts_tables = self.cur.execute("""SELECT table_name FROM dsi_fts.cells 
+                                                 WHERE cells.value LIKE ? AND row_id IS NULL AND column_name IS NULL;""", 
+                                              (f"%{query_object}%",)).fetchall()
+                fts_tables = set(self.sqlite_compatible_name(t[0]) for t in fts_tables)
+                tableList = [table for table in tableList if table in fts_tables]
+
             table_return_list = []
             for table in tableList:
                 if query_object in table:
@@ -717,11 +1058,21 @@ class Sqlite(Filesystem):
         tableList = [self.sqlite_compatible_name(table[0]) for table in tableList if table[0] != "sqlite_sequence"]
 
         if isinstance(query_object, str):
+            fts_columns = None
+            if self.fts_usable(query_object) and '"' not in query_object:
+                fts_columns = self.cur.execute("""SELECT table_name, column_name FROM dsi_fts.cells 
+                                                  WHERE cells.value LIKE ? AND row_id IS NULL AND column_name IS NOT NULL;""", 
+                                               (f"%{query_object}%",)).fetchall()
+                fts_columns = set((self.sqlite_compatible_name(t), self.sqlite_compatible_name(c)) for t, c in fts_columns)
+                tableList = [table for table in tableList if any(table == t for t, _ in fts_columns)]
+
             col_return_list = []
             for table in tableList:
                 colList = self.cur.execute(f"PRAGMA table_info({table});").fetchall()
                 for col in colList:
                     col_name = self.sqlite_compatible_name(col[1])
+                    if fts_columns is not None and (table, col_name) not in fts_columns:
+                        continue
                     if query_object in col_name:
                         returned_col = self.cur.execute(f"SELECT {col_name} FROM {table};").fetchall()
                         colData = [row[0] for row in returned_col]
@@ -775,30 +1126,40 @@ class Sqlite(Filesystem):
                 - If row=False: 'cell'
         """
         tableList = self.cur.execute("SELECT name FROM sqlite_master WHERE type ='table';").fetchall()
-        tableList = [self.sqlite_compatible_name(table[0]) for table in tableList if table[0] != "sqlite_sequence"]
+        tableList = [table[0] for table in tableList if table[0] != "sqlite_sequence"]
+        use_fts = self.fts_usable(query_object)
 
         query_list = []
-        for table in tableList:
+        for fts_table in tableList:
+            table = self.sqlite_compatible_name(fts_table)
             colList = self.cur.execute(f"PRAGMA table_info({table});").fetchall()
             all_cols = [column[1] for column in colList]
+            row_ctes, row_from, row_num = self.row_number_helper(table)
+            params = []
+            if use_fts: # only look at rows the index says contain the search term
+                row_ctes.append("dsi_fts_matches AS (SELECT row_id, column_name FROM dsi_fts.cells WHERE cells.value LIKE ? AND cells.table_name = ?)")
+                params += [f"%{query_object}%", fts_table]
             row_list = []
             for col in colList:
                 col_name = self.sqlite_compatible_name(col[1])
                 middle= None
                 if row:
-                    middle = f'"{all_cols}", *'
+                    middle = f'"{all_cols}", t1.*'
                 else:
-                    middle = f"'{col_name}', {col_name}"
-                query = f"SELECT '{table}', (SELECT COUNT(*) FROM {table} AS t2 WHERE t2.rowid <= t1.rowid) AS row_num, {middle} FROM {table} AS t1 WHERE "
-                # query = f"SELECT '{table}', rowid, {middle} FROM {table} WHERE "
+                    middle = f"'{col_name}', t1.{col_name}"
+                query = f"SELECT '{table}', {row_num} AS row_num, {middle} FROM {row_from} WHERE "
                 if isinstance(query_object, str):
-                    query += f"{col_name} LIKE '%{query_object}%'" 
+                    query += f"t1.{col_name} LIKE '%{query_object}%'" 
                 else:
-                    query += f"CAST({col_name} AS TEXT) LIKE '%{query_object}%'" 
+                    query += f"CAST(t1.{col_name} AS TEXT) LIKE '%{query_object}%'" 
+                if use_fts:
+                    query += " AND t1.rowid IN (SELECT row_id FROM dsi_fts_matches WHERE column_name = ?)"
+                    params.append(col[1])
                 row_list.append(query)
 
-            table_row_query = " UNION ".join(row_list) + ";"
-            table_row_return = self.cur.execute(table_row_query).fetchall()
+            row_prefix = f"WITH {', '.join(row_ctes)} " if row_ctes else ""
+            table_row_query = row_prefix + " UNION ".join(row_list) + ";"
+            table_row_return = self.cur.execute(table_row_query, params).fetchall()
             query_list += table_row_return
 
         if len(query_list) > 0:
@@ -820,6 +1181,29 @@ class Sqlite(Filesystem):
 
         return f"{query_object} is not a cell in this database"
     
+    def row_number_helper(self, table):
+        """
+        **Internal use only. Do not call**
+
+        Builds the SQL used by `find_cell()` and `find_relation()` to give each row of `table` its 1-based position in rowid order.
+
+        If the table's rowids have no gaps, the position is computed directly from the rowid. 
+        Otherwise a single ROW_NUMBER() window pass over the rowids is joined back to the table.
+        Both are linear in the table size, unlike a correlated COUNT(*) per matching row.
+
+        `table` : str
+            Name of the table, already made SQLite compatible.
+
+        Return: tuple
+            A list of CTE definitions to place in the WITH clause of the query (empty if none are needed),
+            the FROM clause exposing the table as `t1`, and the SQL expression for the row number.
+        """
+        min_rowid, max_rowid, num_rows = self.cur.execute(f"SELECT MIN(rowid), MAX(rowid), COUNT(*) FROM {table};").fetchone()
+        if num_rows and max_rowid - min_rowid + 1 == num_rows:
+            return [], f"{table} AS t1", f"t1.rowid - {min_rowid - 1}"
+        row_cte = f"dsi_row_nums AS (SELECT rowid AS dsi_rowid, ROW_NUMBER() OVER (ORDER BY rowid) AS dsi_row_num FROM {table})"
+        return [row_cte], f"{table} AS t1 JOIN dsi_row_nums ON dsi_row_nums.dsi_rowid = t1.rowid", "dsi_row_nums.dsi_row_num"
+
     def find_relation(self, column_name, relation):
         """
         Finds all rows in the first table of the database that satisfy the relation applied to the given column.
@@ -873,8 +1257,9 @@ class Sqlite(Filesystem):
                 relation = relation[1:-1]
             relation = f"LIKE '%{relation}%'"
 
-        row_id_select = f"(SELECT COUNT(*) FROM {all_tables[0]} AS t2 WHERE t2.rowid <= t1.rowid) AS row_num"
-        query = f"SELECT {row_id_select}, * FROM {all_tables[0]} as t1 WHERE {column_name} {relation}"
+        row_ctes, row_from, row_num = self.row_number_helper(all_tables[0])
+        row_prefix = f"WITH {', '.join(row_ctes)} " if row_ctes else ""
+        query = f"{row_prefix}SELECT {row_num} AS row_num, t1.* FROM {row_from} WHERE {column_name} {relation}"
         output_data = self.cur.execute(query).fetchall()
         
         if not output_data and len(all_tables) == 1:
@@ -998,52 +1383,83 @@ class Sqlite(Filesystem):
 
         Generates and returns summary metadata for a specific table in the SQLite backend.
         """
-        col_info = self.cur.execute(f"PRAGMA table_info({table_name})").fetchall()
-
-        numeric_types = {'INTEGER', 'REAL', 'FLOAT', 'NUMERIC', 'DECIMAL', 'DOUBLE'}
         headers = ['column', 'type', 'unique', 'min', 'max', 'avg', 'std_dev']
-        rows = []
+        rows = self.column_stats_helper(table_name)
+        return headers, [row[:7] for row in rows]
 
-        for col in col_info:
-            col_name = col[1]
-            col_type = col[2].upper()
-            unique_vals = self.cur.execute(f"SELECT COUNT(DISTINCT {self.sqlite_compatible_name(col_name)}) FROM {table_name};").fetchone()[0]
-            is_primary = col[5] > 0
-            display_name = f"{col_name}*" if is_primary else col_name
+    def column_stats(self, table_name):
+        """
+        Returns the statistics of every column of a table: the `summary()` metadata plus the number of non-null and null values.
 
-            try:
-                self.cur.execute("SELECT sqrt(4);")
-            except Exception:
-                import math
-                self.con.create_function('sqrt', 1, math.sqrt)
-
-            if any(nt in col_type for nt in numeric_types):
-                min_val, max_val, avg_val, std_dev = self.cur.execute(f"""
-                    WITH stats AS (
-                        SELECT AVG("{col_name}") AS mean
-                        FROM {table_name}
-                        WHERE "{col_name}" IS NOT NULL
-                    )
-                    SELECT 
-                        MIN("{col_name}"),
-                        MAX("{col_name}"),
-                        AVG("{col_name}"),
-                        CASE 
-                            WHEN COUNT("{col_name}") > 1 THEN 
-                                sqrt(AVG(("{col_name}" - stats.mean) * ("{col_name}" - stats.mean)))
-                            ELSE NULL
-                        END AS std_dev
-                    FROM {table_name}, stats
-                    WHERE "{col_name}" IS NOT NULL
-                """).fetchone()
-            else:
-                min_val = max_val = avg_val = std_dev = None
-            
-            if avg_val is not None and std_dev is None:
-                std_dev = 0
-            rows.append([display_name, col_type, unique_vals, min_val, max_val, avg_val, std_dev])
+        `table_name` : str
+            Name of the table.
 
-        return headers, rows
+        Return: pandas.DataFrame
+            One row per column, with the columns 'column', 'type', 'unique', 'min', 'max', 'avg', 'std_dev', 'count' and 'null_count'.
+        """
+        table_name = self.sqlite_compatible_name(table_name.replace(' ', '_'))
+        if len(self.cur.execute(f"PRAGMA table_info({table_name})").fetchall()) == 0:
+            raise ValueError(f"'{table_name}' does not exist in this SQLite database")
+        return pd.DataFrame(self.column_stats_helper(table_name), columns=STAT_FIELDS, dtype=object)
+
+    def column_stats_helper(self, table_name):
+        """
+        **Internal use only. Do not call**
+
+        Returns the statistics of every column of `table_name` as lists ordered like `dsi.utils.stats_catalog.STAT_FIELDS`.
+        With a statistics catalog, they are read from it if the table did not change since they were stored, and stored otherwise.
+        """
+        key = table_name[1:-1] if table_name[0] == '"' and table_name[-1] == '"' else table_name
+        rows = self.stats_catalog.get(key) if self.stats_catalog is not None else None
+        if rows is None:
+            rows = self.compute_stats_helper(table_name)
+            if self.stats_catalog is not None:
+                self.stats_catalog.put(key, rows)
+        return rows
+
+    def compute_stats_helper(self, table_name):
+        """
+        **Internal use only. Do not call**
+
+        Computes the column statistics of `table_name` for up to 100 columns per table scan: 
+        one scan for the counts, minimum, maximum and mean, and one for the standard deviation of the numeric columns.
+        """
+        col_info = self.cur.execute(f"PRAGMA table_info({table_name})").fetchall()
+        numeric_types = {'INTEGER', 'REAL', 'FLOAT', 'NUMERIC', 'DECIMAL', 'DOUBLE'}
+        rows = []
+
+        for start in range(0, len(col_info), 100):
+            batch = col_info[start:start + 100]
+            numeric = [any(nt in col[2].upper() for nt in numeric_types) for col in batch]
+            exprs = ["COUNT(*)"]
+            for col, is_numeric in zip(batch, numeric):
+                exprs += [f"COUNT(DISTINCT {self.sqlite_compatible_name(col[1])})", f'COUNT("{col[1]}")']
+                if is_numeric:
+                    exprs += [f'MIN("{col[1]}")', f'MAX("{col[1]}")', f'AVG("{col[1]}")']
+            values = iter(self.cur.execute(f"SELECT {', '.join(exprs)} FROM {table_name};").fetchone())
+            num_rows = next(values)
+
+            batch_rows = []
+            for col, is_numeric in zip(batch, numeric):
+                unique_vals, count = next(values), next(values)
+                min_val, max_val, avg_val = (next(values), next(values), next(values)) if is_numeric else (None, None, None)
+                display_name = f"{col[1]}*" if col[5] > 0 else col[1]
+                batch_rows.append([display_name, col[2].upper(), unique_vals, min_val, max_val, avg_val, None, count, num_rows - count])
+
+            # population standard deviation around the mean of the first scan
+            spread = [(row, col[1]) for row, col, is_numeric in zip(batch_rows, batch, numeric) if is_numeric and row[7] > 1]
+            if spread:
+                exprs = [f'AVG(("{name}" - ?) * ("{name}" - ?))' for _, name in spread]
+                params = [row[5] for row, _ in spread for _ in range(2)]
+                variances = self.cur.execute(f"SELECT {', '.join(exprs)} FROM {table_name};", params).fetchone()
+                for (row, _), variance in zip(spread, variances):
+                    row[6] = math.sqrt(variance) if variance is not None else None
+            for row in batch_rows:
+                if row[5] is not None and row[6] is None:
+                    row[6] = 0
+            rows.extend(batch_rows)
+
+        return rows
 
     def overwrite_table(self, table_name, collection):
         """
@@ -1110,6 +1526,9 @@ class Sqlite(Filesystem):
             temp_name = name[1:-1] if name[0] == '"' and name[-1] == '"' else name
             self.cur.execute(f'DROP TABLE IF EXISTS "{temp_name}";')
             self.con.commit()
+        self.stats_changed_helper(list(temp_data.keys()))
+        if self.fts:
+            self.fts_update()
         
         temp_runTable_bool = self.runTable
         self.runTable = False
@@ -1122,10 +1541,168 @@ class Sqlite(Filesystem):
 
         if temp_runTable_bool:
             self.runTable = True
-            
+
+    def plan_row_update(self, table_name, collection, row_indexes = None, delete_indexes = None):
+        """
+        Compares an edited copy of a table with the table in this SQLite backend and plans the smallest change that applies the edits.
+        Only rows whose values differ are planned as keyed UPDATEs. New rows become INSERTs and new columns become ALTER TABLE ADD COLUMNs.
+        Nothing is written until the plan is passed to `apply_row_update()`.
+
+        `table_name` : str
+            Name of the table to update.
+
+        `collection` : pandas.DataFrame
+            Edited table data without the `dsi_` columns. The first len(`row_indexes`) rows are existing rows; any remaining rows are new.
+
+        `row_indexes` : list of int, optional, default=None
+            Increasing 1-based row positions, in rowid order, of the existing rows in `collection`.
+
+            If None, `collection` replaces the whole table: its rows are matched to the table's rows by position
+            and table rows past the end of `collection` are deleted.
+
+        `delete_indexes` : list of int, optional, default=None
+            Increasing 1-based row positions, in rowid order, of existing rows to delete. Only used when `row_indexes` is not None.
+
+        Return: dict or None
+            The planned change, with the number of rows it touches under 'num_rows'.
+            None if the table does not exist or if the edits need the table rebuilt with `overwrite_table()`:
+            columns were dropped or reordered, a primary or foreign key value changed, or a value does not fit its column's declared type.
+        """
+        sql_table = self.sqlite_compatible_name(table_name)
+        table_info = self.cur.execute(f"PRAGMA table_info({sql_table});").fetchall()
+        if not table_info:
+            return None
+        col_names = [col[1] for col in table_info]
+        if not set(col_names).issubset(set(collection.columns)):
+            if row_indexes is None:
+                return None
+            raise RuntimeError(f"{table_name}'s edited data must contain all columns from the original table")
+        new_cols = [col for col in collection.columns if col not in col_names]
+        if list(collection.columns) != col_names + new_cols:
+            return None
+
+        num_rows = self.cur.execute(f"SELECT COUNT(*) FROM {sql_table};").fetchone()[0]
+        deletes = []
+        if row_indexes is None:
+            row_indexes = list(range(1, min(len(collection), num_rows) + 1))
+            deletes = [(rowid,) for rowid in self.rowid_helper(sql_table, range(len(row_indexes) + 1, num_rows + 1))]
+        elif delete_indexes:
+            if set(delete_indexes) & set(row_indexes) or max(delete_indexes) > num_rows:
+                raise RuntimeError("Rows to delete must be existing rows that are not also being updated.")
+            deletes = [(rowid,) for rowid in self.rowid_helper(sql_table, delete_indexes)]
+        if any(ind > num_rows for ind in row_indexes):
+            raise RuntimeError("'dsi_row_index' was modified. When adding new rows, values for 'dsi_row_index' must be empty.")
+
+        col_types = [col[2].upper() for col in table_info]
+        key_cols = {col[1] for col in table_info if col[5] > 0}
+        key_cols.update(fk[3] for fk in self.cur.execute(f"PRAGMA foreign_key_list({sql_table});").fetchall())
+
+        data = collection.astype(object).where(collection.notna(), None)
+        new_col_types = []
+        for col in new_cols:
+            col_type, col_list = self.sql_type(data[col].tolist())
+            data[col] = pd.Series(col_list, index=data.index, dtype=object)
+            new_col_types.append(col_type.strip())
+        all_types = col_types + new_col_types
+        edited_rows = list(data.itertuples(index=False, name=None))
+
+        rowids = self.rowid_helper(sql_table, row_indexes)
+        select_cols = ", ".join(self.sqlite_compatible_name(col) for col in col_names)
+        current_rows = []
+        for start in range(0, len(rowids), 500):
+            batch = rowids[start:start + 500]
+            current_rows.extend(self.cur.execute(f"SELECT {select_cols} FROM {sql_table} WHERE rowid IN ({', '.join('?' * len(batch))}) ORDER BY rowid;", batch).fetchall())
+
+        updates = OrderedDict()
+        num_cols = len(col_names)
+        for rowid, old_row, new_row in zip(rowids, current_rows, edited_rows):
+            if old_row == new_row[:num_cols] and all(val is None for val in new_row[num_cols:]):
+                continue
+            changed = [i for i, val in enumerate(new_row) if (i < num_cols and old_row[i] != val) or (i >= num_cols and val is not None)]
+            for i in changed:
+                if i < num_cols and (col_names[i] in key_cols or not self.value_fits_type(new_row[i], all_types[i])):
+                    return None
+            updates.setdefault(tuple(changed), []).append(tuple(new_row[i] for i in changed) + (rowid,))
+
+        inserts = edited_rows[len(row_indexes):]
+        if key_cols and (inserts or deletes):
+            return None # the rebuild checks the key columns stay unique
+        for row in inserts:
+            if not all(self.value_fits_type(val, col_type) for val, col_type in zip(row, all_types)):
+                return None
+
+        return {"table": sql_table, "columns": list(collection.columns), "new_columns": list(zip(new_cols, new_col_types)),
+                "updates": updates, "inserts": inserts, "deletes": deletes, 
+                "num_rows": sum(len(rows) for rows in updates.values()) + len(inserts) + len(deletes)}
+
+    def apply_row_update(self, plan):
+        """
+        Applies a plan from `plan_row_update()` in a single transaction. On any error the table is left unchanged.
+
+        `plan` : dict
+            The return value of `plan_row_update()`.
+        """
+        sql_table = plan["table"]
+        sql_cols = [self.sqlite_compatible_name(col) for col in plan["columns"]]
+        self.con.commit()
+        try:
+            self.cur.execute("BEGIN;")
+            for col, col_type in plan["new_columns"]:
+                self.cur.execute(f"ALTER TABLE {sql_table} ADD COLUMN {self.sqlite_compatible_name(col)} {col_type};")
+            for changed, rows in plan["updates"].items():
+                set_clause = ", ".join(f"{sql_cols[i]} = ?" for i in changed)
+                self.cur.executemany(f"UPDATE {sql_table} SET {set_clause} WHERE rowid = ?;", rows)
+            if plan["deletes"]:
+                self.cur.executemany(f"DELETE FROM {sql_table} WHERE rowid = ?;", plan["deletes"])
+            if plan["inserts"]:
+                self.cur.executemany(f"INSERT INTO {sql_table} ({', '.join(sql_cols)}) VALUES ({', '.join('?' * len(sql_cols))});", plan["inserts"])
+            self.con.commit()
+        except Exception as e:
+            self.con.rollback()
+            e.args = (f"Error updating data in {self.filename} due to {str(e)}",)
+            raise
+
+        table_name = sql_table[1:-1] if sql_table[0] == '"' and sql_table[-1] == '"' else sql_table
+        self.schema_cache = {key: val for key, val in self.schema_cache.items() if key[0] != sql_table}
+        self.stats_changed_helper([table_name])
+        if self.fts:
+            self.fts_update([table_name], reindex=True)
+
+    def rowid_helper(self, sql_table, row_indexes):
+        """
+        **Internal use only. Do not call**
+
+        Converts 1-based row positions in rowid order, as shown by `dsi_row_index`, to the rowids of `sql_table`.
+        """
+        if not row_indexes:
+            return []
+        min_rowid, max_rowid, num_rows = self.cur.execute(f"SELECT MIN(rowid), MAX(rowid), COUNT(*) FROM {sql_table};").fetchone()
+        if num_rows and max_rowid - min_rowid + 1 == num_rows:
+            return [min_rowid - 1 + ind for ind in row_indexes]
+        all_rowids = self.cur.execute(f"SELECT rowid FROM {sql_table} ORDER BY rowid;").fetchall()
+        return [all_rowids[ind - 1][0] for ind in row_indexes]
+
+    def value_fits_type(self, value, col_type):
+        """
+        **Internal use only. Do not call**
+
+        Returns True if `value` can be stored in a column declared as `col_type` without the column type having to change.
+        """
+        if value is None or "CHAR" in col_type or "TEXT" in col_type or "CLOB" in col_type:
+            return True
+        if "INT" in col_type:
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            return isinstance(value, int) and -9223372036854775808 <= value <= 9223372036854775807
+        if "REAL" in col_type or "FLOA" in col_type or "DOUB" in col_type:
+            return isinstance(value, (int, float))
+        return False
+
     # Closes connection to server
     def close(self):
         """
         Closes the SQLite database's connection.
         """
-        self.con.close()
\ No newline at end of file
+        self.con.close()
+        if self.stats_catalog is not None:
+            self.stats_catalog.close()
\ No newline at end of file
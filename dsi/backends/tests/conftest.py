@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the backend tests.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+import json
+import threading
+import pytest
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serves GET requests on localhost with `respond(handler, path, params)`, so web backends are tested without the network.
+    Tests keep any state their `respond` needs, e.g. a log of requests, as attributes of the server."""
+    def __init__(self, respond, base_path=""):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.respond = respond
+        self.base_path = base_path
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}{self.base_path}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        self.server.respond(self, path, dict(parse_qsl(query)))
+
+    def reply(self, data, etag=None):
+        """Send `data` as a JSON body, with an ETag header if `etag` is given."""
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_status(self, status):
+        """Send an empty response with `status`."""
+        self.send_response(status)
+        self.end_headers()
+
+
+@pytest.fixture
+def stub_server():
+    """Returns a function that starts a `StubServer(respond, base_path)` in a background thread. Servers are shut down after the test."""
+    servers = []
+
+    def start(respond, base_path=""):
+        server = StubServer(respond, base_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
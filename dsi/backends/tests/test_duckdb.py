@@ -46,6 +46,69 @@ def test_artifact_get_table():
     correct_output = [[1, 3], [2, 2], [3, 1]]
     assert get_data.values.tolist() == correct_output == query_data.values.tolist()
 
+def test_artifact_ingest_nested_types():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,None,3],
+                                                                           'bar':[{"y":1,"x":"a"},{"x":"b"},None],
+                                                                           'baz':[[1,2],[1.5],None]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = DuckDB(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    col_types = [row[1] for row in store.cur.execute("DESCRIBE wildfire").fetchall()]
+    data = store.cur.execute("SELECT * FROM wildfire").fetchall()
+    store.close()
+    assert col_types == ['INTEGER', 'STRUCT(x VARCHAR, y INTEGER)', 'DOUBLE[]']
+    assert data == [(1, {'x': 'a', 'y': 1}, [1.0, 2.0]), (None, {'x': 'b', 'y': None}, [1.5]), (3, None, None)]
+
+def test_artifact_get_table_arrow():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[3,2,1]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = DuckDB(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    reader = store.get_table("wildfire", arrow_return=True)
+    arrow_data = reader.read_all()
+    query_data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    store.close()
+    assert arrow_data.column_names == ['foo', 'bar']
+    assert arrow_data.to_pandas().values.tolist() == query_data.values.tolist() == [[1, 3], [2, 2], [3, 1]]
+
+def test_artifact_query_stream():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':list(range(10)),'bar':[i * 0.5 for i in range(10)]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = DuckDB(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    chunks = list(store.query_artifacts(query = "SELECT * FROM wildfire;", stream=True, chunk_rows=4))
+    arrow_data = store.query_artifacts(query = "SELECT * FROM wildfire;", arrow_return=True, stream=True, chunk_rows=4)
+    batch_sizes = [len(batch) for batch in arrow_data]
+    full_data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    missing = list(store.query_artifacts(query = "SELECT * FROM missing;", stream=True))
+    store.close()
+    assert sum(len(chunk) for chunk in chunks) == 10
+    assert batch_sizes == [4, 4, 2]
+    assert sum((chunk.values.tolist() for chunk in chunks), []) == full_data.values.tolist()
+    assert missing == []
+
+def test_artifact_schema_cache():
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = DuckDB(dbpath)
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[0.5,1,2.5]})}))
+    cached_schema = dict(store.schema_cache)
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo':[4,None,6],'bar':[3,None,4.5]})}))
+    data = store.cur.execute("SELECT * FROM wildfire").fetchall()
+    wide_type = store.infer_column_type("wildfire", "foo", [4,2**40,6])[0]
+    store.close()
+    assert cached_schema[("wildfire", "foo")] == (" INTEGER", frozenset({int}))
+    assert cached_schema[("wildfire", "bar")] == (" DOUBLE", frozenset({int, float}))
+    assert wide_type == " BIGINT" and store.schema_cache[("wildfire", "foo")][0] == " BIGINT"
+    assert data == [(1, 0.5), (2, 1.0), (3, 2.5), (4, 3.0), (None, None), (6, 4.5)]
+
 def test_artifact_process():
     valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[3,2,1]})})
     dbpath = 'test_artifact.db'
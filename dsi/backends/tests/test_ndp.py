@@ -492,4 +492,95 @@ def test_ndp_get_table_names():
     names = backend.get_table_names("SELECT * FROM datasets WHERE title LIKE '%climate%'")
     assert "datasets" in names
     
-    backend.close()
\ No newline at end of file
+    backend.close()
+
+# =============================================================================
+# 8) HTTP Client against a local stub CKAN server
+# =============================================================================
+
+def ckan_respond(handler, path, params):
+    """Answers status_show and package_search from `server.datasets`, failing each start in `server.fail_once` once with a 503."""
+    server = handler.server
+    if path.endswith("status_show"):
+        return handler.reply({"success": True, "result": {"ckan_version": "stub"}})
+    start, rows = int(params["start"]), int(params["rows"])
+    server.searches.append((start, rows, handler.headers.get("If-None-Match")))
+    if start in server.fail_once:
+        server.fail_once.discard(start)
+        return handler.reply_status(503)
+    etag = f'"{start}-{rows}"'
+    if handler.headers.get("If-None-Match") == etag:
+        return handler.reply_status(304)
+    page = server.datasets[start:start + rows]
+    handler.reply({"success": True, "result": {"count": len(server.datasets), "results": page}}, etag)
+
+
+@pytest.fixture
+def stub_ckan(stub_server):
+    """Stub CKAN server on localhost with 250 fake datasets."""
+    server = stub_server(ckan_respond)
+    server.datasets = [{"id": f"id-{i}", "name": f"ds-{i}", "title": f"Dataset {i}", "num_resources": 1,
+                        "resources": [{"id": f"res-{i}", "name": f"file-{i}.csv", "format": "CSV"}]}
+                       for i in range(250)]
+    server.searches = []
+    server.fail_once = set()
+    return server
+
+
+def test_ndp_paged_search(stub_ckan, tmp_path):
+    """Test that package_search is paged with start/rows and retried after a 503."""
+    stub_ckan.fail_once = {100}
+    backend = NDP(url=stub_ckan.url, params={"limit": 230}, page_size=100, backoff=0, cache_dir=tmp_path)
+
+    assert backend._cache["datasets"]["id"] == [f"id-{i}" for i in range(230)]
+    assert len(backend._resource_tables) == 230
+    assert sorted((start, rows) for start, rows, _ in stub_ckan.searches) == [(0, 100), (100, 100), (100, 100), (200, 30)]
+    assert backend.client.stats["retries"] == 1
+    backend.close()
+
+
+def test_ndp_response_cache(stub_ckan, tmp_path):
+    """Test that cached responses are reused within the TTL and revalidated with their ETag after it."""
+    backend = NDP(url=stub_ckan.url, params={"limit": 50}, page_size=25, cache_dir=tmp_path)
+    assert len(stub_ckan.searches) == 2
+    backend.close()
+
+    backend = NDP(url=stub_ckan.url, params={"limit": 50}, page_size=25, cache_dir=tmp_path)
+    assert len(stub_ckan.searches) == 2
+    assert backend.client.stats["cache_hits"] == 2
+    backend.close()
+
+    backend = NDP(url=stub_ckan.url, params={"limit": 50}, page_size=25, cache_dir=tmp_path, cache_ttl=0)
+    assert [etag for _, _, etag in stub_ckan.searches[2:]] == ['"0-25"', '"25-25"']
+    assert backend.client.stats["not_modified"] == 2
+    assert backend._cache["datasets"]["id"] == [f"id-{i}" for i in range(50)]
+    backend.close()
+
+    backend = NDP(url=stub_ckan.url, params={"limit": 50}, page_size=25, use_cache=False)
+    assert len(stub_ckan.searches) == 6
+    backend.close()
+
+
+def test_ndp_sql_engine(stub_ckan, tmp_path):
+    """Test that SQL queries and find_cell run in the embedded engine and see newly fetched results."""
+    backend = NDP(url=stub_ckan.url, params={"limit": 40}, page_size=20, cache_dir=tmp_path)
+
+    df = backend.query_artifacts("SELECT COUNT(*) AS n FROM datasets WHERE title LIKE 'dataset 3%'")
+    assert df["n"][0] == 11
+    df = backend.query_artifacts('SELECT format FROM "Dataset 7"')
+    assert df["format"].tolist() == ["CSV"]
+
+    # pandas query strings reuse the cached DataFrames
+    first = backend.query_artifacts("num_resources == 1", dict_return=False)["datasets"]
+    assert len(first) == 40
+
+    cells = [(v.t_name, v.c_name[0], v.row_num) for v in backend.find_cell("DS-1")]
+    assert ("datasets", "name", 1) in cells and ("datasets", "name", 39) not in cells
+    assert len([c for c in cells if c[0] == "datasets"]) == 11
+    assert [v.value for v in backend.find_cell(1) if v.t_name == "datasets"] == [1] * 40
+
+    # new results replace the cached tables
+    backend._load_initial_data({"limit": 60})
+    df = backend.query_artifacts("SELECT COUNT(*) AS n FROM datasets")
+    assert df["n"][0] == 60
+    backend.close()
@@ -0,0 +1,109 @@
+"""
+Oceans11 Backend Function Tests
+
+Tests the Oceans11 backend against a local catalog and local T2 databases.
+"""
+
+import sqlite3
+import pytest
+from dsi.backends.oceans11 import Oceans11
+
+NUM_DATASETS = 6
+
+
+@pytest.fixture
+def local_catalog(tmp_path, monkeypatch):
+    """Local oceans11.db catalog whose records point at local T2 databases with 'runs' and 'params' tables."""
+    catalog = tmp_path / "oceans11.db"
+    with sqlite3.connect(catalog) as conn:
+        conn.execute("CREATE TABLE records (osti_id TEXT, title TEXT, authors TEXT, subjects TEXT, "
+                     "description TEXT, doi TEXT, report_number TEXT, t2db_url TEXT)")
+        for i in range(NUM_DATASETS):
+            t2db = tmp_path / f"t2_{i}.db"
+            with sqlite3.connect(t2db) as t2:
+                t2.execute("CREATE TABLE runs (run_id INTEGER, energy REAL)")
+                t2.executemany("INSERT INTO runs VALUES (?, ?)", [(r, i * 1000 + r) for r in range(500)])
+                t2.execute("CREATE TABLE params (name TEXT, value INTEGER)")
+                t2.execute("INSERT INTO params VALUES ('dataset', ?)", (i,))
+                t2.execute("CREATE TABLE empty (x INTEGER)")
+            t2.close()
+            conn.execute("INSERT INTO records VALUES (?, ?, 'A. Author', 'physics', 'desc', ?, ?, ?)",
+                         (str(100 + i), f"Dataset {i}", f"doi/{i}", f"LA-{i}", str(t2db)))
+    conn.close()
+
+    monkeypatch.setattr(Oceans11, "validate_connection", lambda self, **kwargs: str(catalog))
+    monkeypatch.setattr(Oceans11, "_download_t2_db", lambda self, t2db_url: t2db_url)
+    monkeypatch.setattr("dsi.utils.web_utils.get_url_file_size", lambda url, **kwargs: 0)
+    return tmp_path
+
+
+def test_lazy_t2_tables_match_eager(local_catalog):
+    """Test that lazy mode lists and returns the same tables as eager mode without loading them."""
+    params = {"q": "physics", "rows": NUM_DATASETS}
+    eager = Oceans11(params=params, workspace=str(local_catalog))
+    lazy = Oceans11(params=params, workspace=str(local_catalog), lazy=True, max_attached=2, chunk_rows=128)
+
+    assert list(lazy._cache) == ["records"]
+    assert lazy._sql.conn is None
+    assert sorted(lazy.list(collection=True)) == sorted(eager.list(collection=True))
+    assert "100_empty" not in lazy.list(collection=True)
+
+    assert lazy.get_table("103_runs", dict_return=True) == eager.get_table("103_runs", dict_return=True)
+    assert lazy.summary("105_runs")["num_rows"][0] == 500
+    assert lazy.display("102_runs", num_rows=5).attrs["max_rows"] == 500
+
+    # pandas query strings are filtered chunk by chunk with the same row labels
+    expected = eager.query_artifacts("energy > 5490", dict_return=False)
+    result = lazy.query_artifacts("energy > 5490", dict_return=False)
+    assert list(result) == list(expected) == ["105_runs"]
+    assert result["105_runs"].equals(expected["105_runs"])
+
+    # never more than max_attached T2 databases at once
+    assert len(lazy._attached) <= 2
+    eager.close()
+    lazy.close()
+
+
+def test_lazy_sql_push_down(local_catalog):
+    """Test that SQL statements run in the engine and attach only the T2 databases they name."""
+    lazy = Oceans11(params={"q": "physics", "rows": NUM_DATASETS}, workspace=str(local_catalog), lazy=True, max_attached=2)
+
+    df = lazy.query_artifacts('SELECT COUNT(*) AS n, MAX(energy) AS e FROM "101_runs" WHERE run_id >= 100')
+    assert df.to_dict(orient="records") == [{"n": 400, "e": 1499.0}]
+    assert len(lazy._attached) == 1
+
+    df = lazy.query_artifacts('SELECT r.title, p.value FROM records r JOIN "104_params" p ON r.osti_id = \'104\'')
+    assert df.to_dict(orient="records") == [{"title": "Dataset 4", "value": 4}]
+
+    for i in range(NUM_DATASETS):
+        assert lazy.query_artifacts(f'SELECT value FROM "{100 + i}_params"')["value"][0] == i
+    assert len(lazy._attached) == 2
+
+    with pytest.raises(ValueError, match="max_attached"):
+        lazy.query_artifacts('SELECT * FROM "100_runs", "101_runs", "102_runs"')
+
+    # table names inside other identifiers, literals or comments are not counted
+    df = lazy.query_artifacts('SELECT p.value AS "100_runs_value", \'102_runs\' AS label FROM "101_PARAMS" p -- not "103_runs"')
+    assert df.to_dict(orient="records") == [{"100_runs_value": 1, "label": "102_runs"}]
+    assert lazy._sql_table_names('SELECT * FROM records JOIN [104_runs] USING (osti_id)') == ["104_runs", "records"]
+    lazy.close()
+
+
+def test_large_t2_downloads_confirmed_before_pool(local_catalog, monkeypatch):
+    """Test that concurrent downloads never prompt: large T2 databases are confirmed one at a time up front."""
+    events = []
+    monkeypatch.setattr("dsi.utils.web_utils.get_url_file_size", lambda url, **kwargs: 20 * 1024 * 1024)
+    monkeypatch.setattr("builtins.input", lambda prompt: events.append("prompt") or "y")
+    def download(self, t2db_url):
+        assert t2db_url in self._confirmed_downloads
+        events.append("download")
+        return t2db_url
+    monkeypatch.setattr(Oceans11, "_download_t2_db", download)
+
+    lazy = Oceans11(params={"q": "physics", "rows": NUM_DATASETS}, workspace=str(local_catalog), lazy=True, download_workers=4)
+    assert events == ["prompt"] * NUM_DATASETS + ["download"] * NUM_DATASETS
+    lazy.close()
+
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    with pytest.raises(RuntimeError, match="Failed to download T2 DB"):
+        Oceans11(params={"q": "physics", "rows": NUM_DATASETS}, workspace=str(local_catalog), lazy=True, download_workers=4)
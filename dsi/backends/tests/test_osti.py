@@ -0,0 +1,79 @@
+"""
+OSTI Backend Function Tests
+
+Tests the OSTI backend against a local fake OSTI endpoint.
+"""
+
+import time
+import pytest
+from dsi.backends.osti import OSTI
+
+
+def osti_respond(handler, path, params):
+    """Serves /records. Each term in `q` matches 45 records, and neighbouring terms share 15 of them."""
+    server = handler.server
+    server.calls.append((time.monotonic(), params))
+    time.sleep(server.delay)
+    rows, page = int(params.get("rows", 20)), int(params.get("page", 1))
+    term = int(params.get("q", "term0")[len("term"):])
+    matches = [{"osti_id": str(term * 30 + i), "title": f"Record {term * 30 + i}"} for i in range(45)]
+    handler.reply(matches[(page - 1) * rows:page * rows])
+
+
+@pytest.fixture
+def fake_osti(stub_server):
+    """Fake OSTI endpoint on localhost that logs each request and can answer with a delay."""
+    server = stub_server(osti_respond, base_path="/api/v1")
+    server.calls = []
+    server.delay = 0.0
+    return server
+
+
+def test_osti_paged_concurrent_queries(fake_osti):
+    """Test that each query is paged to completion and overlapping records are deduplicated in query order."""
+    params = [{"q": f"term{i}", "rows": 20} for i in range(4)]
+    backend = OSTI(url=fake_osti.url, params=params, max_workers=4)
+
+    # 4 terms x 45 records, 15 shared by each neighbouring pair
+    assert backend._cache["records"]["osti_id"] == [str(i) for i in range(3 * 30 + 45)]
+    assert [stats["pages"] for stats in backend.query_stats] == [3, 3, 3, 3]
+    assert [stats["records"] for stats in backend.query_stats] == [45, 45, 45, 45]
+    assert all(stats["seconds"] > 0 for stats in backend.query_stats)
+    backend.close()
+
+
+def test_osti_max_records_and_explicit_page(fake_osti):
+    """Test that max_records stops paging and an explicit page is fetched alone."""
+    backend = OSTI(url=fake_osti.url, params={"q": "term0", "rows": 20}, max_records=25)
+    assert len(backend._cache["records"]["osti_id"]) == 25
+    assert backend.query_stats[0]["pages"] == 2
+    backend.close()
+
+    backend = OSTI(url=fake_osti.url, params={"q": "term0", "rows": 20, "page": 2})
+    assert backend._cache["records"]["osti_id"] == [str(i) for i in range(20, 40)]
+    backend.close()
+
+
+def test_osti_rate_limit(fake_osti):
+    """Test that concurrent queries stay under the rate limit."""
+    backend = OSTI(url=fake_osti.url, params=[{"q": f"term{i}", "rows": 50} for i in range(6)], max_workers=6, rate_limit=20)
+    times = sorted(t for t, params in fake_osti.calls if params.get("rows") == "50")
+    assert len(times) == 6
+    # 6 requests at 20 per second are spread over at least 5 intervals of 0.05 s
+    assert times[-1] - times[0] >= 0.2
+    backend.close()
+
+
+def test_osti_sql_engine(fake_osti):
+    """Test that SQL queries run in the embedded engine and are refreshed by validate_urls."""
+    backend = OSTI(url=fake_osti.url, params={"q": "term1", "rows": 50})
+
+    df = backend.query_artifacts("SELECT osti_id FROM records WHERE title LIKE '%7' ORDER BY osti_id")
+    assert df["osti_id"].tolist() == ["37", "47", "57", "67"]
+    assert [v.row_num for v in backend.find_cell("record 4")] == list(range(10, 20))
+
+    backend._cache["records"]["title"][0] = "Renamed"
+    backend._sql.invalidate()
+    df = backend.query_artifacts("SELECT title FROM records LIMIT 1")
+    assert df["title"][0] == "Renamed"
+    backend.close()
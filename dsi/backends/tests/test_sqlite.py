@@ -2,6 +2,7 @@ from collections import OrderedDict
 
 from dsi.backends.sqlite import Sqlite
 import os
+import pytest
 
 def test_sql_artifact():
     dbpath = "wildfire.db"
@@ -33,6 +34,21 @@ def test_artifact_query():
     correct_output = [[1, 3], [2, 2], [3, 1]]
     assert query_data.values.tolist() == correct_output
 
+def test_artifact_query_stream():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':list(range(10)),'bar':[i * 0.5 for i in range(10)]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    chunks = list(store.query_artifacts(query = "SELECT * FROM wildfire;", stream=True, chunk_rows=4))
+    full_data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    missing = list(store.query_artifacts(query = "SELECT * FROM missing;", stream=True))
+    store.close()
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert sum((chunk.values.tolist() for chunk in chunks), []) == full_data.values.tolist()
+    assert missing == []
+
 def test_artifact_get_table():
     valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[3,2,1]})})
     dbpath = 'test_artifact.db'
@@ -46,6 +62,59 @@ def test_artifact_get_table():
     correct_output = [[1, 3], [2, 2], [3, 1]]
     assert get_data.values.tolist() == correct_output == query_data.values.tolist()
 
+def test_artifact_bulk_ingest():
+    num_rows = 1237
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':list(range(num_rows)),
+                                                                           'bar':[i * 0.5 if i % 7 else None for i in range(num_rows)],
+                                                                           'baz':[f"row_{i}" for i in range(num_rows)]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    default_data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    store.close()
+
+    os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure, bulk_load=True, batch_size=500)
+    bulk_data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    journal_mode = store.cur.execute("PRAGMA journal_mode;").fetchone()[0]
+    synchronous = store.cur.execute("PRAGMA synchronous;").fetchone()[0]
+
+    assert bulk_data.equals(default_data)
+    assert len(bulk_data) == num_rows
+    assert journal_mode == "delete"
+    assert synchronous == 2
+
+    # a database that already has tables keeps its on-disk journal during the load
+    with store.bulk_load_pragmas():
+        assert store.cur.execute("PRAGMA journal_mode;").fetchone()[0] == "delete"
+        assert store.cur.execute("PRAGMA synchronous;").fetchone()[0] == 1
+
+    # an open transaction is not committed behind the caller's back
+    store.cur.execute("DELETE FROM wildfire WHERE foo = 0;")
+    with pytest.raises(RuntimeError, match="transaction is open"):
+        store.ingest_artifacts(valid_middleware_datastructure, bulk_load=True)
+    store.con.rollback()
+    assert len(store.query_artifacts(query = "SELECT * FROM wildfire;")) == num_rows
+    store.close()
+
+def test_artifact_schema_cache():
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[0.5,1.5,2.5],'baz':['a','b',None]})}))
+    cached_schema = dict(store.schema_cache)
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo':[4,2**70,6],'bar':[3.5,None,4.5],'baz':['c',7,'d']})}))
+    data = store.query_artifacts(query = "SELECT * FROM wildfire;")
+    store.close()
+    assert cached_schema[("wildfire", "bar")][0] == " FLOAT" and cached_schema[("wildfire", "baz")][0] == " VARCHAR"
+    assert store.schema_cache[("wildfire", "baz")] == (" VARCHAR", frozenset({str, int}))
+    assert data["baz"].tolist() == ['a', 'b', None, 'c', '7', 'd']
+    assert data["foo"].tolist() == [1, 2, 3, 4, float(2**70), 6]
+
 def test_artifact_notebook():
     valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':[3,2,1]})})
     dbpath = 'test_artifact.db'
@@ -262,4 +331,136 @@ def test_find_relation():
     assert row_data[0].row_num == 1
     assert row_data[0].type == 'relation'
 
-    store.close()
\ No newline at end of file
+    store.close()
+
+def test_find_row_num_after_delete():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3,4,5],'bar':["f",2,"f",1,"f"]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    store.cur.execute("DELETE FROM wildfire WHERE foo = 2;")
+    store.con.commit()
+
+    cell_data = store.find_cell("f")
+    assert [(c.value, c.row_num) for c in cell_data] == [("f", 1), ("f", 2), ("f", 4)]
+
+    row_data = store.find_relation("foo", ">3")
+    assert [(r.value, r.row_num) for r in row_data] == [([4, "1"], 3), ([5, "f"], 4)]
+    store.close()
+
+def test_find_fts_index(tmp_path, monkeypatch):
+    import sqlite3
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3],'bar':["fire",2,"Fireball"]})})
+    dbpath = str(tmp_path / "fts.db")
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    cell_data = [(c.t_name, c.c_name, c.row_num, c.value) for c in store.find_cell("fire")]
+    col_data = [(c.t_name, c.c_name) for c in store.find_column("bar")]
+    store.close()
+
+    store = Sqlite(dbpath, fts_index=True)
+    assert os.path.exists(dbpath + "-fts")
+    assert [(c.t_name, c.c_name, c.row_num, c.value) for c in store.find_cell("fire")] == cell_data
+    assert [(c.t_name, c.c_name) for c in store.find_column("bar")] == col_data
+    assert store.find_table("wild")[0].t_name == "wildfire"
+    store.close()
+
+    # attaching an index whose fingerprint matches the database does not scan its tables
+    with monkeypatch.context() as m:
+        m.setattr(Sqlite, "fts_update", lambda self, *args, **kwargs: pytest.fail("index updated on attach"))
+        Sqlite(dbpath).close()
+
+    store = Sqlite(dbpath) # index is picked up again and updated on ingest
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo':[4],'bar':["campfire"]})}))
+    assert store.fts
+    assert [(c.row_num, c.value) for c in store.find_cell("fire")] == [(1, "fire"), (3, "Fireball"), (4, "campfire")]
+    assert store.cur.execute("SELECT name FROM sqlite_master WHERE type ='table';").fetchall() == [("wildfire",)]
+
+    # the index follows UPDATEs that name the table in another letter case, and any UPDATE it cannot attribute to a table
+    store.query_artifacts("UPDATE WILDFIRE SET bar = 'zeta' WHERE foo = 2")
+    store.query_artifacts("UPDATE /* unparsed */ main.wildfire SET bar = 'campsite' WHERE foo = 4")
+    assert [(c.t_name, c.row_num, c.value) for c in store.find_cell("zeta")] == [("wildfire", 2, "zeta")]
+    assert [c.value for c in store.find_cell("camp")] == ["campsite"]
+    store.close()
+
+    # a database recreated with the same shape does not reuse the old index
+    os.remove(dbpath)
+    con = sqlite3.connect(dbpath)
+    con.execute("CREATE TABLE wildfire (foo INTEGER, bar TEXT);")
+    con.executemany("INSERT INTO wildfire VALUES (?, ?);", [(1, "fire"), (2, "zeta"), (3, "Fireball"), (4, "ember")])
+    con.commit()
+    con.close()
+    store = Sqlite(dbpath)
+    assert [c.value for c in store.find_cell("ember")] == ["ember"]
+    assert store.find_cell("campsite") == "campsite is not a cell in this database"
+    store.close()
+
+def test_artifact_update_rows():
+    valid_middleware_datastructure = OrderedDict({"wildfire": OrderedDict({'foo':[1,2,3,4],'bar':["a","b","c","d"]})})
+    dbpath = 'test_artifact.db'
+    if os.path.exists(dbpath):
+        os.remove(dbpath)
+    store = Sqlite(dbpath)
+    store.ingest_artifacts(valid_middleware_datastructure)
+    store.cur.execute("DELETE FROM wildfire WHERE foo = 2;")
+    store.con.commit()
+
+    edited = store.get_table("wildfire").iloc[1:]
+    edited.loc[2, "bar"] = "z"
+    edited["baz"] = [None, 1.5]
+    plan = store.plan_row_update("wildfire", edited, [2, 3])
+    assert plan["num_rows"] == 1
+    assert list(plan["updates"].keys()) == [(1, 2)]
+    store.apply_row_update(plan)
+    data = store.cur.execute("SELECT * FROM wildfire;").fetchall()
+    col_type = store.cur.execute("PRAGMA table_info(wildfire);").fetchall()[2][2]
+
+    widened = store.get_table("wildfire").astype(object)
+    widened.loc[0, "foo"] = "text"
+    fallback = store.plan_row_update("wildfire", widened)
+    store.close()
+    assert data == [(1, "a", None), (3, "c", None), (4, "z", 1.5)]
+    assert col_type == "FLOAT"
+    assert fallback is None
+
+def test_summary_stats_catalog(tmp_path):
+    import sqlite3
+    dbpath = str(tmp_path / "stats.db")
+    store = Sqlite(dbpath, stats_catalog=True)
+    store.ingest_artifacts(OrderedDict({"wildfire": OrderedDict({'foo': [1, 2, None, 4], 'bar': ["a", "b", "b", None]}),
+                                        "fire": OrderedDict({'baz': [0.5, 1.5]})}))
+    first = store.summary("wildfire")
+    assert store.summary("wildfire").equals(first)
+    assert store.stats_catalog.stats == {"hits": 1, "misses": 1}
+    stats = store.column_stats("wildfire")
+    assert stats["count"].tolist() == [3, 3] and stats["null_count"].tolist() == [1, 1]
+
+    store.summary("fire")
+    store.query_artifacts("UPDATE wildfire SET foo = 10 WHERE foo = 1")
+    assert store.summary("wildfire")["max"][0] == 10
+    store.summary("fire")
+    assert store.stats_catalog.stats == {"hits": 3, "misses": 3}
+    store.close()
+    assert os.path.exists(dbpath + "-stats")
+
+    # changes made outside DSI are detected from the database file and invalidate the catalog
+    con = sqlite3.connect(dbpath)
+    con.execute("UPDATE fire SET baz = 7.5 WHERE baz = 0.5")
+    con.commit()
+    con.close()
+    store = Sqlite(dbpath)
+    assert store.stats_catalog is not None
+    assert store.summary("fire")["max"][0] == 7.5
+
+    # table names in an UPDATE are case-insensitive and may carry a schema prefix
+    assert store.summary("wildfire")["max"][0] == 10
+    store.query_artifacts("UPDATE WILDFIRE SET foo = 100 WHERE foo = 10")
+    assert store.summary("wildfire")["max"][0] == 100
+    store.query_artifacts('UPDATE main."Fire" SET baz = 9.5 WHERE baz = 7.5')
+    assert store.summary("fire")["max"][0] == 9.5
+    store.close()
+    store = Sqlite(dbpath)
+    assert store.summary("wildfire")["max"][0] == 100
+    store.close()
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
+import numbers
+import sqlite3
+import pandas as pd
 from dsi.backends import Backend
 
+# any character outside 7-bit ASCII, which SQLite's LIKE does not case-fold
+NON_ASCII_GLOB = "*[^\x01-\x7f]*"
+
 class Webserver(Backend, ABC):
     @abstractmethod
     def __init__(self, url, **kwargs) -> None:
@@ -77,4 +83,174 @@ class Webserver(Backend, ABC):
 
     @abstractmethod
     def close(self):
-        pass
\ No newline at end of file
+        pass
+
+
+class CacheEngine:
+    """
+    Embedded in-memory SQLite engine over the column-oriented tables a Webserver backend caches,
+    i.e. {table name: {column: list of values}}.
+
+    Each table is converted to a pandas DataFrame and loaded into SQLite once, the first time it is used,
+    and reused until it changes. A table is reloaded when it is replaced, gains or loses columns or rows,
+    or after `invalidate()`, which backends call whenever they fetch new results or edit values in place.
+
+    Values are stored without column affinity, so SQL comparisons keep the types of the cached values.
+    Booleans are stored as 0/1 and values SQLite cannot hold, such as lists, as their str().
+    """
+    def __init__(self):
+        self.conn = None
+        self._frames = {}   # table name -> (table, signature, DataFrame)
+        self._loaded = {}   # table name -> (table, signature) of the copy in SQLite
+
+    def connect(self):
+        """
+        Return the SQLite connection, opening it on first use. URI filenames are enabled for ATTACH.
+        """
+        if self.conn is None:
+            self.conn = sqlite3.connect(":memory:", uri=True)
+        return self.conn
+
+    @staticmethod
+    def quote(name):
+        """
+        Return `name` as a quoted SQL identifier.
+        """
+        return '"' + str(name).replace('"', '""') + '"'
+
+    def _signature(self, table):
+        return tuple(table), len(next(iter(table.values()), ()))
+
+    def frame(self, table_name, table):
+        """
+        Return `table` as a DataFrame, built once and reused until the table changes.
+        The DataFrame is shared, so callers must copy it before modifying it.
+
+        `table_name` : str
+            Name of the cached table
+
+        `table` : OrderedDict
+            Column-oriented table data
+        """
+        signature = self._signature(table)
+        entry = self._frames.get(table_name)
+        if entry is None or entry[0] is not table or entry[1] != signature:
+            entry = (table, signature, pd.DataFrame(table))
+            self._frames[table_name] = entry
+        return entry[2]
+
+    def load(self, tables):
+        """
+        Load or refresh tables in SQLite. Tables that have not changed since they were last loaded are skipped.
+
+        `tables` : dict
+            Table name -> column-oriented table data
+        """
+        conn = self.connect()
+        for table_name, table in tables.items():
+            signature = self._signature(table)
+            entry = self._loaded.get(table_name)
+            if entry is not None and entry[0] is table and entry[1] == signature:
+                continue
+
+            quoted = self.quote(table_name)
+            conn.execute(f"DROP TABLE IF EXISTS main.{quoted}")
+            self._loaded.pop(table_name, None)
+            if not table:
+                continue
+
+            columns = list(table)
+            conn.execute(f"CREATE TABLE main.{quoted} ({', '.join(self.quote(c) for c in columns)})")
+            conn.executemany(
+                f"INSERT INTO main.{quoted} VALUES ({', '.join('?' * len(columns))})",
+                zip(*(map(self._sql_value, table[c]) for c in columns)),
+            )
+            self._loaded[table_name] = (table, signature)
+        # end the insert transaction so attached databases can be detached
+        conn.commit()
+
+    @staticmethod
+    def _sql_value(value):
+        if value is None or isinstance(value, (str, int, float)):
+            return int(value) if isinstance(value, bool) else value
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        if isinstance(value, numbers.Real):
+            return float(value)
+        return str(value)
+
+    def read_sql(self, statement, tables):
+        """
+        Run a SQL statement after loading the tables it names and return the result as a DataFrame.
+
+        `statement` : str
+            SQL statement. Table names that are not plain identifiers must be double quoted.
+
+        `tables` : dict
+            Table name -> column-oriented table data for every table the statement may use.
+            Only tables whose name appears in `statement` are loaded.
+        """
+        self.load({name: table for name, table in tables.items() if name in statement})
+        return pd.read_sql_query(statement, self.conn)
+
+    def find_rows(self, table_name, table, query_object):
+        """
+        Return the sorted indexes of the rows that may contain a cell equal to `query_object`, or
+        containing it case-insensitively if both are strings. The result can include rows that do not match,
+        so callers check each returned row, but never leaves out a row that does.
+
+        `table_name` : str
+            Name of the cached table
+
+        `table` : OrderedDict
+            Column-oriented table data
+
+        `query_object` : int, float, or str
+            The value to search for
+        """
+        num_rows = self._signature(table)[1]
+        if not table or not num_rows:
+            return []
+
+        if isinstance(query_object, str):
+            if not query_object.isascii():
+                return range(num_rows)
+            pattern = "%" + query_object.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            condition = "({c} LIKE ? ESCAPE '\\' OR {c} GLOB ?)"
+            params = (pattern, NON_ASCII_GLOB)
+        elif isinstance(query_object, numbers.Number):
+            condition = "{c} = ?"
+            params = (self._sql_value(query_object),)
+        else:
+            return range(num_rows)
+
+        self.load({table_name: table})
+        where = " OR ".join(condition.format(c=self.quote(c)) for c in table)
+        rows = self.conn.execute(
+            f"SELECT rowid - 1 FROM main.{self.quote(table_name)} WHERE {where} ORDER BY rowid",
+            params * len(table),
+        )
+        return [row[0] for row in rows]
+
+    def invalidate(self, table_names=None):
+        """
+        Drop cached DataFrames and SQLite copies so they are rebuilt from the cache on next use.
+
+        `table_names` : list of str, optional
+            Tables to drop. If None, drops all of them.
+        """
+        names = list(set(self._frames) | set(self._loaded)) if table_names is None else table_names
+        for table_name in names:
+            self._frames.pop(table_name, None)
+            if self._loaded.pop(table_name, None) is not None:
+                self.conn.execute(f"DROP TABLE IF EXISTS main.{self.quote(table_name)}")
+
+    def close(self):
+        """
+        Close the SQLite connection and drop everything cached.
+        """
+        self._frames.clear()
+        self._loaded.clear()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -10,6 +10,7 @@ import textwrap
 from contextlib import redirect_stdout
 import sys
 import io
+import time
 import subprocess
 import importlib.util
 import getpass
@@ -168,8 +169,8 @@ class DSI_cli:
             'plot_table' : ("<table name> [-f filename]", "Plots numerical data from a table to an optional file name argument"),
             #'pull_data' : ("<source_type> <source> <path>", 
             #              "Pulls data from a source to the current directory. Enter 'pull_data -h' to learn the inputs"),
-            'query' : ("<SQL query> [-n num_rows] [-e filename]",
-                       "Executes a SQL query (in quotes). Optionally limit printed rows or export to CSV/Parquet"),
+            'query' : ("<SQL query> [-n num_rows] [-e filename] [-s] [--chunk_rows n]",
+                       "Executes a SQL query (in quotes). Optionally limit printed rows, export to CSV/Parquet, or stream in chunks"),
             'read' : ("<data source> [-t table_name]", "Reads a file or URL into the DSI database. Optionally set table name."),
             'search' : ("<value>", "Searches for a string or number across DSI."),
             'summary' : ("[-t table_name]", "Summary of the database or a specific table."),
@@ -285,6 +286,11 @@ class DSI_cli:
         '''
         Exports to a csv/parquet file
         '''
+        file_extension = filename.rsplit(".", 1)[-1] if '.' in filename else ''
+        if table_name not in ["temp_query", "dsi_erd_gen"] and "dsi_tb_" not in table_name and \
+                file_extension.lower() in ["csv", "pq", "parquet"]:
+            return self.export_stream(f"SELECT * FROM {table_name}", table_name, filename)
+
         if table_name != "temp_query":
             try:
                 self.t.artifact_handler(interaction_type='process')
@@ -329,6 +335,33 @@ class DSI_cli:
         self.t.active_metadata = OrderedDict()
 
 
+    def export_stream(self, sql_query, table_name, filename, chunk_rows = 100000, chunks = None):
+        '''
+        Exports only the result of `sql_query` to a csv/parquet file, streamed from the backend in chunks.
+        If `chunks` is given, those DataFrames are written instead of running `sql_query`.
+        '''
+        file_extension = filename.rsplit(".", 1)[-1] if '.' in filename else ''
+        if "/" not in filename:
+            filename = os.path.join(self.start_dir, filename)
+        writer_name = "Csv_Writer" if file_extension.lower() == "csv" else "Parquet_Writer"
+
+        fnull = open(os.devnull, 'w')
+        try:
+            with redirect_stdout(fnull):
+                self.t.load_module('plugin', writer_name, "writer", filename = filename, table_name = table_name)
+                if chunks is None:
+                    num_rows, runtime = self.t.transload_stream(sql_query, chunk_rows = chunk_rows)
+                else:
+                    start = time.perf_counter()
+                    num_rows = self.t.active_modules['writer'].pop(0).get_chunks(chunks)
+                    runtime = time.perf_counter() - start
+        except Exception as e:
+            self.t.active_modules['writer'] = []
+            print(f"export ERROR: {e}")
+            return 1
+        print(f"Wrote {num_rows} rows in {runtime:.2f}s ({num_rows / max(runtime, 1e-9):,.0f} rows/s)")
+
+
     def get_federate_parser(self):
         parser = argparse.ArgumentParser(prog='federate')
         parser.add_argument('config_file', help='YAML config file that lists all data sources to download')
@@ -612,6 +645,8 @@ class DSI_cli:
         parser.add_argument('sql_query', help='SQL query (in quotes) to execute')
         parser.add_argument('-n', '--num_rows', type=int, required=False, help='Show first n rows of the table')
         parser.add_argument('-e', '--export', type=str, required=False, help='Export to csv or parquet file')
+        parser.add_argument('-s', '--stream', action='store_true', help='Read the result in chunks instead of all at once')
+        parser.add_argument('--chunk_rows', type=int, required=False, default=100000, help='Rows per chunk when streaming')
         return parser
 
 
@@ -626,6 +661,10 @@ class DSI_cli:
 
         print(f"Printing the result from input SQL query: {sql_query}")
 
+        if args.stream:
+            self.query_stream(sql_query, num_rows, args.chunk_rows, args.export)
+            return
+
         try:
             data = self.t.artifact_handler(interaction_type='query', query = sql_query)
         except Exception as e:
@@ -653,6 +692,44 @@ class DSI_cli:
         print()
 
 
+    def query_stream(self, sql_query, num_rows, chunk_rows, export = None):
+        '''
+        Runs a query chunk by chunk, printing the first rows and writing every chunk to the export file as it arrives
+        '''
+        head = {"headers": None, "rows": [], "total": 0}
+        def track_chunks(chunks):
+            for chunk in chunks:
+                if head["headers"] is None:
+                    head["headers"] = chunk.columns.tolist()
+                if len(head["rows"]) < num_rows:
+                    head["rows"].extend(chunk.iloc[:num_rows - len(head["rows"])].values.tolist())
+                head["total"] += len(chunk)
+                yield chunk
+
+        try:
+            chunks = track_chunks(self.t.artifact_handler(interaction_type='query', query = sql_query, stream = True, chunk_rows = chunk_rows))
+            if export is None:
+                for _ in chunks:
+                    pass
+        except Exception as e:
+            print(f"query ERROR: {e}")
+            return
+
+        if export is not None:
+            file_extension = export.rsplit(".", 1)[-1] if '.' in export else ''
+            filename = export if file_extension.lower() in ["csv", "pq", "parquet"] else export + ".csv"
+            error = self.export_stream(sql_query, "temp_query", filename, chunks = chunks)
+        if head["total"] == 0:
+            print()
+            return
+
+        self.t.table_print_helper(head["headers"], head["rows"], head["total"], num_rows)
+        if export is not None and error != 1:
+            print()
+            print(f"Exported the query result to {filename}")
+        print()
+
+
     def get_read_parser(self):
         parser = argparse.ArgumentParser(prog='read')
         parser.add_argument('data_source', help='Data to read into DSI. Either a filename or a URL to the data')
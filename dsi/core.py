@@ -13,10 +13,54 @@ import re
 import tempfile
 from packaging import version
 
+from dsi.utils.columnar import Column, from_dataframe, to_columnar
+from dsi.utils.tracing import collection_rows, file_bytes, frame_bytes, span, traced
+
 # temporary check since pandas 3.0+ has unstable releases
 if version.parse(pd.__version__) >= version.parse("3.0.0"):
     raise ImportError("Pandas 3.0+ is not compatible with DSI due to unstable releases.")
 
+class ModuleRegistry(dict):
+    """
+    Maps Python module names to their imported modules, importing each one only when it is first accessed.
+
+    Keys are known without importing anything, so creating a Terminal does not pay for every backend and plugin dependency.
+    Values are resolved on first access through [], get(), items() or values().
+    If `optional` is True, modules that fail to import are dropped from the registry as if they were never listed.
+    """
+    def __init__(self, module_names = (), optional = False):
+        super().__init__((name, None) for name in module_names)
+        self.optional = optional
+
+    def __getitem__(self, key):
+        module = super().__getitem__(key)
+        if module is None:
+            try:
+                module = import_module(key)
+            except ImportError:
+                if not self.optional:
+                    raise
+                super().__delitem__(key)
+                raise KeyError(key) from None
+            super().__setitem__(key, module)
+        return module
+
+    def get(self, key, default = None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return [(key, self[key]) for key in list(self.keys()) if self.get(key) is not None]
+
+    def values(self):
+        return [module for _, module in self.items()]
+
+    def loaded(self):
+        """Returns the names of Python modules in this registry that have already been imported."""
+        return [key for key in self.keys() if dict.__getitem__(self, key) is not None]
+
 class Terminal():
     """
     An instantiated Terminal is the DSI human/machine interface.
@@ -36,11 +80,18 @@ class Terminal():
     VALID_PLUGINS = VALID_ENV + VALID_READERS + VALID_WRITERS + VALID_DATACARDS
     VALID_BACKENDS = ['Gufi', 'Sqlite', 'DuckDB', 'SqlAlchemy', 'HPSS', 'NDP', 'OSTI', 'Oceans11']
     VALID_MODULES = VALID_PLUGINS + VALID_BACKENDS
+    MODULE_REGISTRY = {'backend': {'Gufi': 'dsi.backends.gufi', 'Sqlite': 'dsi.backends.sqlite', 'DuckDB': 'dsi.backends.duckdb',
+                                   'HPSS': 'dsi.backends.hpss', 'NDP': 'dsi.backends.ndp', 'OSTI': 'dsi.backends.osti',
+                                   'Oceans11': 'dsi.backends.oceans11'},
+                       'plugin': {**{name: 'dsi.plugins.env' for name in VALID_ENV},
+                                  **{name: 'dsi.plugins.file_reader' for name in VALID_READERS + VALID_DATACARDS},
+                                  **{name: 'dsi.plugins.file_writer' for name in VALID_WRITERS},
+                                  'Dictionary': 'dsi.plugins.collection_reader', 'Dataframe': 'dsi.plugins.collection_reader'}}
     VALID_MODULE_FUNCTIONS = {'plugin': ['reader', 'writer'],
                               'backend': ['back-read', 'back-write']}
     VALID_ARTIFACT_INTERACTION_TYPES = ['ingest', 'query', 'notebook', 'process']
 
-    def __init__(self, debug = 0, backup_db = False, runTable = False):
+    def __init__(self, debug = 0, backup_db = False, runTable = False, error_attribution = "traceback", columnar = False):
         """
         Initialization function to configure optional DSI core parameters.
 
@@ -57,26 +108,34 @@ class Terminal():
         `runTable` : bool, default=False
             - If True, a 'runTable' is created, and timestamped each time new data/metadata is ingested.
               Recommended for in-situ use-cases.
+
+        `error_attribution` : str, default="traceback"
+            How errors raised inside readers, writers and backends are traced back to a file and line number.
+
+            - "traceback": reads the location from the exception's traceback, so there is no overhead unless an error occurs.
+            - "settrace": records every function return with sys.settrace() while the module runs, as older DSI versions did. 
+              This slows down pure-Python readers considerably.
+
+        `columnar` : bool, default=False
+            - If True, tables in the DSI abstraction store each column as a `dsi.utils.columnar.Column`: a NumPy array with a null mask
+              instead of a list of Python objects. Columns still index, iterate and compare like lists, so existing readers, writers
+              and backends work unchanged, while numeric data takes a fraction of the memory.
         """
+        if error_attribution not in ["traceback", "settrace"]:
+            raise ValueError("error_attribution must be either 'traceback' or 'settrace'")
+        self.error_attribution = error_attribution
         # sys.tracebacklimit = 0
         
         def static_munge(prefix, implementations):
             return (['.'.join(i) for i in product(prefix, implementations)])
 
+        # Backend and plugin modules are only imported once a DSI module from them is loaded
         self.module_collection = {}
         backend_modules = static_munge(self.BACKEND_PREFIX, self.BACKEND_IMPLEMENTATIONS)
-        self.module_collection['backend'] = {}
-        for module in backend_modules:
-            try:
-                imported = import_module(module)
-                self.module_collection['backend'][module] = imported
-            except ImportError:
-                continue
+        self.module_collection['backend'] = ModuleRegistry(backend_modules, optional=True)
 
         plugin_modules = static_munge(self.PLUGIN_PREFIX, self.PLUGIN_IMPLEMENTATIONS)
-        self.module_collection['plugin'] = {}
-        for module in plugin_modules:
-            self.module_collection['plugin'][module] = import_module(module)
+        self.module_collection['plugin'] = ModuleRegistry(plugin_modules)
 
         self.active_modules = {}
         valid_module_functions_flattened = self.VALID_MODULE_FUNCTIONS['plugin'] + self.VALID_MODULE_FUNCTIONS['backend']
@@ -88,6 +147,7 @@ class Terminal():
 
         self.runTable = runTable
         self.backup_db = backup_db
+        self.columnar = columnar
 
         self.user_wrapper = False
         self.new_tables = None
@@ -121,6 +181,7 @@ class Terminal():
                 [x for x in dir(classlist) if x in self.VALID_MODULES])
         return (class_collector)
 
+    @traced("load_module", "mod_type", "mod_name", "mod_function")
     def load_module(self, mod_type, mod_name, mod_function, **kwargs):
         """
         Load a DSI module from the available Plugin and Backend module collection.
@@ -154,7 +215,12 @@ class Terminal():
             if self.debug_level != 0:
                 self.logger.error("You are trying to load a mismatched backend. Please check the VALID_MODULE_FUNCTIONS and VALID_BACKENDS again")
             raise ValueError("You are trying to load a mismatched backend. Please check the VALID_MODULE_FUNCTIONS and VALID_BACKENDS again")
-        if mod_type == "backend" and not any(mod_name.lower() in item.lower() for item in self.module_collection[mod_type].keys()):
+        registered_module = self.registered_module_helper(mod_type, mod_name)
+        if mod_type == "backend" and registered_module is not None:
+            backend_installed = self.module_collection[mod_type].get(registered_module) is not None
+        else:
+            backend_installed = any(mod_name.lower() in item.lower() for item in self.module_collection[mod_type].keys())
+        if mod_type == "backend" and not backend_installed:
             if self.debug_level != 0:
                 self.logger.error("You are trying to load a backend that is not installed in a base dsi setup. Please run requirements.extras.txt")
             raise ValueError("You are trying to load a backend that is not installed in a base dsi setup. Please run requirements.extras.txt")
@@ -166,83 +232,96 @@ class Terminal():
             mod_name = "Csv_Writer"
 
         load_success = False
-        for python_module in list(self.module_collection[mod_type].keys()):
+        # search the module that registers mod_name first so unrelated modules are never imported
+        search_order = list(self.module_collection[mod_type].keys())
+        registered_module = self.registered_module_helper(mod_type, mod_name)
+        if registered_module in search_order:
+            search_order.remove(registered_module)
+            search_order.insert(0, registered_module)
+        for python_module in search_order:
+            with span("import", module=python_module):
+                this_module = self.module_collection[mod_type].get(python_module)
+            if this_module is None:
+                continue
             try:
-                this_module = import_module(python_module)
                 class_ = getattr(this_module, mod_name)
                 load_success = True
 
                 if mod_function == "reader":
-                    try:
-                        obj = class_(**kwargs)
-                    except Exception:
-                        if self.debug_level != 0:
-                            self.logger.error(f'The kwargs for {mod_name} {mod_function} {mod_type} were incorrect. Check the class again')
-                        raise ValueError(f'The kwargs for {mod_name} {mod_function} {mod_type} were incorrect. Check the class again')
+                    with span("reader.init", reader=mod_name) as init_span:
+                        try:
+                            obj = class_(**kwargs)
+                        except Exception:
+                            if self.debug_level != 0:
+                                self.logger.error(f'The kwargs for {mod_name} {mod_function} {mod_type} were incorrect. Check the class again')
+                            raise ValueError(f'The kwargs for {mod_name} {mod_function} {mod_type} were incorrect. Check the class again')
+                        if init_span.recording:
+                            init_span.set(bytes=file_bytes(getattr(obj, "filenames", None)))
 
                     run_start = datetime.now()
                     if self.debug_level != 0:
                         self.logger.info("   Activating this reader in load_module")
 
-                    tester = 0
-                    if sys.gettrace() is None:
-                        tester = 1
-                        sys.settrace(self.trace_function) # starts a short trace to get line number where plugin reader returned
-
-                    try:
-                        obj.add_rows()
-                    except Exception as e:
-                        if self.debug_level != 0:
-                            self.logger.error(f'   {obj.__class__.__name__} reader error: {str(e)}')
-                        if not self.user_wrapper:
-                            if e.args:
-                                e.args = (f'Error in {original_file} @ line {return_line_number}: {str(e.args[0])}', *e.args[1:])
-                            else:
-                                e.args = (f'Error in {original_file} @ line {return_line_number}',)
-                        raise e from None
-
-                    if tester == 1:
-                        sys.settrace(None) # ends trace to prevent large overhead
+                    tracing = self.start_trace_helper() # only traces if error_attribution is 'settrace'
+                    with span("reader.add_rows", reader=mod_name):
+                        try:
+                            obj.add_rows()
+                        except Exception as e:
+                            original_file, line_number = self.error_location_helper(e, tracing)
+                            if self.debug_level != 0:
+                                self.logger.error(f'   {obj.__class__.__name__} reader error: {str(e)}')
+                            if not self.user_wrapper:
+                                if e.args:
+                                    e.args = (f'Error in {original_file} @ line {line_number}: {str(e.args[0])}', *e.args[1:])
+                                else:
+                                    e.args = (f'Error in {original_file} @ line {line_number}',)
+                            raise e from None
+                    self.stop_trace_helper(tracing)
 
                     self.new_tables = obj.output_collector.keys()
-                    for table_name, table_metadata in obj.output_collector.items():
-                        if table_name.lower() == "runtable":
-                            if self.debug_level != 0:
-                                self.logger.error(f"   Cannot read in '{table_name}' — runTable is a reserved DSI table name.")
-                            raise RuntimeError(f"Cannot read in '{table_name}' — runTable is a reserved DSI table name.")
-                        if "hostname" in table_name.lower():
-                            for colName, colData in table_metadata.items():
-                                if isinstance(colData[0], list):
-                                    str_list = []
-                                    for val in colData:
-                                        str_list.append(f'{val}')
-                                    table_metadata[colName] = str_list
-                        if table_name == "dsi_units":
-                            incorrect_cols = set(["table_name", "column_name", "unit"]).issubset(table_metadata.keys())
-                            if len(table_metadata.keys()) != 3 or not incorrect_cols:
+                    with span("merge", tables=len(obj.output_collector)) as merge_span:
+                        if merge_span.recording:
+                            merge_span.set(rows=collection_rows(obj.output_collector))
+                        for table_name, table_metadata in obj.output_collector.items():
+                            if table_name.lower() == "runtable":
                                 if self.debug_level != 0:
-                                    self.logger.error("   'dsi_units' table columns MUST be: 'table_name', 'column_name', 'unit'")
-                                raise TypeError("'dsi_units' table columns MUST be: 'table_name', 'column_name', 'unit'")
-                        if table_name not in self.active_metadata.keys():
-                            self.active_metadata[table_name] = table_metadata
-                        else:
-                            for colName, colData in table_metadata.items():
-                                if colName in self.active_metadata[table_name].keys():
-                                    self.active_metadata[table_name][colName] += colData
-                                else:
-                                    self.active_metadata[table_name][colName] = colData
+                                    self.logger.error(f"   Cannot read in '{table_name}' — runTable is a reserved DSI table name.")
+                                raise RuntimeError(f"Cannot read in '{table_name}' — runTable is a reserved DSI table name.")
+                            if "hostname" in table_name.lower():
+                                for colName, colData in table_metadata.items():
+                                    if isinstance(colData[0], list):
+                                        str_list = []
+                                        for val in colData:
+                                            str_list.append(f'{val}')
+                                        table_metadata[colName] = str_list
                             if table_name == "dsi_units":
-                                t_list = self.active_metadata[table_name]['table_name']
-                                c_list = self.active_metadata[table_name]['column_name']
-                                u_list = self.active_metadata[table_name]['unit']
-                                visited = {}
-                                for t_name, c_name, unit in zip(t_list, c_list, u_list):
-                                    key = (t_name, c_name)
-                                    if key in visited and visited[key] != unit:
-                                        if self.debug_level != 0:
-                                            self.logger.error(f"   Cannot have a different set of units for column {c_name} in {t_name}")
-                                        raise TypeError(f"Cannot have a different set of units for column {c_name} in {t_name}")
-                                    visited[key] = unit
+                                incorrect_cols = set(["table_name", "column_name", "unit"]).issubset(table_metadata.keys())
+                                if len(table_metadata.keys()) != 3 or not incorrect_cols:
+                                    if self.debug_level != 0:
+                                        self.logger.error("   'dsi_units' table columns MUST be: 'table_name', 'column_name', 'unit'")
+                                    raise TypeError("'dsi_units' table columns MUST be: 'table_name', 'column_name', 'unit'")
+                            if self.columnar and table_name not in ("dsi_relations", "dsi_units"):
+                                table_metadata = to_columnar(table_metadata)
+                            if table_name not in self.active_metadata.keys():
+                                self.active_metadata[table_name] = table_metadata
+                            else:
+                                for colName, colData in table_metadata.items():
+                                    if colName in self.active_metadata[table_name].keys():
+                                        self.active_metadata[table_name][colName] += colData
+                                    else:
+                                        self.active_metadata[table_name][colName] = colData
+                                if table_name == "dsi_units":
+                                    t_list = self.active_metadata[table_name]['table_name']
+                                    c_list = self.active_metadata[table_name]['column_name']
+                                    u_list = self.active_metadata[table_name]['unit']
+                                    visited = {}
+                                    for t_name, c_name, unit in zip(t_list, c_list, u_list):
+                                        key = (t_name, c_name)
+                                        if key in visited and visited[key] != unit:
+                                            if self.debug_level != 0:
+                                                self.logger.error(f"   Cannot have a different set of units for column {c_name} in {t_name}")
+                                            raise TypeError(f"Cannot have a different set of units for column {c_name} in {t_name}")
+                                        visited[key] = unit
                     run_end = datetime.now()
                     if self.debug_level != 0:
                         self.logger.info(f"   Activated this reader with runtime: {run_end-run_start}")
@@ -304,6 +383,13 @@ class Terminal():
                 self.logger.error("Plugin/Backend not found in VALID_PLUGINS/VALID_BACKENDS")
             raise NotImplementedError('Hint: Did you declare your Plugin/Backend in VALID_PLUGINS/VALID_BACKENDS?')
 
+    # Internal function to find the Python module a built-in DSI module is defined in - SHOULD NOT be called by users
+    def registered_module_helper(self, mod_type, mod_name):
+        for name, python_module in self.MODULE_REGISTRY.get(mod_type, {}).items():
+            if name.lower() == mod_name.lower():
+                return python_module
+        return None
+
     def unload_module(self, mod_type, mod_name, mod_function):
         """
         Unloads a specific DSI module from the active_modules collection.
@@ -368,6 +454,7 @@ class Terminal():
         """
         return (self.active_modules)
 
+    @traced("transload")
     def transload(self, **kwargs):
         """
         Transloading signals to the DSI Core Terminal that Plugin set up is complete.
@@ -382,25 +469,20 @@ class Terminal():
             self.logger.info(f"Transloading {obj.__class__.__name__} {'writer'}")
             start = datetime.now()
 
-            tester = 0
-            if sys.gettrace() is None:
-                tester = 1
-                sys.settrace(self.trace_function) # starts a short trace to get line number where writer plugin returned
-            
+            tracing = self.start_trace_helper() # only traces if error_attribution is 'settrace'
             try:
                 obj.get_rows(self.active_metadata, **kwargs)
             except Exception as e:
+                original_file, line_number = self.error_location_helper(e, tracing)
                 if self.debug_level != 0:
                     self.logger.error(f'   {obj.__class__.__name__} writer error: {str(e)}')
                 if not self.user_wrapper:
                     if e.args:
-                        e.args = (f'Error in {original_file} @ line {return_line_number}: {str(e.args[0])}', *e.args[1:])
+                        e.args = (f'Error in {original_file} @ line {line_number}: {str(e.args[0])}', *e.args[1:])
                     else:
-                        e.args = (f'Error in {original_file} @ line {return_line_number}',)
+                        e.args = (f'Error in {original_file} @ line {line_number}',)
                 raise e from None
-
-            if tester == 1:
-                sys.settrace(None) # ends trace to prevent large overhead
+            self.stop_trace_helper(tracing)
 
             used_writers.append(obj)
             end = datetime.now()
@@ -414,6 +496,44 @@ class Terminal():
         else:
             self.active_modules["writer"] = []
 
+    def transload_stream(self, query, chunk_rows = 100000):
+        """
+        Activates all loaded plugin writers with the result of `query` on the first loaded backend, streamed in chunks
+        instead of loading the whole backend into the DSI abstraction with artifact_handler('process').
+
+        Only the rows returned by `query` are read, so exporting one table does not depend on the size of the rest of the database.
+        Every loaded writer must implement `get_chunks()`. All writers are unloaded after activation.
+
+        `query` : str
+            Query whose result is written, such as SELECT * FROM a single table.
+
+        `chunk_rows` : int, optional, default=100000
+            Maximum number of rows read from the backend and held in memory at a time.
+
+        `return` : tuple of (int, float)
+            Number of rows written by the last writer and the total runtime in seconds.
+        """
+        for obj in self.active_modules['writer']:
+            if not hasattr(obj, "get_chunks"):
+                self.active_modules['writer'] = []
+                raise NotImplementedError(f"{obj.__class__.__name__} writer cannot export a streamed query result")
+
+        num_rows = 0
+        start = datetime.now()
+        try:
+            for obj in self.active_modules['writer']:
+                self.logger.info("-------------------------------------")
+                self.logger.info(f"Streaming {obj.__class__.__name__} writer")
+                writer_start = datetime.now()
+                chunks = self.artifact_handler('query', query = query, stream = True, chunk_rows = chunk_rows)
+                num_rows = obj.get_chunks(chunks)
+                runtime = (datetime.now() - writer_start).total_seconds()
+                self.logger.info(f"Runtime: {runtime}s, {num_rows} rows ({num_rows / max(runtime, 1e-9):,.0f} rows/s)")
+        finally:
+            self.active_modules['writer'] = []
+        return num_rows, (datetime.now() - start).total_seconds()
+
+    @traced("artifact_handler", "interaction_type")
     def artifact_handler(self, interaction_type, query = None, **kwargs):
         """
         Interact with loaded DSI backends by ingesting or retrieving data from them.
@@ -436,7 +556,9 @@ class Terminal():
             View relevant functions in the DSI backend file to understand other arguments to pass in.
 
         `return`: only when `interaction_type` = 'query'
-            By default stores query result as a Pandas.DataFrame. If specified, returns it as an OrderedDict
+            By default stores query result as a Pandas.DataFrame. If specified, returns it as an OrderedDict.
+            If `stream` = True is passed in kwargs, returns an iterator of Pandas.DataFrames with at most `chunk_rows` rows each.
+            Backends without native streaming run the full query and the result is split into chunks afterwards.
 
         A DSI Core Terminal may load zero or more Backends with storage functionality.
         """
@@ -469,23 +591,23 @@ class Terminal():
                     if self.debug_level != 0:
                         self.logger.info(f"   Backup file runtime: {backup_end-backup_start}")
 
-                tester = 0
-                if sys.gettrace() is None:
-                    tester = 1
-                    sys.settrace(self.trace_function) # starts a short trace to get line number where ingest_artifacts() returned
-                try:
-                    obj.ingest_artifacts(collection = self.active_metadata, **kwargs)
-                except Exception as e:
-                    if self.debug_level != 0:
-                        self.logger.error(f"Error ingesting data in {original_file} @ line {return_line_number} - {str(e)}")
-                    if self.user_wrapper:
-                        if not (isinstance(e.args[0], str) and str(e.args[0]).startswith("A complex schema")):
-                            e.args = (f"Error ingesting data - {str(e.args[0])}",  *e.args[1:])
-                    else:
-                        e.args = (f"Error ingesting data in {original_file} @ line {return_line_number} - {str(e.args[0])}",  *e.args[1:])
-                    raise e from None
-                if tester == 1:
-                    sys.settrace(None) # ends trace to prevent large overhead
+                tracing = self.start_trace_helper() # only traces if error_attribution is 'settrace'
+                with span("ingest", backend=obj.__class__.__name__) as ingest_span:
+                    if ingest_span.recording:
+                        ingest_span.set(rows=collection_rows(self.active_metadata))
+                    try:
+                        obj.ingest_artifacts(collection = self.active_metadata, **kwargs)
+                    except Exception as e:
+                        original_file, line_number = self.error_location_helper(e, tracing)
+                        if self.debug_level != 0:
+                            self.logger.error(f"Error ingesting data in {original_file} @ line {line_number} - {str(e)}")
+                        if self.user_wrapper:
+                            if not (isinstance(e.args[0], str) and str(e.args[0]).startswith("A complex schema")):
+                                e.args = (f"Error ingesting data - {str(e.args[0])}",  *e.args[1:])
+                        else:
+                            e.args = (f"Error ingesting data in {original_file} @ line {line_number} - {str(e.args[0])}",  *e.args[1:])
+                        raise e from None
+                self.stop_trace_helper(tracing)
                 operation_success = True
                 end = datetime.now()
                 self.logger.info(f"Runtime: {end-start}")
@@ -505,20 +627,28 @@ class Terminal():
                 if "query" in first_backend.query_artifacts.__code__.co_varnames:
                     self.logger.info(f"Query to get data: {query}")
                     kwargs['query'] = query
-                tester = 0
-                if sys.gettrace() is None:
-                    tester = 1
-                    sys.settrace(self.trace_function) # starts a short trace to get line number where query_artifacts() returned
-                try:
-                    query_data = first_backend.query_artifacts(**kwargs)
-                except Exception as e:
-                    if self.debug_level != 0:
-                        self.logger.error((str(e)))
-                    if not self.user_wrapper:
-                        e.args = (f"Caught error in {original_file} @ line {return_line_number}: " + e.args[0], *e.args[1:])
-                    raise e from None
-                if tester == 1:
-                    sys.settrace(None) # ends trace to prevent large overhead
+                split_chunks = None
+                if kwargs.get("stream", False) and "stream" not in first_backend.query_artifacts.__code__.co_varnames:
+                    kwargs.pop("stream")
+                    split_chunks = kwargs.pop("chunk_rows", 100000)
+                tracing = self.start_trace_helper() # only traces if error_attribution is 'settrace'
+                with span("query", backend=first_backend.__class__.__name__) as query_span:
+                    try:
+                        query_data = first_backend.query_artifacts(**kwargs)
+                    except Exception as e:
+                        original_file, line_number = self.error_location_helper(e, tracing)
+                        if self.debug_level != 0:
+                            self.logger.error((str(e)))
+                        if not self.user_wrapper:
+                            e.args = (f"Caught error in {original_file} @ line {line_number}: " + e.args[0], *e.args[1:])
+                        raise e from None
+                    if query_span.recording and isinstance(query_data, pd.DataFrame):
+                        query_span.set(rows=len(query_data), bytes=frame_bytes(query_data))
+                    elif query_span.recording and isinstance(query_data, dict):
+                        query_span.set(rows=collection_rows({"query": query_data}))
+                self.stop_trace_helper(tracing)
+                if split_chunks is not None and query_data is not None:
+                    query_data = self.split_query_helper(query_data, split_chunks)
                 operation_success = True
             else: #backend is empty - cannot query
                 if self.debug_level != 0:
@@ -527,10 +657,11 @@ class Terminal():
 
         elif interaction_type in ['notebook']:
             if self.valid_backend(first_backend):
-                try:
-                    first_backend.notebook(**kwargs)
-                except Exception as e:
-                    raise RuntimeError(f"Error in generating notebook: {e}") from None
+                with span("notebook", backend=first_backend.__class__.__name__):
+                    try:
+                        first_backend.notebook(**kwargs)
+                    except Exception as e:
+                        raise RuntimeError(f"Error in generating notebook: {e}") from None
             else: #backend is empty - cannot create notebook
                 if self.debug_level != 0:
                     self.logger.error("Need to ingest data into first loaded backend before generating a Python notebook")
@@ -545,7 +676,10 @@ class Terminal():
             if self.valid_backend(first_backend):
                 if self.debug_level != 0:
                     self.logger.info(f"{first_backend.__class__.__name__} backend - {interaction_type.upper()} the data")
-                self.active_metadata = first_backend.process_artifacts()
+                with span("process", backend=first_backend.__class__.__name__) as process_span:
+                    self.active_metadata = first_backend.process_artifacts()
+                    if process_span.recording:
+                        process_span.set(rows=collection_rows(self.active_metadata))
                 operation_success = True
             else: #backend is empty - cannot process data
                 if self.debug_level != 0:
@@ -568,6 +702,7 @@ class Terminal():
                 self.logger.error(not_run_msg)
             raise NotImplementedError(not_run_msg)
 
+    @traced("get_table", "table_name")
     def get_table(self, table_name, dict_return = False):
         """
         Returns all data from a specified table in the first loaded backend.
@@ -951,16 +1086,7 @@ class Terminal():
             raise RuntimeError("Input 'collection' must be either a single DataFrame or a list of DataFrames")
 
         if backup:
-            if self.debug_level != 0:
-                self.logger.info(f"   Creating backup file before overwriting data in the {backend.__class__.__name__} backend")
-            backup_start = datetime.now()
-            extension = backend.filename.rfind('.')
-            timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-            backup_file = backend.filename[:extension] + f".backup_{timestamp}" + backend.filename[extension:]
-            shutil.copyfile(backend.filename, backup_file)
-            backup_end = datetime.now()
-            if self.debug_level != 0:
-                self.logger.info(f"   Backup file creation runtime: {backup_end-backup_start}")
+            self.backup_helper(backend)
 
         try:
             backend.overwrite_table(table_name, collection)
@@ -973,6 +1099,84 @@ class Terminal():
         if self.debug_level != 0:
             self.logger.info(f"Runtime: {end-start}")
 
+    def update_rows(self, table_name, collection, row_indexes, backup = False, delete_indexes = None):
+        """
+        Updates only the edited rows of a table in the first loaded backend, instead of overwriting the whole table.
+
+        Changed rows are written as keyed UPDATEs, new rows are appended and new columns are added, all in one transaction,
+        so the cost depends on the size of the edit rather than the size of the table.
+
+        `table_name` : str
+            Name of the table to update in the backend.
+
+        `collection` : pandas.DataFrame
+            Edited table data without the `dsi_` columns. The first len(`row_indexes`) rows are existing rows; any remaining rows are new.
+
+        `row_indexes` : list of int or None
+            Increasing 1-based row positions of the existing rows in `collection`, as returned in `dsi_row_index`.
+            If None, `collection` replaces the whole table, matched to the table's rows by position.
+
+        `backup` : bool, optional, default False.
+            - If True, creates a backup file for the DSI backend before updating its data.
+            - If False, (default), only updates the data.
+
+        `delete_indexes` : list of int, optional, default None.
+            Increasing 1-based row positions of existing rows to delete, which must not also be in `row_indexes`.
+            Only used when `row_indexes` is not None.
+
+        `return` : int or None
+            Number of rows written. None if nothing was written because the backend cannot apply this edit row by row 
+            and the table has to be rewritten with overwrite_table() instead.
+        """
+        if len(self.loaded_backends) == 0:
+            if self.debug_level != 0:
+                self.logger.error('Need to load a valid backend to be able to update a table')
+            raise NotImplementedError('Need to load a valid backend to be able to update a table')
+        backend = self.loaded_backends[0]
+        if not hasattr(backend, "plan_row_update"):
+            return None
+        if isinstance(table_name, str) and table_name.lower() in self.dsi_tables:
+            if self.debug_level != 0:
+                self.logger.error("Input 'table_name' cannot be a DSI-reserved table name. Try again.")
+            raise RuntimeError("Input 'table_name' cannot be a DSI-reserved table name. Try again.")
+        if self.debug_level != 0:
+            self.logger.info("-------------------------------------")
+            self.logger.info(f'Updating rows in the table {table_name} in the first loaded backend')
+        start = datetime.now()
+
+        plan = backend.plan_row_update(table_name, collection, row_indexes, delete_indexes)
+        if plan is None:
+            if self.debug_level != 0:
+                self.logger.info("   Edits cannot be applied row by row. The table needs to be overwritten")
+            return None
+        if backup:
+            self.backup_helper(backend)
+        try:
+            backend.apply_row_update(plan)
+        except Exception as e:
+            if self.debug_level != 0:
+                self.logger.error(f"Update_rows() error: {str(e)}")
+            raise
+
+        end = datetime.now()
+        if self.debug_level != 0:
+            self.logger.info(f"   Updated {plan['num_rows']} rows")
+            self.logger.info(f"Runtime: {end-start}")
+        return plan["num_rows"]
+
+    # Internal function used to copy a backend's file before its data is changed - SHOULD NOT be called by users
+    def backup_helper(self, backend):
+        if self.debug_level != 0:
+            self.logger.info(f"   Creating backup file before overwriting data in the {backend.__class__.__name__} backend")
+        backup_start = datetime.now()
+        extension = backend.filename.rfind('.')
+        timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+        backup_file = backend.filename[:extension] + f".backup_{timestamp}" + backend.filename[extension:]
+        shutil.copyfile(backend.filename, backup_file)
+        backup_end = datetime.now()
+        if self.debug_level != 0:
+            self.logger.info(f"   Backup file creation runtime: {backup_end-backup_start}")
+
     def list(self, collection = False):
         """
         Prints/Returns a list of all tables and their dimensions from the first loaded backend
@@ -1004,6 +1208,7 @@ class Terminal():
         if collection:
             return table_list
 
+    @traced("summary", "table_name")
     def summary(self, table_name = None, collection = False):
         """
         Returns/Prints numerical metadata from tables in the first loaded backend.
@@ -1222,7 +1427,9 @@ class Terminal():
             The new data to store in the table. If it is an Ordered Dict:
 
                 - Keys are column names.
-                - Values are lists representing column data.
+                - Values are lists or `Column` objects representing column data.
+
+            With `columnar` enabled, a DataFrame's numeric columns are stored without copying.
         """
         if self.debug_level != 0:
             self.logger.info("-------------------------------------")
@@ -1232,11 +1439,13 @@ class Terminal():
                 self.logger.error("table_data needs to be in the form of an Ordered Dictionary or Pandas DataFrame")
             raise TypeError("table_data needs to be in the form of an Ordered Dictionary or Pandas DataFrame")
         if isinstance(table_data, OrderedDict):
-            if not all(isinstance(val, list) for val in table_data.values()):
+            if not all(isinstance(val, (list, Column)) for val in table_data.values()):
                 if self.debug_level != 0:
                     self.logger.error("Each key of the Ordered Dict must be a column name and its value a list of row data")
                 raise TypeError("Each key of the Ordered Dict must be a column name and its value a list of row data")
             self.active_metadata[table_name] = table_data
+        elif isinstance(table_data, pd.DataFrame) and self.columnar:
+            self.active_metadata[table_name] = from_dataframe(table_data)
         elif isinstance(table_data, pd.DataFrame):
             self.active_metadata[table_name] = OrderedDict(table_data.to_dict(orient='list'))
 
@@ -1372,6 +1581,13 @@ class Terminal():
                 print(f"  ... showing {num_rows} of {max_rows} rows")
                 break
 
+    # Internal function used to stream a query result from a backend without native streaming - SHOULD NOT be called by users
+    def split_query_helper(self, data, chunk_rows):
+        if isinstance(data, OrderedDict):
+            data = pd.DataFrame(data)
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start:start + chunk_rows]
+
     # Internal function used to get line numbers from return statements - SHOULD NOT be called by users
     def trace_function(self, frame, event, arg):
         global return_line_number
@@ -1381,6 +1597,34 @@ class Terminal():
             original_file = frame.f_code.co_filename # Get file name
         return self.trace_function
 
+    # Internal function that starts a short trace when error_attribution is 'settrace' - SHOULD NOT be called by users
+    def start_trace_helper(self):
+        if self.error_attribution == "settrace" and sys.gettrace() is None:
+            sys.settrace(self.trace_function)
+            return True
+        return False
+
+    # Internal function that ends the trace from start_trace_helper() to prevent large overhead - SHOULD NOT be called by users
+    def stop_trace_helper(self, tracing):
+        if tracing:
+            sys.settrace(None)
+
+    # Internal function used to get the file and line number where an exception left a DSI module - SHOULD NOT be called by users
+    def error_location_helper(self, e, tracing):
+        if tracing:
+            # read the traced location before any more returns are recorded
+            location = (original_file, return_line_number) if "original_file" in globals() else None
+            self.stop_trace_helper(tracing)
+            if location is not None:
+                return location
+        # first traceback entry is the Terminal method that called the module, the next one is the module method that raised
+        tb = e.__traceback__
+        if tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        if tb is None:
+            return "unknown file", "unknown"
+        return tb.tb_frame.f_code.co_filename, tb.tb_lineno
+
     # Internal function used to check if a backend has data
     def valid_backend(self, backend):
         parent_name = backend.__class__.__bases__[0].__name__
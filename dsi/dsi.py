@@ -1,20 +1,20 @@
 from dsi.core import Terminal #, Sync
-from dsi.backends.ndp import NDP
-from dsi.backends.osti import OSTI
-from dsi.backends.oceans11 import Oceans11
 from collections import OrderedDict
 import numpy as np
 import pandas as pd
 import os
 import logging
 import importlib.util
-from contextlib import redirect_stdout
+from contextlib import contextmanager
 import io
 import math
 import ast
 from datetime import datetime
 import inspect
 
+from dsi.utils.dsi_utils import redirect_stdout
+from dsi.utils.tracing import MemoryCollector, tracing
+
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -50,8 +50,12 @@ class DSI():
             If using a DSI-supported backend, must be either "Sqlite", "DuckDB", "NDP", "OSTI" or "Oceans11".
             
             If using an external backend, provide the relative path to the Python module with the backend. 
+
+        `columnar` : bool, optional, default is False.
+            If True, tables read into DSI keep their columns in NumPy arrays instead of Python lists until they are written to the backend.
+            See `Terminal` for details.
         """
-        self.t = Terminal(debug = 0, runTable=False)
+        self.t = Terminal(debug = 0, runTable=False, columnar=kwargs.pop('columnar', False))
         self.t.user_wrapper = True
         self.schema_read = False
         self.schema_tables = set()
@@ -210,6 +214,10 @@ class DSI():
         """
         Prints a list of valid backends that can be used in the `backend_name` argument in `backend()`
         """
+        from dsi.backends.ndp import NDP
+        from dsi.backends.osti import OSTI
+        from dsi.backends.oceans11 import Oceans11
+
         print("\nValid Backends for `backend_name` in backend():\n" + "-" * 40)
         print("Sqlite : Lightweight, file-based SQL backend. Default backend used by DSI API.")
         if importlib.util.find_spec("duckdb") is not None:
@@ -493,7 +501,7 @@ class DSI():
 
 
 
-    def query(self, statement, collection = False, update = False, **kwargs):
+    def query(self, statement, collection = False, update = False, stream = False, chunk_rows = 100000, **kwargs):
         """
         Executes a SQL query on the active backend.
 
@@ -510,6 +518,14 @@ class DSI():
 
             If False (default), return object does not include this column.
 
+        `stream` : bool, optional, default False.
+            If True, the result is read from the backend in chunks so the full result never has to fit in memory.
+            With `collection` = True, returns an iterator of pandas DataFrames with at most `chunk_rows` rows each.
+            With `collection` = False, prints the first rows of the result and the total row count.
+
+        `chunk_rows` : int, optional, default 100000.
+            Only used when `stream` is True. Maximum number of rows in each DataFrame chunk.
+
         `return`: If the `statement` is incorrectly formatted, then nothing is returned or printed
         """
         if self.schema_read:
@@ -523,6 +539,8 @@ class DSI():
         try:
             f = io.StringIO()
             with redirect_stdout(f):
+                if stream:
+                    kwargs.update(stream = True, chunk_rows = chunk_rows)
                 df = self.t.artifact_handler(interaction_type='query', query=statement, **kwargs)
             output = f.getvalue()
         except Exception as e:
@@ -531,6 +549,8 @@ class DSI():
 
         if df is None:
             return
+        if stream:
+            return self.query_stream_helper(statement, df, output, collection, update)
         
         if df.empty:
             msg = output if output else "WARNING: input query returned no data. Please check again."
@@ -558,6 +578,42 @@ class DSI():
 
 
 
+    def query_stream_helper(self, statement, chunks, output, collection, update):
+        """
+        **Internal use only. Do not call**
+
+        Prints the head and row count of a streamed query result, or returns the chunk iterator when `collection` is True.
+        """
+        if collection:
+            msg = f"Streaming the result of the query: {statement} as a collection"
+            logger.log(logging.INFO, msg) if self.silence_messages else print(msg)
+            if not update:
+                return chunks
+            table_name = self.t.get_table_names(statement)[0]
+            msg2 = "Note: Includes 'dsi_table_name' column for dsi.update(); DO NOT modify. Drop if not updating data."
+            logger.log(logging.INFO, msg2) if self.silence_messages else print(msg2)
+            return (chunk.assign(dsi_table_name=table_name)[["dsi_table_name", *chunk.columns]] for chunk in chunks)
+
+        num_rows = 25
+        headers, head_rows, total = None, [], 0
+        for chunk in chunks:
+            if headers is None:
+                headers = chunk.columns.tolist()
+            if len(head_rows) < num_rows:
+                head_rows.extend(chunk.iloc[:num_rows - len(head_rows)].values.tolist())
+            total += len(chunk)
+        if total == 0:
+            msg = output if output else "WARNING: input query returned no data. Please check again."
+            logger.log(logging.INFO, msg) if self.silence_messages else print(msg)
+            return
+        print(f"Printing the result of the query: {statement}")
+        clean_rows = [
+            [None if isinstance(x, float) and math.isnan(x) else x for x in row]
+            for row in head_rows
+        ]
+        self.t.table_print_helper(headers, clean_rows, total, num_rows)
+        print()
+
     def get_table(self, table_name, collection = False, update = False):
         """
         Retrieves all data from a specified table without requiring knowledge of the active backend's query language.
@@ -735,6 +791,9 @@ class DSI():
             If True, returns a list of pandas DataFrames representing a subset of tables where `query` is found.
 
             If False (default), prints the matches to the console.
+
+        Searching a large Sqlite backend is faster if DSI was created with ``fts_index=True``, 
+        which builds a full-text search index next to the backend file. Results are the same either way.
         """
         if self.schema_read:
             raise RuntimeError("ERROR: Cannot search() until all associated data is loaded after a complex schema")
@@ -803,6 +862,8 @@ class DSI():
             DataFrame must include unchanged **`dsi_`** columns from `find()`, `search()`, `query()` or `get_table()` to successfully update.
 
             - If a `query()` DataFrame is the input, the corresponding table in the backend will be completely overwritten.
+            - With a SQLite backend, only the rows that differ from the table are written, so the cost depends on the size of the edit. 
+              The table is still rewritten if columns were dropped or reordered, a key column was edited, or a value needs a wider column type.
 
         `backup` : bool, optional, default False. 
             If True, creates a backup file for the DSI backend before updating its data.
@@ -857,6 +918,18 @@ class DSI():
             table_df = table_df.drop(columns='dsi_table_name')
             table_df = table_df.drop(columns='dsi_row_index')
 
+            # only write the edited rows when the backend supports it, instead of overwriting the whole table
+            try:
+                num_updated = self.t.update_rows(table_name, table_df, row_num_list, backup)
+            except Exception as e:
+                if e.args:
+                    e.args = (f'update() ERROR: {str(e.args[0])}',) + e.args[1:]
+                raise
+            if num_updated is not None:
+                if backup:
+                    self.backup_message_helper()
+                return
+
             fnull = open(os.devnull, 'w')
             with redirect_stdout(fnull):
                 actual_df = self.t.get_table(table_name)
@@ -889,15 +962,21 @@ class DSI():
                 actual_df = pd.concat([actual_df, extra_rows], ignore_index=True)
         else:
             collection = collection.drop(columns='dsi_table_name')
+            try:
+                num_updated = self.t.update_rows(table_name, collection, None, backup)
+            except Exception as e:
+                if e.args:
+                    e.args = (f'update() ERROR: {str(e.args[0])}',) + e.args[1:]
+                raise
+            if num_updated is not None:
+                if backup:
+                    self.backup_message_helper()
+                return
             actual_df = collection.copy()
         
         try:
             if backup:
-                extension = self.database_name.rfind('.')
-                timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-                backup_file = self.database_name[:extension] + f".backup_{timestamp}" + self.database_name[extension:]
-                msg = f"Created backup '{backup_file}' before updating the data."
-                logger.log(logging.INFO, msg) if self.silence_messages else print(msg)
+                self.backup_message_helper()
             self.t.overwrite_table(table_name, actual_df, backup)
         except Exception as e:
             if e.args:
@@ -906,6 +985,18 @@ class DSI():
 
 
 
+    def backup_message_helper(self):
+        """
+        **Internal use only. Do not call**
+
+        Prints the name of the backup file created before `update()` changes the data.
+        """
+        extension = self.database_name.rfind('.')
+        timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+        backup_file = self.database_name[:extension] + f".backup_{timestamp}" + self.database_name[extension:]
+        msg = f"Created backup '{backup_file}' before updating the data."
+        logger.log(logging.INFO, msg) if self.silence_messages else print(msg)
+
     def process(self, backend_name, filename, **kwargs):
         """
         Process converts the current backend into another format: Sqlite or DuckDB for now
@@ -986,7 +1077,7 @@ class DSI():
 
 
 
-    def write(self, filename, writer_name, table_name = None, **kwargs):
+    def write(self, filename, writer_name, table_name = None, query = None, chunk_rows = 100000, **kwargs):
         """
         Exports data from the active backend using the specified `writer_name`.
 
@@ -1009,12 +1100,46 @@ class DSI():
 
         `table_name`: str, optional
             Required when using "Table_Plot", "Csv" or "Parquet" to specify which table to export.
+
+            "Csv" and "Parquet" read only this table from the backend, streamed in chunks of `chunk_rows` rows.
+
+        `query`: str, optional
+            Only used with "Csv" or "Parquet". A SELECT query whose result is exported instead of a whole table. 
+            The result is streamed from the backend in chunks of `chunk_rows` rows.
+
+        `chunk_rows`: int, optional, default 100000
+            Number of rows read from the backend and written to the Csv or Parquet file at a time.
         """
         if self.schema_read:
             raise RuntimeError("ERROR: Cannot write() until all associated data is loaded after a complex schema")
         if not self.t.valid_backend(self.main_backend_obj):
             raise RuntimeError("ERROR: Cannot write() data from an empty backend. Please ensure there is data in it.")
 
+        stream_writer = None
+        if "collection" not in kwargs and not writer_name.endswith(".py"):
+            if writer_name.lower() in ["csv", "csv writer", "csv_writer"]:
+                stream_writer = "Csv_Writer"
+            elif writer_name.lower() in ["parquet", "parquet writer", "parquet_writer"]:
+                stream_writer = "Parquet_Writer"
+        if query is not None and stream_writer is None:
+            raise ValueError("write() ERROR: `query` can only be exported with the Csv or Parquet writers")
+        if stream_writer is not None and (table_name is not None or query is not None):
+            if query is None:
+                query = f"SELECT * FROM {table_name}"
+            elif table_name is None:
+                table_name = "query"
+            try:
+                self.t.load_module('plugin', stream_writer, 'writer', filename=filename, table_name = table_name, **kwargs)
+                with redirect_stdout(io.StringIO()):
+                    num_rows, runtime = self.t.transload_stream(query, chunk_rows = chunk_rows)
+            except Exception as e:
+                if e.args:
+                    e.args = (f'write() ERROR: {str(e.args[0])}',) + e.args[1:]
+                raise
+            msg = f"Successfully wrote {num_rows} rows to the output file {filename} ({num_rows / max(runtime, 1e-9):,.0f} rows/s)"
+            logger.log(logging.INFO, msg) if self.silence_messages else print(msg)
+            return
+
         collection = None
         if "collection" in kwargs:
             collection = kwargs["collection"]
@@ -1260,6 +1385,39 @@ class DSI():
 
 
 
+    @contextmanager
+    def profile(self, output = None, print_report = True):
+        """
+        Context manager that traces every DSI operation run inside its `with` block and prints a per-stage breakdown at the end.
+
+        Operations are split into nested stages with their wall time, CPU time, row counts and bytes, 
+        e.g. load_module > reader.init / reader.add_rows / merge, artifact_handler > ingest > type_inference / insert,
+        and artifact_handler > query > sql / to_dict.
+
+        `output` : str, optional
+            If specified, every stage is also appended to this JSON-lines file, one JSON object per line.
+
+        `print_report` : bool, optional, default=True
+            If True, prints the per-stage breakdown when the `with` block exits.
+
+        `return`: dsi.utils.tracing.MemoryCollector
+            Collector of the recorded stages. Its `breakdown()` returns the aggregated numbers as a list of dictionaries.
+
+        Example:
+            with dsi.profile():
+                dsi.read("data.csv", "Csv")
+                dsi.query("SELECT * FROM data")
+        """
+        collector = MemoryCollector()
+        with tracing(collector, *([output] if output else [])):
+            try:
+                yield collector
+            finally:
+                if print_report:
+                    print(collector.report())
+
+
+
     #help, edge-finding (find this/that)
     def get(self, dbname=None):
         #if not dbname:
@@ -1,8 +1,12 @@
 import json
 import os
 import random
+import threading
 import yaml
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from coolname import generate_slug
 import pandas as pd
 
@@ -11,22 +15,57 @@ from pathlib import Path
 
 from dsi.dsi import DSI
 from dsi.sync import Sync
-from dsi.utils.dsi_utils import detect_valid_db_with_data
+from dsi.utils.dsi_utils import ValidationCatalog, detect_valid_db_with_data
 
 class DSIFederated:
     """A class for federated querying of DSI databases. It loads metadata about the databases and 
     their tables from a specified folder, and provides methods to summarize, query, search, and find data across the federated databases."""
 
-    def __init__(self, federated_folder_path:str, operating_mode:str="console"):
+    def __init__(self, 
+                 federated_folder_path:str, 
+                 operating_mode:str="console",
+                 max_workers:int=8,
+                 timeout:float | None=None,
+                 pool_size:int=256,
+                 check:str="full",
+                 validation_cache:str | bool=False,
+                 background_validation:bool=False):
         """Initializes the DSIFederated class by loading metadata about the federated databases and their tables from a specified folder.
+
+        Databases are opened once and kept in a connection pool, and each federated call runs on up to `max_workers` databases in parallel.
         
         Args:
             federated_folder_path (str): The file path to the folder containing the metadata about the federated databases. The folder should contain a JSON file named "dsi_database_list.json" with the metadata information.
             operating_mode (str): console or notebook, determines how the results are displayed. Default is "console".
+            max_workers (int): Maximum number of databases worked on at the same time. Default is 8.
+            timeout (float | None): Seconds each database has to answer a call. A running SQLite or DuckDB statement is interrupted at the timeout
+                and that database is reported as an error. None for no timeout. Default is None.
+            pool_size (int): Maximum number of open database connections kept between calls. Default is 256.
+            check (str): Consistency check run on each SQLite database before it is federated, "quick" (PRAGMA quick_check) or "full" (PRAGMA integrity_check). Default is "full".
+            validation_cache (str | bool): Where to remember validation results, so databases whose size, modification time and header are unchanged are not checked again.
+                A string is the path of the catalog file, True opts in to the default location under ~/.cache/dsi/validation,
+                and False keeps no catalog and checks every database every time. Default is False.
+            background_validation (bool): If True, new or changed databases only get a quick check at startup and the full check runs in a background thread.
+                Requires `validation_cache`. Default is False.
         """
 
         self.federated_folder_path = federated_folder_path
         self.operating_mode = operating_mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.errors = []    # (database name, exception) for each database that failed in the last call
+
+        self._executor = None
+        self._pool = OrderedDict()  # path -> (DSI, lock), least recently used first
+        self._pool_lock = threading.Lock()
+        self._backend_names = {}    # path -> "sqlite" or "duckdb"
+
+        self.check = check
+        self.validation_catalog = None
+        if validation_cache:
+            catalog_path = None if validation_cache is True else validation_cache
+            self.validation_catalog = ValidationCatalog(catalog_path, check=check, background=background_validation)
 
         try:
             _federated_folder_path = Path(self.federated_folder_path)
@@ -48,36 +87,47 @@ class DSIFederated:
             dsi_databases_list (list[dict]): A list of dictionaries containing information about each federated database.
         """
         
-        databases = []
-        # print(db_path_list)
-        for d_id, dsi_db_info in enumerate(dsi_databases_list):
-            db_info = {}
-
-            db_path = Path(dsi_db_info['local_path'])
-            database_type, valid_db = detect_valid_db_with_data(db_path)
+        # connections to the previous set of databases may be stale
+        self._close_pool()
+
+        # check and list the databases in parallel, keeping the order of dsi_databases_list
+        db_paths = [Path(dsi_db_info['local_path']) for dsi_db_info in dsi_databases_list]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if self.validation_catalog is not None:
+                detected = list(executor.map(self.validation_catalog.validate, db_paths))
+            else:
+                detected = list(executor.map(partial(detect_valid_db_with_data, check=self.check), db_paths))
 
+        valid = []
+        for dsi_db_info, db_path, (database_type, valid_db) in zip(dsi_databases_list, db_paths, detected):
             if valid_db:
-                _temp = DSI(str(db_path), backend_name=database_type, silence_messages="True")
+                self._backend_names[str(db_path)] = database_type
+                valid.append((dsi_db_info, {'name': dsi_db_info['name'], 'path': str(db_path)}))
+            else:
+                print(f"!!!!Error opening database at {db_path}!!!!")
+        tables = self._run_federated([found for _, found in valid], lambda _temp: _temp.list(True))
 
-                # make an easy name for 
-                seed = int(hashlib.md5(str(db_path).encode()).hexdigest()[:8], 16)
-                random.seed(seed)
+        databases = []
+        for (dsi_db_info, found), _tbls in zip(valid, tables):
+            if _tbls is None:
+                continue
+            db_info = {}
 
-                db_info['id'] = generate_slug(2)
+            # make an easy name for 
+            seed = int(hashlib.md5(found['path'].encode()).hexdigest()[:8], 16)
+            random.seed(seed)
 
-                db_info['original_location'] = dsi_db_info['original_location_type']
-                db_info['original_path'] = dsi_db_info['original_path']
-                db_info['name'] = dsi_db_info['name']
-                db_info['path'] = str(db_path)
-                
-                _tbls = _temp.list(True)
-                db_info['num_tables'] = len(_tbls)
-                db_info['tables'] = _tbls
-                _temp.close()
-                
-                databases.append(db_info)
-            else:
-                print(f"!!!!Error opening database at {db_path}!!!!")
+            db_info['id'] = generate_slug(2)
+
+            db_info['original_location'] = dsi_db_info['original_location_type']
+            db_info['original_path'] = dsi_db_info['original_path']
+            db_info['name'] = dsi_db_info['name']
+            db_info['path'] = found['path']
+            
+            db_info['num_tables'] = len(_tbls)
+            db_info['tables'] = _tbls
+            
+            databases.append(db_info)
         
         self.df = pd.DataFrame(databases)   # what is exposed to the user
         self.df_exp = self.df.explode("tables").rename(columns={"tables": "table"})  # what is used internally
@@ -88,6 +138,141 @@ class DSIFederated:
         return self.df_exp
 
 
+    def _connect(self, path: str) -> tuple[DSI, threading.Lock]:
+        """Returns the pooled DSI connection to a database and the lock that serializes its use, opening it on first use.
+        The least recently used idle connections are closed once more than `pool_size` are open.
+        
+        Args:
+            path (str): Path to the database.
+        """
+        with self._pool_lock:
+            entry = self._pool.get(path)
+            if entry is not None:
+                self._pool.move_to_end(path)
+                return entry
+
+        backend_name = self._backend_names.get(path, "sqlite")
+        # pooled connections are used by whichever worker thread handles the database
+        kwargs = {"check_same_thread": False} if backend_name == "sqlite" else {}
+        entry = (DSI(path, backend_name=backend_name, silence_messages=True, **kwargs), threading.Lock())
+
+        with self._pool_lock:
+            if path in self._pool:
+                # another worker opened it first
+                entry[0].close()
+                return self._pool[path]
+            self._pool[path] = entry
+
+            for old_path in list(self._pool):
+                if len(self._pool) <= self.pool_size:
+                    break
+                old_dsi, old_lock = self._pool[old_path]
+                if old_path != path and old_lock.acquire(blocking=False):
+                    del self._pool[old_path]
+                    old_dsi.close()
+                    old_lock.release()
+        return entry
+
+
+    def _close_pool(self, path: str | None = None):
+        """Closes pooled connections, e.g. after a database was modified by another connection.
+        
+        Args:
+            path (str | None): Path of the database to close. If None, closes all of them.
+        """
+        with self._pool_lock:
+            paths = list(self._pool) if path is None else [path]
+            for _path in paths:
+                entry = self._pool.pop(_path, None)
+                if entry is not None:
+                    with entry[1]:
+                        entry[0].close()
+
+
+    def _run_on_database(self, path: str, operation):
+        """Runs `operation` on the pooled DSI connection to one database, interrupting it after `timeout` seconds.
+        
+        Args:
+            path (str): Path to the database.
+            operation (callable): Function called with the DSI object of the database.
+
+        Raises:
+            TimeoutError: If the operation was interrupted at the timeout.
+        """
+        _temp, lock = self._connect(path)
+        with lock:
+            if not self.timeout:
+                return operation(_temp)
+
+            timed_out = threading.Event()
+            con = getattr(_temp.main_backend_obj, "con", None)
+            def interrupt():
+                timed_out.set()
+                if hasattr(con, "interrupt"):
+                    con.interrupt()
+
+            timer = threading.Timer(self.timeout, interrupt)
+            timer.daemon = True
+            timer.start()
+            try:
+                return operation(_temp)
+            except Exception as e:
+                if timed_out.is_set():
+                    raise TimeoutError(f"no answer within {self.timeout} s") from e
+                raise
+            finally:
+                timer.cancel()
+
+
+    def _run_federated(self, found_dbs: list[dict], operation, stream: bool = False):
+        """Runs `operation` on each database in `found_dbs` on up to `max_workers` databases in parallel.
+        Errors and timeouts are printed and stored in `self.errors`; they do not stop the other databases.
+        
+        Args:
+            found_dbs (list[dict]): Database info with at least 'name' and 'path'.
+            operation (callable): Function called with the DSI object of each database.
+            stream (bool): If True, returns an iterator of (db_info, result) pairs in the order the databases finish. 
+                If False, returns the list of results in the order of `found_dbs`, with None for databases that failed.
+        """
+        self.errors = []
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dsi-federated")
+        futures = {self._executor.submit(self._run_on_database, db_info['path'], operation): index
+                   for index, db_info in enumerate(found_dbs)}
+
+        def completed():
+            try:
+                for future in as_completed(futures):
+                    db_info = found_dbs[futures[future]]
+                    try:
+                        yield futures[future], db_info, future.result()
+                    except Exception as e:
+                        print(f"!!!!Error in database {db_info['name']} at {db_info['path']}: {e}!!!!")
+                        self.errors.append((db_info['name'], e))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        if stream:
+            return ((db_info, result) for _, db_info, result in completed())
+
+        res = [None] * len(found_dbs)
+        for index, _, result in completed():
+            res[index] = result
+        return res
+
+
+    def close(self):
+        """Closes all pooled database connections and the validation catalog, and stops the worker threads."""
+        self._close_pool()
+        if self.validation_catalog is not None:
+            self.validation_catalog.close()
+            self.validation_catalog = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
     def f_federate(self, config_file: str, workspace_folder: str = ""):
         """Federates databases based on a specified configuration file containing the criteria for federating the databases.
         
@@ -244,15 +429,13 @@ class DSIFederated:
             found_dbs = self.f_search_for_databases(db, table, original_location, return_output=True, display_results=False)
     
         
-        for db_info in found_dbs:
-            print(f"\nDatabase: {db_info['name']} at path {db_info['path']}:")
-            _temp = DSI(db_info['path'], silence_messages="True")
+        if table == "":
+            results = self._run_federated(found_dbs, lambda _temp: _temp.summary(collection=True))
+        else:
+            results = self._run_federated(found_dbs, lambda _temp: _temp.summary(table_name=table, collection=True))
 
-            if table == "":
-                result = _temp.summary(collection=True)
-            else:
-                result = _temp.summary(table_name=table, collection=True)
-            _temp.close()
+        for db_info, result in zip(found_dbs, results):
+            print(f"\nDatabase: {db_info['name']} at path {db_info['path']}:")
             
             if self.operating_mode == "notebook":
                 try:
@@ -268,7 +451,8 @@ class DSIFederated:
                 query: str, 
                 db: str | None = None, 
                 table: str | None = None,
-                original_location: str | None = None):
+                original_location: str | None = None,
+                stream: bool = False):
         """DSI Query within the federated system. 
             If no table and database are specified, queries all tables in the database.
         
@@ -277,9 +461,10 @@ class DSIFederated:
             db (str | None): The name of the database containing the table. If None, this criterion is ignored. Default is None.
             table (str | None): The name of the table to query. If None, this criterion is ignored. Default is None.
             original_location (str | None): A string to search for in the original location of the databases. If None, this criterion is ignored. Default is None.  
+            stream (bool): If True, returns an iterator of (db_info, result) pairs as each database finishes. Default is False.
 
         Returns:
-            The result of the query execution.
+            The result of the query execution on each database, in the order of the databases. None for a database that failed or timed out.
         """
         
         # Find the path of the database to query
@@ -289,21 +474,15 @@ class DSIFederated:
         else:
             found_dbs = self.f_search_for_databases(db, table, original_location, return_output=True, display_results=False)
     
-        res = []
-        for db_info in found_dbs:
-            _temp = DSI(db_info['path'], silence_messages="True")
-            result = _temp.query(query, collection=True)
-            res.append(result)
-            _temp.close()
-
-        return res
+        return self._run_federated(found_dbs, lambda _temp: _temp.query(query, collection=True), stream)
 
 
     def f_search(self, 
                  query: str, 
                  db: str | None = None, 
                  table: str | None = None, 
-                 original_location: str | None = None):
+                 original_location: str | None = None,
+                 stream: bool = False):
         """
         Calls DSI Search within a specified database within the federated system.
         If no table and database are specified, queries all tables in the database.
@@ -313,6 +492,7 @@ class DSIFederated:
             db (str | None): The name of the database containing the table. If None, this criterion is ignored. Default is None.
             table (str | None): The name of the table to search. If None, this criterion is ignored. Default is None.
             original_location (str | None): A string to search for in the original location of the databases. If None, this criterion is ignored. Default is None.
+            stream (bool): If True, returns an iterator of (db_info, result) pairs as each database finishes. Default is False.
         """
 
         # Find the databases
@@ -322,21 +502,15 @@ class DSIFederated:
             found_dbs = self.f_search_for_databases(db, table, original_location, return_output=True, display_results=False)
     
         # Use DSI to run the query on the specified database and table
-        res = []
-        for db_info in found_dbs:
-            _temp = DSI(db_info['path'], silence_messages="True")
-            result = _temp.search(query, collection=True)
-            res.append(result)
-            _temp.close()
-
-        return res
+        return self._run_federated(found_dbs, lambda _temp: _temp.search(query, collection=True), stream)
         
 
     def f_find(self, 
                query: str, 
                db: str | None = None, 
                table: str | None = None,
-               original_location: str | None = None):
+               original_location: str | None = None,
+               stream: bool = False):
         """Calls DSI Find in a database specified by db within the federated system.
             If no table and database are specified, queries all tables in the database.
         
@@ -345,9 +519,10 @@ class DSIFederated:
             db (str | None): The name of the database containing the table. If None, this criterion is ignored. Default is None.
             table (str | None): The name of the table to find. If None, this criterion is ignored. Default is None.
             original_location (str | None): A string to search for in the original location of the databases. If None, this criterion is ignored. Default is None.
+            stream (bool): If True, returns an iterator of (db_info, result) pairs as each database finishes. Default is False.
 
         Returns:
-            The result of the find operation.
+            The result of the find operation on each database, in the order of the databases. None for a database that failed or timed out.
         """
 
         # Find the databases
@@ -358,14 +533,7 @@ class DSIFederated:
     
 
         # Use DSI to run the find operation on the specified database and table
-        res = []
-        for db_info in found_dbs:
-            _temp = DSI(db_info['path'], silence_messages="True")
-            result = _temp.find(query, collection=True)
-            res.append(result)
-            _temp.close()
-
-        return res
+        return self._run_federated(found_dbs, lambda _temp: _temp.find(query, collection=True), stream)
     
 
     def f_merge(self, src_db_id: str, src_tbl_name: str,
@@ -477,6 +645,7 @@ class DSIFederated:
         df_to_update = df_out.copy()
         df_to_update.insert(0, "dsi_table_name", dst_data["table"])
 
+        self._close_pool(dst_data["path"])
         _temp_dst = DSI(dst_data["path"], silence_messages=True)
         try:
             _temp_dst.update(df_to_update)
@@ -564,6 +733,7 @@ class DSIFederated:
             )
 
         # Write into destination database
+        self._close_pool(dst_data["path"])
         _temp_dst = DSI(dst_data["path"], silence_messages=True)
         try:
             if existing_dst.empty:
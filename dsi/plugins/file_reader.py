@@ -1,9 +1,8 @@
 from collections import OrderedDict
-from typing import Any, Iterator, List, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Dict
 from os.path import abspath
-from hashlib import sha1
 import json
-from math import isnan
 from pandas import DataFrame, read_csv, concat
 import re
 import yaml
@@ -17,6 +16,11 @@ from pydantic import BaseModel, Field
 # import ast
 
 from dsi.plugins.metadata import StructuredMetadata
+from dsi.utils.hash_utils import hash_files
+from dsi.utils.run_cache import RunCache, folder_fingerprint
+
+# files parsed at the same time by the multi-file readers
+READ_WORKERS = min(8, os.cpu_count() or 1)
 
 
 class FileReader(StructuredMetadata):
@@ -34,10 +38,9 @@ class FileReader(StructuredMetadata):
             self.filenames = filenames
         else:
             raise TypeError
-        self.file_info = {}
-        for filename in self.filenames:
-            sha = sha1(open(filename, 'rb').read())
-            self.file_info[abspath(filename)] = sha.hexdigest()
+        # files are streamed and hashed in parallel; unchanged files reuse their cached digest
+        filenames = list(self.filenames)
+        self.file_info = dict(zip(map(abspath, filenames), hash_files(filenames, "sha1")))
     
     def store_dict(self, reader_name: str, data_dict: dict, expected_columns: list[str]) -> OrderedDict:
         data_dict = {k.lower(): v for k, v in data_dict.items()} # convert keys to lowercase
@@ -79,7 +82,8 @@ class FileReader(StructuredMetadata):
         
         return result
 
-    def check_type(self, text):
+    @staticmethod
+    def check_type(text):
         """
         **Internal helper function** 
         
@@ -99,6 +103,75 @@ class FileReader(StructuredMetadata):
             except ValueError:
                 return text
 
+    def read_frames(self, read: Callable[[str], DataFrame]) -> list[DataFrame]:
+        """
+        **Internal helper function**
+
+        Parses every file in `self.filenames` with `read` on a thread pool. The pandas and pyarrow
+        parsers release the GIL, so files are parsed in parallel.
+
+        `read`: function that parses one file into a DataFrame
+
+        `return`: list of DataFrames in the order of `self.filenames`
+        """
+        if len(self.filenames) <= 1 or READ_WORKERS <= 1:
+            return [read(filename) for filename in self.filenames]
+        with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(self.filenames))) as executor:
+            return list(executor.map(read, self.filenames))
+
+    def concat_frames(self, frames: list[DataFrame], error: type[Exception], message: str) -> DataFrame:
+        """
+        **Internal helper function**
+
+        Concatenates the DataFrames of all files with a single `concat`, which is linear in the total number of rows
+        instead of quadratic in the number of files.
+
+        `frames`: one DataFrame per file, in the order of `self.filenames`
+
+        `error`: exception type raised if the frames cannot be concatenated
+
+        `message`: error message, formatted with the first file that could not be added as `{filename}`
+
+        `return`: the concatenated DataFrame
+        """
+        if not frames:
+            return DataFrame()
+        try:
+            return concat(frames, axis=0, ignore_index=True)
+        except Exception:
+            pass
+        # find the file that does not fit, adding one at a time
+        total_df = DataFrame()
+        for filename, frame in zip(self.filenames, frames):
+            try:
+                total_df = concat([total_df, frame], axis=0, ignore_index=True)
+            except Exception:
+                raise error(message.format(filename=filename))
+        return total_df
+
+    def frame_to_columns(self, df: DataFrame) -> OrderedDict:
+        """
+        **Internal helper function**
+
+        Converts a DataFrame to an OrderedDict of column lists, replacing NaN with None one column at a time.
+
+        `df`: DataFrame to convert
+
+        `return`: OrderedDict of column name to list of Python values
+        """
+        table_data = OrderedDict()
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            values = series.tolist()
+            if series.dtype.kind in "fcO":  # only float, complex and object columns can hold NaN
+                mask = series.isna().to_numpy()
+                if mask.any():
+                    values = series.to_numpy(dtype=object)
+                    values[mask] = None
+                    values = values.tolist()
+            table_data[col] = values
+        return table_data
+
 
 class Csv(FileReader):
     """
@@ -127,17 +200,9 @@ class Csv(FileReader):
     def add_rows(self) -> None:
         """ Adds a list containing one or more rows of the CSV along with file_info to output. """
 
-        total_df = DataFrame()
-        for filename in self.filenames:
-            temp_df = read_csv(filename)
-            try:
-                total_df = concat([total_df, temp_df], axis=0, ignore_index=True)
-            except Exception:
-                raise TypeError(f"Error in adding {filename} to the existing csv data. Please recheck column names and data structure")
-
-        table_data = OrderedDict(total_df.to_dict(orient='list'))
-        for col, coldata in table_data.items():  # replace NaNs with None
-            table_data[col] = [None if isinstance(item, float) and isnan(item) else item for item in coldata]
+        total_df = self.concat_frames(self.read_frames(read_csv), TypeError,
+            "Error in adding {filename} to the existing csv data. Please recheck column names and data structure")
+        table_data = self.frame_to_columns(total_df)
         
         if self.table_name is not None:
             self.csv_data[self.table_name] = table_data
@@ -168,16 +233,13 @@ class Bueno(FileReader):
         """
         Parses Bueno data and adds a list containing 1 or more rows.
         """
-        total_df = DataFrame()
+        records = []
         for filename in self.filenames:
             with open(filename, 'r') as fh:
-                file_content = json.load(fh)
-            temp_df = DataFrame([file_content])
-            total_df = concat([total_df, temp_df], axis=0, ignore_index=True)
+                records.append(json.load(fh))
 
-        self.bueno_data = OrderedDict(total_df.to_dict(orient='list'))
-        for col, coldata in self.bueno_data.items():  # replace NaNs with None
-            self.bueno_data[col] = [None if isinstance(item, float) and isnan(item) else item for item in coldata]
+        # one row per file, columns in order of first appearance
+        self.bueno_data = self.frame_to_columns(DataFrame(records))
         
         self.set_schema_2(self.bueno_data)
 
@@ -764,18 +826,10 @@ class Parquet(FileReader):
     
     def add_rows(self) -> None:
         """Parses Parquet data and stores data into a table as an Ordered Dictionary."""
-        total_df = DataFrame()
-        
-        for filename in self.filenames:
-            table = pq.read_table(filename).to_pandas()
-            try:
-                total_df = concat([total_df, table], axis=0, ignore_index=True)
-            except Exception:
-                raise TypeError(f"Error in adding {filename} to the existing Parquet data. Please recheck column names and data structure")
-
-        table_data = OrderedDict(total_df.to_dict(orient='list'))
-        for col, coldata in table_data.items():  # replace NaNs with None
-            table_data[col] = [None if isinstance(item, float) and isnan(item) else item for item in coldata]
+        frames = self.read_frames(lambda filename: pq.read_table(filename).to_pandas())
+        total_df = self.concat_frames(frames, TypeError,
+            "Error in adding {filename} to the existing Parquet data. Please recheck column names and data structure")
+        table_data = self.frame_to_columns(total_df)
 
         if self.table_name is not None:
             self.parquet_data[self.table_name] = table_data
@@ -833,21 +887,14 @@ class Ensemble(FileReader):
         if self.table_name is None:
             self.table_name = "Ensemble"
 
-        total_df = DataFrame()
-        for filename in self.filenames:
-            temp_df = read_csv(filename)
-            try:
-                total_df = concat([total_df, temp_df], axis=0, ignore_index=True)
-            except Exception:
-                raise ValueError(f"Error in adding {filename} to existing Ensemble data. Please column names and data structure again.")
+        total_df = self.concat_frames(self.read_frames(read_csv), ValueError,
+            "Error in adding {filename} to existing Ensemble data. Please column names and data structure again.")
         
         if self.sim_table:
             total_df['sim_id'] = range(1, len(total_df) + 1)
             total_df = total_df[['sim_id'] + [col for col in total_df.columns if col != 'sim_id']]
 
-        total_data = OrderedDict(total_df.to_dict(orient='list'))
-        for col, coldata in total_data.items():  # replace NaNs with None
-            total_data[col] = [None if isinstance(item, float) and isnan(item) else item for item in coldata]
+        total_data = self.frame_to_columns(total_df)
         
         self.csv_data[self.table_name] = total_data
         
@@ -868,16 +915,31 @@ class Cloverleaf(FileReader):
     """
     DSI Reader that stores input and output Cloverleaf data from a directory for each simulation run
     """
-    def __init__(self, folder_path, **kwargs):
+    # identifies cached runs; change it whenever parse_run() returns something different for the same files
+    CACHE_KIND = "cloverleaf:1"
+
+    def __init__(self, folder_path, workers = 1, cache = False, **kwargs):
         """
         `folder_path` : str
             Filepath to the directory where the Cloverleaf data is stored. 
             The directory should have a subfolder for each simulation run, each containing input and output data
+
+        `workers` : int, optional, default=1
+            Number of processes that parse run directories. If greater than 1, runs are parsed in a process pool and 
+            merged in `sim_id` order, so the tables are the same as with a single process.
+            On platforms that start processes by spawning (macOS, Windows), the calling script needs an `if __name__ == "__main__":` guard.
+
+        `cache` : bool or dsi.utils.run_cache.RunCache, optional, default=False
+            If False, every run directory is parsed. To opt in to caching, pass a RunCache, or True for the default on-disk
+            run cache under ~/.cache/dsi/runs. The data parsed from each run directory is then kept in that cache, and a run
+            directory whose files have the same names, sizes and modification times as at the last read is not parsed again.
         """
         if folder_path[-1] != '/':
             self.folder_path = folder_path
         else:
             self.folder_path = folder_path[:-1]
+        self.workers = workers
+        self.cache = cache
         self.cloverleaf_data = OrderedDict()
             
     def add_rows(self) -> None:
@@ -891,95 +953,25 @@ class Cloverleaf(FileReader):
         viz_dict = OrderedDict({'sim_id': [], 'image_filepath': []})
         simulation_dict = OrderedDict({'sim_id': [], 'sim_datetime': []})
 
-        sim_num = 1
         all_runs = sorted([f.name for f in os.scandir(self.folder_path) if f.is_dir() and not f.name.startswith('.') ])
-        for run_name in all_runs:
-            input_file = f"{self.folder_path}/{run_name}/clover.in"
-            
+        runs = self.parse_runs([f"{self.folder_path}/{run_name}" for run_name in all_runs])
+
+        # merge the runs in order, so sim_id and the column order match a serial read
+        for sim_num, run in enumerate(runs, start=1):
             input_dict["sim_id"].append(sim_num)
-            with open(input_file, 'r') as f:
-                input_lines = [line.strip() for line in f if line.strip()]
+            for key, values in run["input"].items():
+                input_dict.setdefault(key, []).extend(values)
 
-            num_timesteps = 0
-            for line in input_lines:
-                if line.startswith("*"):
-                    continue
-                if "test_problem" in line:
-                    test_line = line.strip().lower().split()
-                    if test_line[0] not in input_dict.keys():
-                        input_dict[test_line[0]] = []
-                    input_dict[test_line[0]].append(self.check_type(test_line[1]))
-                elif '=' not in line:
-                    continue
+            output_dict["sim_id"].extend([sim_num] * run["num_steps"])
+            for key, values in run["output"].items():
+                output_dict.setdefault(key, []).extend(values)
 
-                if line.startswith("state 1"):
-                    prefix = "state1_"
-                    tokens = line.replace("state 1", "").strip().split()
-                elif line.startswith("state 2"):
-                    prefix = "state2_"
-                    tokens = line.replace("state 2", "").strip().split()
-                else:
-                    prefix = ""
-                    tokens = line.split()
-                
-                for token in tokens:
-                    if '=' in token:
-                        key, value = token.split('=', 1)
-                        full_key = prefix.lower() + key.lower()
-                        if full_key not in input_dict.keys():
-                            input_dict[full_key] = []
-                        input_dict[full_key].append(self.check_type(value))
-                        if full_key == "end_step":
-                            num_timesteps = self.check_type(value)
-            
-            output_file = f"{self.folder_path}/{run_name}/clover.out"
-            with open(output_file, 'r') as f:
-                output_lines = [line.strip() for line in f if line.strip()]
-            
-            for index, line in enumerate(output_lines):
-                if line[:6] != "Step  ":
-                    continue
-                output_dict["sim_id"].append(sim_num)
-
-                next_line = index
-                total_line = line.strip().split()
-                if total_line[1] == str(num_timesteps):
-                    next_line = index + 10
-                elif total_line[1][-1] == "0":
-                    next_line = index + 3
-                
-                wall_line = output_lines[next_line+1].strip().split()
-                wall_line[0] = f"{wall_line[0]}_{wall_line[1]}"
-                if next_line == index + 10:
-                    total_line.extend([wall_line[0], wall_line[2], "Average_time_per_cell", None, "Step_time_per_cell", None])
-                else:
-                    avg_line = output_lines[next_line+2].strip().split()
-                    avg_line[0] = f"{avg_line[0]}_{avg_line[1]}_{avg_line[2]}_{avg_line[3]}"
-                    step_t_line = output_lines[next_line+3].strip().split()
-                    step_t_line[0] = f"{step_t_line[0]}_{step_t_line[1]}_{step_t_line[2]}_{step_t_line[3]}"
-                    total_line.extend([wall_line[0], wall_line[2], avg_line[0], avg_line[4], step_t_line[0], step_t_line[4]])
-                for out_key, out_val in zip(total_line[::2], total_line[1::2]):
-                    if out_key == '1,':
-                        continue
-                    if out_key.lower() not in output_dict.keys():
-                        output_dict[out_key.lower()] = []
-                    if out_val is not None:
-                        output_dict[out_key.lower()].append(self.check_type(out_val))
-                    else:
-                        output_dict[out_key.lower()].append(out_val)
-
-            for filename in os.listdir(f"{self.folder_path}/{run_name}"):
-                if "vtk" in filename:
-                    viz_dict["sim_id"].append(sim_num)
-                    viz_dict["image_filepath"].append(f"{run_name}/{filename}")
-            viz_dict["image_filepath"] = sorted(viz_dict["image_filepath"])
+            viz_dict["sim_id"].extend([sim_num] * len(run["viz_files"]))
+            viz_dict["image_filepath"].extend(run["viz_files"])
 
             simulation_dict["sim_id"].append(sim_num)
-            with open(f"{self.folder_path}/{run_name}/timestamp.txt", 'r') as f:
-                sim_line = [line.strip() for line in f if line.strip()]
-            simulation_dict['sim_datetime'].append(sim_line[0])
-
-            sim_num+=1
+            simulation_dict['sim_datetime'].append(run["sim_datetime"])
+        viz_dict["image_filepath"] = sorted(viz_dict["image_filepath"])
 
         self.cloverleaf_data["input"] = input_dict
         self.cloverleaf_data["output"] = output_dict
@@ -987,6 +979,141 @@ class Cloverleaf(FileReader):
         self.cloverleaf_data["viz_files"] = viz_dict
         self.set_schema_2(self.cloverleaf_data)
 
+    def parse_runs(self, run_paths: list[str]) -> list[dict]:
+        """
+        **Internal helper function**
+
+        Parses every run directory with `parse_run()`, reusing cached data for unchanged runs and
+        spreading the other runs over `self.workers` processes.
+
+        `run_paths`: run directories in `sim_id` order
+
+        `return`: list of the parsed runs in the order of `run_paths`
+        """
+        cache = RunCache.resolve(self.cache)
+        runs = [None] * len(run_paths)
+        fingerprints = {}
+        if cache is not None:
+            for i, run_path in enumerate(run_paths):
+                fingerprints[i] = folder_fingerprint(run_path)
+                runs[i] = cache.get(self.CACHE_KIND, abspath(run_path), fingerprints[i])
+
+        todo = [i for i, run in enumerate(runs) if run is None]
+        if len(todo) > 1 and self.workers > 1:
+            workers = min(self.workers, len(todo))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(Cloverleaf.parse_run, [run_paths[i] for i in todo],
+                                           chunksize=max(1, len(todo) // (4 * workers))))
+        else:
+            parsed = [Cloverleaf.parse_run(run_paths[i]) for i in todo]
+        for i, run in zip(todo, parsed):
+            runs[i] = run
+
+        if cache is not None:
+            # a run that changed while it was parsed is parsed again next time
+            cache.put_many([(self.CACHE_KIND, abspath(run_paths[i]), fingerprints[i], runs[i])
+                            for i in todo if folder_fingerprint(run_paths[i]) == fingerprints[i]])
+        return runs
+
+    @staticmethod
+    def parse_run(run_path: str) -> dict:
+        """
+        **Internal helper function**
+
+        Parses the clover.in, clover.out and timestamp.txt files and the .vtk file names of one run directory.
+        A static method, so that it can run in a worker process.
+
+        `run_path`: run directory
+
+        `return`: dict with the run's 'input' and 'output' columns, its number of output steps as 'num_steps',
+        its 'viz_files' and its 'sim_datetime'
+        """
+        check_type = FileReader.check_type
+        input_dict = OrderedDict()
+        output_dict = OrderedDict()
+        num_steps = 0
+
+        input_file = f"{run_path}/clover.in"
+        with open(input_file, 'r') as f:
+            input_lines = [line.strip() for line in f if line.strip()]
+
+        num_timesteps = 0
+        for line in input_lines:
+            if line.startswith("*"):
+                continue
+            if "test_problem" in line:
+                test_line = line.strip().lower().split()
+                if test_line[0] not in input_dict.keys():
+                    input_dict[test_line[0]] = []
+                input_dict[test_line[0]].append(check_type(test_line[1]))
+            elif '=' not in line:
+                continue
+
+            if line.startswith("state 1"):
+                prefix = "state1_"
+                tokens = line.replace("state 1", "").strip().split()
+            elif line.startswith("state 2"):
+                prefix = "state2_"
+                tokens = line.replace("state 2", "").strip().split()
+            else:
+                prefix = ""
+                tokens = line.split()
+            
+            for token in tokens:
+                if '=' in token:
+                    key, value = token.split('=', 1)
+                    full_key = prefix.lower() + key.lower()
+                    if full_key not in input_dict.keys():
+                        input_dict[full_key] = []
+                    input_dict[full_key].append(check_type(value))
+                    if full_key == "end_step":
+                        num_timesteps = check_type(value)
+        
+        output_file = f"{run_path}/clover.out"
+        with open(output_file, 'r') as f:
+            output_lines = [line.strip() for line in f if line.strip()]
+        
+        for index, line in enumerate(output_lines):
+            if line[:6] != "Step  ":
+                continue
+            num_steps += 1
+
+            next_line = index
+            total_line = line.strip().split()
+            if total_line[1] == str(num_timesteps):
+                next_line = index + 10
+            elif total_line[1][-1] == "0":
+                next_line = index + 3
+            
+            wall_line = output_lines[next_line+1].strip().split()
+            wall_line[0] = f"{wall_line[0]}_{wall_line[1]}"
+            if next_line == index + 10:
+                total_line.extend([wall_line[0], wall_line[2], "Average_time_per_cell", None, "Step_time_per_cell", None])
+            else:
+                avg_line = output_lines[next_line+2].strip().split()
+                avg_line[0] = f"{avg_line[0]}_{avg_line[1]}_{avg_line[2]}_{avg_line[3]}"
+                step_t_line = output_lines[next_line+3].strip().split()
+                step_t_line[0] = f"{step_t_line[0]}_{step_t_line[1]}_{step_t_line[2]}_{step_t_line[3]}"
+                total_line.extend([wall_line[0], wall_line[2], avg_line[0], avg_line[4], step_t_line[0], step_t_line[4]])
+            for out_key, out_val in zip(total_line[::2], total_line[1::2]):
+                if out_key == '1,':
+                    continue
+                if out_key.lower() not in output_dict.keys():
+                    output_dict[out_key.lower()] = []
+                if out_val is not None:
+                    output_dict[out_key.lower()].append(check_type(out_val))
+                else:
+                    output_dict[out_key.lower()].append(out_val)
+
+        run_name = os.path.basename(run_path)
+        viz_files = [f"{run_name}/{filename}" for filename in os.listdir(run_path) if "vtk" in filename]
+
+        with open(f"{run_path}/timestamp.txt", 'r') as f:
+            sim_line = [line.strip() for line in f if line.strip()]
+
+        return {"input": input_dict, "output": output_dict, "num_steps": num_steps,
+                "viz_files": viz_files, "sim_datetime": sim_line[0]}
+
 
 class DublinCoreDatacard(FileReader):
     """
@@ -215,6 +215,32 @@ class Csv_Writer(FileWriter):
                 raise ValueError(f"Could not export to CSV as the specified columns {self.export_cols} are incorrect")
         df.to_csv(self.csv_file_name, index=False)
 
+    def get_chunks(self, chunks) -> int:
+        """
+        Exports a stream of table chunks to a CSV file, appending one chunk at a time so memory stays bounded by the chunk size.
+
+        `chunks` : iterable of pandas.DataFrame
+            Consecutive pieces of the table, such as the result of a streaming backend query. 
+            An empty iterable means the table does not exist.
+
+        `return` : int
+            Number of rows written
+        """
+        num_rows = None
+        for df in chunks:
+            if num_rows is None:
+                if self.export_cols is not None and not set(self.export_cols).issubset(set(df.columns)):
+                    missing = [col for col in self.export_cols if col not in df.columns]
+                    raise ValueError(f"Could not export {self.table_name} to CSV as the columns {missing} in export_cols do not exist")
+                num_rows = 0
+            if self.export_cols is not None:
+                df = df[self.export_cols]
+            df.to_csv(self.csv_file_name, mode = "w" if num_rows == 0 else "a", header = num_rows == 0, index=False)
+            num_rows += len(df)
+        if num_rows is None:
+            raise KeyError(f"{self.table_name} does not exist in the backend")
+        return num_rows
+
 class Table_Plot(FileWriter):
     """
     DSI Writer that plots all numeric column data for a specified table
@@ -316,6 +342,7 @@ class Parquet_Writer(FileWriter):
     """
     DSI Writer to output certain data as a Parquet file
     """
+    max_pending_chunks = 10
     def __init__(self, table_name, filename, export_cols = None, **kwargs):
         """
         Initializes the Parquet Writer with the specified inputs
@@ -364,4 +391,79 @@ class Parquet_Writer(FileWriter):
                 raise ValueError(f"Could not export to Parquet as the specified column input {self.export_cols} is incorrect")
 
         table = pa.Table.from_pandas(df)
-        pq.write_table(table, self.parquet_file_name, compression="snappy")
\ No newline at end of file
+        pq.write_table(table, self.parquet_file_name, compression="snappy")
+
+    def get_chunks(self, chunks) -> int:
+        """
+        Exports a stream of table chunks to a Parquet file, writing each chunk as its own row group 
+        so memory stays bounded by the chunk size.
+
+        Column types come from the first chunk. A column with only nulls in the first chunk takes its type from the next 
+        chunk with values, looking ahead at most `max_pending_chunks` chunks before falling back to text.
+
+        `chunks` : iterable of pandas.DataFrame
+            Consecutive pieces of the table, such as the result of a streaming backend query. 
+            An empty iterable means the table does not exist.
+
+        `return` : int
+            Number of rows written
+        """
+        writer = None
+        pending = [] # chunks held back until every column has a concrete type
+        num_rows = None
+        try:
+            for df in chunks:
+                if num_rows is None:
+                    if self.export_cols is not None and not set(self.export_cols).issubset(set(df.columns)):
+                        missing = [col for col in self.export_cols if col not in df.columns]
+                        raise ValueError(f"Could not export {self.table_name} to Parquet as the columns {missing} in export_cols do not exist")
+                    num_rows = 0
+                if self.export_cols is not None:
+                    df = df[self.export_cols]
+                table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata()
+                num_rows += len(df)
+                if writer is not None:
+                    writer.write_table(table.cast(writer.schema) if not table.schema.equals(writer.schema) else table)
+                    continue
+                pending.append(table)
+                schema = self.schema_helper(pending)
+                if any(pa.types.is_null(f.type) for f in schema) and len(pending) < self.max_pending_chunks:
+                    continue
+                # columns still all-null after the lookahead are stored as text so later values can be cast
+                schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+                writer = self.flush_helper(schema, pending)
+                pending = []
+            if pending:
+                writer = self.flush_helper(self.schema_helper(pending), pending)
+        finally:
+            if writer is not None:
+                writer.close()
+        if num_rows is None:
+            raise KeyError(f"{self.table_name} does not exist in the backend")
+        return num_rows
+
+    def schema_helper(self, tables):
+        """
+        **Internal use only. Do not call**
+
+        Returns the schema of the first table, with each all-null column given the type it has in the next table that has values for it.
+        """
+        fields = list(tables[0].schema)
+        for i, field in enumerate(fields):
+            for table in tables[1:]:
+                if not pa.types.is_null(field.type):
+                    break
+                field = field.with_type(table.schema.field(i).type)
+            fields[i] = field
+        return pa.schema(fields)
+
+    def flush_helper(self, schema, tables):
+        """
+        **Internal use only. Do not call**
+
+        Opens the Parquet file with `schema` and writes the buffered `tables` to it as row groups.
+        """
+        writer = pq.ParquetWriter(self.parquet_file_name, schema, compression="snappy")
+        for table in tables:
+            writer.write_table(table.cast(schema) if not table.schema.equals(schema) else table)
+        return writer
\ No newline at end of file
@@ -1,8 +1,13 @@
 from dsi.core import Terminal
 from collections import OrderedDict
+from hashlib import sha1
 import git
+import os
+import shutil
 
-from dsi.plugins.file_reader import JSON, Bueno, Csv
+from dsi.plugins.file_reader import JSON, Bueno, Csv, Cloverleaf
+from dsi.utils.hash_utils import HashCache, hash_files
+from dsi.utils.run_cache import RunCache
 
 
 def get_git_root(path):
@@ -163,4 +168,71 @@ def test_parquet_reader():
 
     assert len(a.active_metadata.keys()) == 1
     assert "Parquet" in a.active_metadata.keys()
-    assert a.active_metadata["Parquet"]["wind_speed"] == [2,8,8,5]
\ No newline at end of file
+    assert a.active_metadata["Parquet"]["wind_speed"] == [2,8,8,5]
+
+
+def test_file_reader_streamed_hashes(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"f{i}.csv"
+        path.write_text("a,b\n" + f"{i},{i}\n" * (i * 1000))
+        paths.append(str(path))
+
+    plug = Csv(filenames=paths)
+    assert plug.file_info == {p: sha1(open(p, 'rb').read()).hexdigest() for p in paths}
+    # the default cache stays in memory and writes nothing to disk
+    assert HashCache.default().path is None
+    assert not (tmp_path / "xdg").exists()
+
+    cache = HashCache(tmp_path / "digests.db")
+    expected = hash_files(paths, buffer_size=4096, cache=None)
+    assert hash_files(paths, buffer_size=4096, cache=cache) == expected
+
+    # a new cache on the same file reuses the digests until a file changes
+    cache.close()
+    cache = HashCache(tmp_path / "digests.db")
+    cache.put(paths[0], "sha1", os.stat(paths[0]), "stale")
+    assert hash_files(paths, cache=cache)[0] == "stale"
+    with open(paths[0], "a") as f:
+        f.write("5,5\n")
+    assert hash_files(paths, cache=cache)[0] == sha1(open(paths[0], 'rb').read()).hexdigest()
+
+
+def test_csv_many_files_concat_once(tmp_path):
+    paths = []
+    for i in range(50):
+        path = tmp_path / f"run_{i}.csv"
+        path.write_text("run,energy,extra\n" + f"{i},{i / 2},x\n" if i % 10 == 0 else "run,energy\n" + f"{i},\n")
+        paths.append(str(path))
+    plug = Csv(filenames=paths, table_name="runs")
+    plug.add_rows()
+    runs = plug.output_collector["runs"]
+    assert runs["run"] == list(range(50))
+    assert runs["energy"] == [i / 2 if i % 10 == 0 else None for i in range(50)]
+    assert runs["extra"] == ["x" if i % 10 == 0 else None for i in range(50)]
+
+
+def test_cloverleaf_parallel_and_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    folder = tmp_path / "clover3d"
+    shutil.copytree('/'.join([get_git_root('.'), 'examples/clover3d']), folder)
+
+    def read(**kwargs):
+        plug = Cloverleaf(str(folder), **kwargs)
+        plug.add_rows()
+        return {table: {col: list(values) for col, values in cols.items()} for table, cols in plug.output_collector.items()}
+
+    serial = read()
+    assert serial["simulation"]["sim_id"] == list(range(1, 9))
+    assert not (tmp_path / "xdg").exists()   # runs are only cached when a cache is asked for
+    assert read(cache=False, workers=2) == serial
+
+    cache = RunCache(tmp_path / "runs.db")
+    assert read(cache=cache, workers=2) == serial
+    # unchanged runs come from the cache, a changed run is parsed again
+    with open(folder / "run_1" / "timestamp.txt", "w") as f:
+        f.write("2000-01-01 00:00:00\n")
+    cached = read(cache=RunCache(tmp_path / "runs.db"))
+    assert cached["simulation"]["sim_datetime"] == ["2000-01-01 00:00:00"] + serial["simulation"]["sim_datetime"][1:]
+    assert cached["output"] == serial["output"]
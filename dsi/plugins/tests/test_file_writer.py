@@ -1,10 +1,13 @@
 from dsi.core import Terminal
+from dsi.plugins.file_writer import Csv_Writer, Parquet_Writer
 import git
 
 # import dsi.plugins.file_writer as wCSV
 import cv2
 import numpy as np
 import os
+import pandas as pd
+import pytest
 
 def get_git_root(path):
     git_repo = git.Repo(path, search_parent_directories=True)
@@ -62,4 +65,32 @@ def test_parquet_writer():
     assert "Parquet" in a.active_metadata.keys()
     assert a.active_metadata["Parquet"]["specification"] == ["!amy", "!amy1"]
 
-    os.remove("student_physics_parquet.pq")
\ No newline at end of file
+    os.remove("student_physics_parquet.pq")
+
+def test_stream_writers():
+    a=Terminal()
+    a.load_module('backend', 'Sqlite', 'back-write', filename='stream_writer.db')
+    a.load_module('plugin', 'YAML1', 'reader', filenames=["examples/test/student_test1.yml", "examples/test/student_test2.yml"], target_table_prefix = "student")
+    a.artifact_handler(interaction_type='ingest')
+    a.load_module('plugin', 'Csv_Writer', 'writer', filename = 'physics_stream.csv', table_name = "student__physics")
+    a.load_module('plugin', "Parquet_Writer", "writer", table_name = "student__physics", filename = "physics_stream.pq")
+    num_rows, _ = a.transload_stream("SELECT * FROM student__physics", chunk_rows = 1)
+    assert num_rows == 2
+    assert a.active_modules['writer'] == []
+
+    a.active_metadata.clear()
+    a.load_module('plugin', 'Parquet', 'reader', filenames="physics_stream.pq")
+    a.load_module('plugin', 'Csv', 'reader', filenames="physics_stream.csv", table_name = "Csv")
+    a.unload_module('backend', 'Sqlite', 'back-write')
+    os.remove("physics_stream.pq")
+    os.remove("physics_stream.csv")
+    os.remove("stream_writer.db")
+    assert a.active_metadata["Parquet"]["specification"] == ["!amy", "!amy1"]
+    assert a.active_metadata["Csv"]["n"] == [9.8, 91.8]
+
+def test_stream_writers_missing_export_cols(tmp_path):
+    chunks = [pd.DataFrame({"a": [1, 2]})]
+    with pytest.raises(ValueError, match=r"to CSV as the columns \['b'\] in export_cols"):
+        Csv_Writer("t", str(tmp_path / "t.csv"), export_cols=["a", "b"]).get_chunks(chunks)
+    with pytest.raises(ValueError, match=r"to Parquet as the columns \['b'\] in export_cols"):
+        Parquet_Writer("t", str(tmp_path / "t.pq"), export_cols=["a", "b"]).get_chunks(chunks)
@@ -13,6 +13,7 @@ from typing import Iterator
 from contextlib import redirect_stdout
 from collections import OrderedDict
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dsi.core import Terminal
 from dsi.utils.federated.federate_datasets import federate_datasets, pull_data
@@ -24,12 +25,23 @@ class Sync():
     Sync is where data movement functions such as copy (to remote location) and
     sync (local filesystem with remote) exist.
     """
+    FILESYSTEM_COLUMNS = ['file_origin', 'file_abs', 'size', 'modified_time', 'created_time', 'accessed_time', 'mode',
+                          'inode', 'device', 'n_links', 'uid', 'gid', 'uuid', 'file_remote']
+
     def __init__(self, project_name, isVerbose = False, no_parent = False, skip_index = False, **kwargs):
         self.project_name = project_name
         self.verbose = isVerbose
         self.no_parent = no_parent
         self.skip_index = skip_index
         self.add_dbs = kwargs.pop("add_dbs", [])
+        # threads used to stat files in index(), and number of crawled files given to them at a time
+        self.index_workers = kwargs.pop("index_workers", None)
+        self.index_batch_size = kwargs.pop("index_batch_size", 10000)
+        self.index_stats = {}
+        # threads used to copy files in copy(), size in bytes below which files are batched, and files per batch
+        self.copy_workers = kwargs.pop("copy_workers", None)
+        self.copy_small_file_size = kwargs.pop("copy_small_file_size", 1 << 20)
+        self.copy_batch_size = kwargs.pop("copy_batch_size", 64)
 
         extension = ""
         for ext in (".duckdb", ".sqlite", ".db", ".sqlite3"):
@@ -91,6 +103,10 @@ class Sync():
         """
         Helper function to gather filesystem information, local and remote locations
         to create a filesystem entry in a new or existing database
+
+        Files are stat'ed with a thread pool. If the database already indexes `local_loc`, only files whose 
+        (inode, modified time, size) or remote path changed are rewritten, and only new and removed files are inserted and deleted.
+        Counts of new, changed, removed and unchanged files and the files/sec rate are stored in `index_stats`.
         """
         if "../" in local_loc or "../" in remote_loc:
             raise ValueError("Error: Please use absolute paths instead of relative")
@@ -138,84 +154,115 @@ class Sync():
                     self.t.dsi_tables.append("filesystem")
                     return self.index(local_loc, remote_loc)
 
-        # Data Crawl and gather metadata of local location
-        file_list = self.dircrawl2(local_loc, self.verbose)
-
-        if self.verbose:
-            file_list, tmp = itertools.tee(file_list)
-            file_len=sum(1 for _ in tmp)
-            print("Crawled "+str(file_len)+" files.")
-        
-        file_list = list(file_list) # save as list since dircrawl2() returns an iterator 
-        
         self.remote_location = os.path.join(remote_loc, self.project_name) + os.sep
         self.local_location = local_loc
-        # populate st_list to hold all filesystem attributes
-        st_list = []
-
-        # Do a quick validation of group access permissions
-        # While crawling os.stat info
-        # Create ordered dictionary
-        st_dict = OrderedDict()
-        st_dict['file_origin'] = []
-        st_dict['file_abs'] = [] # Temporary column for unix copy
-        st_dict['size']= []
-        st_dict['modified_time'] = []
-        st_dict['created_time'] = []
-        st_dict['accessed_time'] = []
-        st_dict['mode'] = []
-        st_dict['inode'] = []
-        st_dict['device'] = []
-        st_dict['n_links'] = []
-        st_dict['uid'] = []
-        st_dict['gid'] = []
-        st_dict['uuid'] = []
-        st_dict['file_remote'] = []
 
+        # Only diff against the stored filesystem table if it indexes this same local location
+        fnull = open(os.devnull, 'w')
+        stored_df = None
+        if "federated" in table_list and "filesystem" in table_list:
+            with redirect_stdout(fnull):
+                fed_table = self.t.get_table("federated")
+            if "local_location" in fed_table.columns and fed_table["local_location"].tolist()[:1] == [local_loc]:
+                with redirect_stdout(fnull):
+                    stored_df = self.t.get_table("filesystem")
+                if not {"file_origin", "inode", "modified_time", "size"}.issubset(stored_df.columns):
+                    stored_df = None
+
+        stored_positions = {}
+        stored_keys = []
+        if stored_df is not None:
+            stored_positions = {file: pos for pos, file in enumerate(stored_df["file_origin"].tolist(), start=1)}
+            stored_keys = list(zip(stored_df["inode"].tolist(), stored_df["modified_time"].tolist(), stored_df["size"].tolist(),
+                                   stored_df["file_remote"].tolist() if "file_remote" in stored_df.columns else itertools.repeat(None)))
+
+        # Crawl the local location and stat files with a thread pool, in batches so 
+        # only one batch of paths is held in memory at a time
+        start = time.perf_counter()
+        st_dict = OrderedDict((col, []) for col in self.FILESYSTEM_COLUMNS)
+        update_indexes = []
+        seen = set()
+        num_files = 0
         if self.verbose:
             print("Collection object [", end="")
-            last = -10
 
-        for file in file_list:
-            parent_rel_file = Path(file).relative_to(Path(local_loc).parent)
-            rel_file = os.path.relpath(file,local_loc) #rel path
-            filepath = os.path.join(local_loc, rel_file)
-            st = os.stat(filepath)
-            # append future location to st
-            if self.no_parent: # exclude parent dir of every file in remote location
-                rfilepath = os.path.join(remote_loc, self.project_name, rel_file)
-            else:
-                rfilepath = os.path.join(remote_loc, self.project_name, parent_rel_file)
-            st_dict['file_origin'].append(rel_file)
-            st_dict['file_abs'].append(file) # Temporary column for unix copy
-            st_dict['size'].append(st.st_size)
-            st_dict['modified_time'].append(st.st_mtime)
-            st_dict['created_time'].append(st.st_ctime)
-            st_dict['accessed_time'].append(st.st_atime)
-            st_dict['mode'].append(st.st_mode)
-            st_dict['inode'].append(st.st_ino)
-            st_dict['device'].append(st.st_dev)
-            st_dict['n_links'].append(st.st_nlink)
-            st_dict['uid'].append(st.st_uid)
-            st_dict['gid'].append(st.st_gid)
-            st_dict['uuid'].append(self.gen_uuid(st))
-            st_dict['file_remote'].append(rfilepath)
-            st_list.append(st)
-            if self.verbose:
-                progress = int(len(st_list) / file_len * 100)
-                # Print progress bar every 2%
-                if progress % 2 == 0 and progress != last:
-                    print(".", end="")
-                    last = progress
+        # crawled paths start with local_loc, so relative paths can be sliced off when it is already normalized
+        normalized = os.path.normpath(local_loc) + os.sep == local_loc
+        remote_prefix = os.path.join(remote_loc, self.project_name)
+        if not self.no_parent: # include parent dir of every file in remote location
+            remote_prefix = os.path.join(remote_prefix, os.path.basename(os.path.normpath(local_loc)))
 
+        workers = self.index_workers or min(32, (os.cpu_count() or 1) + 4)
+        file_list = self.dircrawl2(local_loc, self.verbose)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                batch = list(itertools.islice(file_list, self.index_batch_size))
+                if not batch:
+                    break
+                # each thread stats a slice of the batch to keep task overhead low
+                step = max(1, len(batch) // (workers * 4))
+                stat_lists = executor.map(self.stat_helper, [batch[i:i + step] for i in range(0, len(batch), step)])
+                for file, st in zip(batch, itertools.chain.from_iterable(stat_lists)):
+                    if st is None: # file removed during the crawl
+                        continue
+                    num_files += 1
+                    if normalized and file.startswith(local_loc):
+                        rel_file = file[len(local_loc):]
+                        rfilepath = os.path.join(remote_prefix, rel_file)
+                    else:
+                        rel_file = os.path.relpath(file, local_loc)
+                        if self.no_parent:
+                            rfilepath = os.path.join(remote_loc, self.project_name, rel_file)
+                        else:
+                            parent_rel_file = Path(file).relative_to(Path(local_loc).parent)
+                            rfilepath = os.path.join(remote_loc, self.project_name, parent_rel_file)
+
+                    position = stored_positions.get(rel_file)
+                    if position is not None:
+                        seen.add(position)
+                        old_inode, old_mtime, old_size, old_remote = stored_keys[position - 1]
+                        if (old_inode, old_mtime, old_size) == (st.st_ino, st.st_mtime, st.st_size) and old_remote == rfilepath:
+                            continue
+                        update_indexes.append(position)
+
+                    st_dict['file_origin'].append(rel_file)
+                    st_dict['file_abs'].append(file) # Temporary column for unix copy
+                    st_dict['size'].append(st.st_size)
+                    st_dict['modified_time'].append(st.st_mtime)
+                    st_dict['created_time'].append(st.st_ctime)
+                    st_dict['accessed_time'].append(st.st_atime)
+                    st_dict['mode'].append(st.st_mode)
+                    st_dict['inode'].append(st.st_ino)
+                    st_dict['device'].append(st.st_dev)
+                    st_dict['n_links'].append(st.st_nlink)
+                    st_dict['uid'].append(st.st_uid)
+                    st_dict['gid'].append(st.st_gid)
+                    st_dict['uuid'].append(self.gen_uuid(st))
+                    st_dict['file_remote'].append(rfilepath)
+                if self.verbose:
+                    print(".", end="", flush=True)
+
+        delete_indexes = [pos for pos in range(1, len(stored_keys) + 1) if pos not in seen]
+        elapsed = time.perf_counter() - start
+        self.index_stats = {"files": num_files,
+                            "inserted": len(st_dict['file_origin']) - len(update_indexes),
+                            "updated": len(update_indexes),
+                            "deleted": len(delete_indexes),
+                            "unchanged": num_files - len(st_dict['file_origin']),
+                            "seconds": elapsed,
+                            "files_per_sec": num_files / elapsed if elapsed > 0 else 0.0}
         if self.verbose:
-            print(f"] Collection object created with {len(st_list)} entries.")
+            print(f"] Collection object created with {num_files} entries.")
+            print(f"Indexed {num_files} files at {self.index_stats['files_per_sec']:.1f} files/sec: "
+                  f"{self.index_stats['inserted']} new, {self.index_stats['updated']} changed, "
+                  f"{self.index_stats['deleted']} removed, {self.index_stats['unchanged']} unchanged")
                 
         if self.verbose:
             print("Creating filesystem table")
-        fnull = open(os.devnull, 'w')
         with redirect_stdout(fnull):
-            if "filesystem" in table_list:
+            if stored_df is not None:
+                self.filesystem_update_helper(stored_df, st_dict, update_indexes, delete_indexes)
+            elif "filesystem" in table_list:
                 new_fs_df = pd.DataFrame(st_dict)
                 self.t.dsi_tables.remove("filesystem")
                 self.t.overwrite_table("filesystem", new_fs_df)
@@ -236,6 +283,54 @@ class Sync():
         if self.verbose:
             print("DSI Index complete!\n")
 
+    def stat_helper(self, files):
+        """
+        Helper function that returns the os.stat result of each file in `files`, or None for files that no longer exist
+        """
+        st_list = []
+        for file in files:
+            try:
+                st_list.append(os.stat(file))
+            except FileNotFoundError:
+                st_list.append(None)
+        return st_list
+
+    def filesystem_update_helper(self, stored_df, st_dict, update_indexes, delete_indexes):
+        """
+        Helper function that writes only the new, changed and removed files to the stored filesystem table.
+
+        `st_dict` holds the changed files, whose 1-based positions in `stored_df` are in `update_indexes`, followed by new files.
+        """
+        if len(st_dict['file_origin']) == 0 and len(delete_indexes) == 0:
+            return
+        # keep the stored columns, e.g. file_abs is dropped once data has been copied, and sort changed files by position
+        changed_df = pd.DataFrame(st_dict)
+        changed_df = changed_df[[col for col in stored_df.columns if col in changed_df.columns]]
+        order = sorted(range(len(update_indexes)), key=lambda i: update_indexes[i])
+        changed_df = changed_df.iloc[order + list(range(len(update_indexes), len(changed_df)))].reset_index(drop=True)
+        update_indexes = sorted(update_indexes)
+
+        if list(changed_df.columns) == list(stored_df.columns):
+            self.t.dsi_tables.remove("filesystem")
+            try:
+                written = self.t.update_rows("filesystem", changed_df, update_indexes, delete_indexes=delete_indexes)
+            finally:
+                self.t.dsi_tables.append("filesystem")
+            if written is not None:
+                return
+
+        # backend cannot apply the changes row by row so rebuild the table
+        new_fs_df = stored_df.reset_index(drop=True)
+        num_updates = len(update_indexes)
+        for col in changed_df.columns:
+            new_fs_df[col] = new_fs_df[col].astype(object)
+            new_fs_df.loc[[pos - 1 for pos in update_indexes], col] = changed_df[col].iloc[:num_updates].tolist()
+        new_fs_df = new_fs_df.drop(index=[pos - 1 for pos in delete_indexes])
+        new_fs_df = pd.concat([new_fs_df, changed_df.iloc[num_updates:]], ignore_index=True)
+        self.t.dsi_tables.remove("filesystem")
+        self.t.overwrite_table("filesystem", new_fs_df)
+        self.t.dsi_tables.append("filesystem")
+
     def gufi_query_index(self, gufi_prefix, gufi_index, db_path, dsi_table_name, dsi_columns, gufi_columns,
                          collection_name, custom_query=None, isVerbose=False):
         """
@@ -406,20 +501,8 @@ class Sync():
         if tool.lower() == "copy":
             if all(x is None for x in file_list):
                 file_list = [str(Path(self.local_location) / s) for s in filesystem_df["file_origin"]]
-            for file, file_remote in zip(file_list, rfile_list):
-                abspath = os.path.dirname(os.path.abspath(file_remote))
-                if not os.path.exists(abspath):
-                    if self.verbose:
-                        print(" mkdir " + abspath)
-                    path = Path(abspath)
-                    try:
-                        path.mkdir(parents=True)
-                    except Exception:
-                        raise RuntimeError(f"Unable to create folder {abspath}. Check your access rights")
-
-                if self.verbose:
-                    print(" cp " + file + " " + file_remote)
-                shutil.copy2(file , file_remote)
+            size_list = filesystem_df["size"].tolist() if "size" in filesystem_df.columns else [0] * len(file_list)
+            self.transfer(file_list, rfile_list, size_list)
 
             # delete temp columns from filesystem table
             filesystem_df = filesystem_df.drop(columns=["file_abs"], errors="ignore")
@@ -433,6 +516,9 @@ class Sync():
                     print(" cp " + dbname + " " + os.path.join(self.remote_location, dbname))
                 shutil.copy2(dbname, os.path.join(self.remote_location, dbname))
 
+            # every file was copied so a later copy starts over
+            if os.path.exists(self.full_db_name + ".copy_journal"):
+                os.remove(self.full_db_name + ".copy_journal")
             print(" Data Copy Complete!")
         
         elif tool.lower() == "scp":
@@ -628,6 +714,115 @@ class Sync():
             raise TypeError(f"Data movement format not supported:, Type: {tool}")
 
 
+    def transfer(self, file_list, rfile_list, size_list):
+        """
+        Copies each file in `file_list` to the matching path in `rfile_list` with a pool of worker threads.
+
+        Files are scheduled largest first. Files smaller than `copy_small_file_size` are grouped into batches 
+        of up to `copy_batch_size` files so each worker task stays worthwhile.
+
+        Every copied file is recorded in a checkpoint journal next to the database, `<database>.copy_journal`. 
+        If a copy is interrupted, rerunning it only copies files that are not in the journal, or whose source 
+        or destination changed since they were copied. The journal is removed by copy() once all data and databases are copied.
+
+        `file_list` : list of str
+            Local paths of the files to copy.
+
+        `rfile_list` : list of str
+            Destination paths of the files.
+
+        `size_list` : list of int
+            Sizes of the files in bytes, used to order and batch them.
+        """
+        journal_path = self.full_db_name + ".copy_journal"
+        copied = {}
+        if os.path.exists(journal_path):
+            with open(journal_path, newline="") as journal:
+                for row in csv.reader(journal):
+                    if len(row) == 4:
+                        copied[(row[0], row[1])] = (int(row[2]), int(row[3]))
+
+        pending = []
+        for file, file_remote, size in zip(file_list, rfile_list, size_list):
+            if (file, file_remote) in copied and self.journal_helper(file, file_remote) == copied[(file, file_remote)]:
+                continue
+            pending.append((file, file_remote, size or 0))
+        if self.verbose and copied:
+            print(f" Resuming copy: {len(file_list) - len(pending)} files already copied, {len(pending)} remaining")
+
+        for abspath in sorted(set(os.path.dirname(os.path.abspath(file_remote)) for _, file_remote, _ in pending)):
+            if not os.path.exists(abspath):
+                if self.verbose:
+                    print(" mkdir " + abspath)
+                try:
+                    Path(abspath).mkdir(parents=True, exist_ok=True)
+                except Exception:
+                    raise RuntimeError(f"Unable to create folder {abspath}. Check your access rights")
+
+        # large files are copied one per task, small files share a task
+        pending.sort(key=lambda item: item[2], reverse=True)
+        tasks = []
+        small_batch = []
+        for file, file_remote, size in pending:
+            if size >= self.copy_small_file_size:
+                tasks.append([(file, file_remote)])
+            else:
+                small_batch.append((file, file_remote))
+                if len(small_batch) == self.copy_batch_size:
+                    tasks.append(small_batch)
+                    small_batch = []
+        if small_batch:
+            tasks.append(small_batch)
+
+        error = None
+        workers = self.copy_workers or min(32, (os.cpu_count() or 1) + 4)
+        with open(journal_path, "a", newline="") as journal, ThreadPoolExecutor(max_workers=workers) as executor:
+            writer = csv.writer(journal)
+            futures = [executor.submit(self.copy_helper, task) for task in tasks]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                done, task_error = future.result()
+                writer.writerows(done)
+                journal.flush()
+                if task_error is not None and error is None:
+                    error = task_error
+                    for other in futures:
+                        other.cancel()
+        if error is not None:
+            raise RuntimeError(f"Data copy stopped by {error}. Rerun copy to resume the remaining files.") from error
+
+    def copy_helper(self, pairs):
+        """
+        Helper function that copies each (file, file_remote) pair in `pairs` in a worker thread.
+
+        Returns the journal rows of the copied files and the error that stopped the batch, if any.
+        """
+        done = []
+        for file, file_remote in pairs:
+            try:
+                if self.verbose:
+                    print(" cp " + file + " " + file_remote)
+                shutil.copy2(file, file_remote)
+                done.append((file, file_remote) + self.journal_helper(file, file_remote))
+            except Exception as e:
+                return done, e
+        return done, None
+
+    def journal_helper(self, file, file_remote):
+        """
+        Helper function that returns the (size, modified time in ns) recorded in the copy journal for a copied file, 
+        or None if the source file or its copy is missing or their sizes differ.
+        """
+        try:
+            st = os.stat(file)
+            remote_st = os.stat(file_remote)
+        except OSError:
+            return None
+        if st.st_size != remote_st.st_size:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
     def dircrawl(self,filepath, verbose=False):
         """
         Crawls the root 'filepath' directory and returns files
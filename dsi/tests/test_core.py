@@ -6,6 +6,8 @@ from contextlib import redirect_stdout
 import textwrap
 import pandas as pd
 import pytest
+import subprocess
+import sys
 
 def test_terminal_module_getter():
     a = Terminal()
@@ -21,6 +23,113 @@ def test_unload_module():
     a.unload_module('plugin', 'GitInfo', 'writer')
     assert len(a.list_loaded_modules()['writer']) == 0
 
+def test_lazy_module_import_time():
+    # -X importtime logs every module imported while DSI starts up and creates a Terminal
+    script = "from dsi.dsi import DSI; from dsi.core import Terminal; Terminal()"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    for heavy_module in ["duckdb", "requests", "matplotlib", "pydantic", "yaml",
+                         "dsi.backends.ndp", "dsi.backends.osti", "dsi.backends.oceans11", "dsi.plugins.file_writer"]:
+        assert heavy_module not in imported
+
+    a = Terminal()
+    a.load_module('plugin', 'GitInfo', 'writer')
+    assert a.module_collection['plugin'].loaded() == ['dsi.plugins.env']
+    assert a.module_collection['backend'].loaded() == []
+
+def test_reader_error_attribution(tmp_path):
+    reader_file = tmp_path / "bad_reader.py"
+    reader_file.write_text(textwrap.dedent("""
+    from dsi.plugins.file_reader import FileReader
+
+    class BadReader(FileReader):
+        def add_rows(self):
+            return 1 / 0
+    """))
+    messages = []
+    for mode in ["traceback", "settrace"]:
+        a = Terminal(error_attribution=mode)
+        a.add_external_python_module('plugin', 'BadReader', str(reader_file))
+        with pytest.raises(ZeroDivisionError) as e:
+            a.load_module('plugin', 'BadReader', 'reader', filenames=str(reader_file))
+        messages.append(str(e.value))
+    assert messages[0] == f"Error in {reader_file} @ line 6: division by zero"
+    assert messages[0] == messages[1]
+    with pytest.raises(ValueError):
+        Terminal(error_attribution="off")
+
+def test_columnar_abstraction(tmp_path):
+    import numpy as np
+    from dsi.utils.columnar import Column
+    csv = tmp_path / "runs.csv"
+    pd.DataFrame({"run": [1, 2, 3], "energy": [1.5, None, 2.5], "state": ["ok", None, "bad"]}).to_csv(csv, index=False)
+
+    results = []
+    for columnar in [False, True]:
+        a = Terminal(columnar=columnar)
+        a.load_module('plugin', 'Csv', 'reader', filenames=str(csv), table_name="runs")
+        a.load_module('plugin', 'Csv', 'reader', filenames=str(csv), table_name="runs")
+        runs = a.active_metadata["runs"]
+        assert all(isinstance(col, Column) == columnar for col in runs.values())
+        assert runs["run"] == [1, 2, 3, 1, 2, 3] and runs["energy"][1] is None and runs["state"][-1] == "bad"
+
+        a.load_module('backend', 'Sqlite', 'back-write', filename=str(tmp_path / f"columnar_{columnar}.db"))
+        a.artifact_handler(interaction_type='ingest')
+        results.append(a.artifact_handler(interaction_type='query', query="SELECT * FROM runs"))
+        a.close()
+    assert results[0].equals(results[1])
+
+    # numeric DataFrame columns are stored without copying
+    a = Terminal(columnar=True)
+    df = pd.DataFrame({"step": range(5), "value": [0.5] * 5})
+    a.update_abstraction("steps", df)
+    assert a.active_metadata["steps"]["step"].dtype == "int64"
+    assert np.shares_memory(a.active_metadata["steps"]["value"].values, df["value"].to_numpy())
+    a.active_metadata["steps"]["step"] += [5, None]
+    assert a.active_metadata["steps"]["step"] == [0, 1, 2, 3, 4, 5, None]
+
+def test_tracing_spans(tmp_path, monkeypatch):
+    import json
+    from dsi.utils import tracing
+    csv = tmp_path / "runs.csv"
+    pd.DataFrame({"run": range(10), "energy": [0.5] * 10}).to_csv(csv, index=False)
+
+    collector = tracing.MemoryCollector()
+    with tracing.tracing(collector, tmp_path / "trace.jsonl"):
+        a = Terminal()
+        a.load_module('plugin', 'Csv', 'reader', filenames=str(csv), table_name="runs")
+        a.load_module('backend', 'Sqlite', 'back-write', filename=str(tmp_path / "trace.db"))
+        a.artifact_handler(interaction_type='ingest')
+        a.artifact_handler(interaction_type='query', query="SELECT * FROM runs", dict_return=True)
+        a.close()
+    assert tracing.active_tracer() is None
+
+    stages = {s["path"]: s for s in collector.breakdown()}
+    assert stages["load_module/reader.add_rows"]["count"] == 1
+    assert stages["load_module/reader.init"]["bytes"] == os.path.getsize(csv)
+    assert stages["artifact_handler/ingest/insert"]["rows"] == 10
+    assert stages["load_module/merge"]["rows"] == stages["artifact_handler/ingest"]["rows"] == 10
+    assert stages["artifact_handler/query/sql"]["rows"] == 10
+    assert "artifact_handler/query/to_dict" in stages
+    assert all(s["wall"] >= 0 and s["cpu"] >= 0 for s in stages.values())
+    assert "reader.add_rows" in collector.report()
+
+    with open(tmp_path / "trace.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == len(collector.spans)
+    by_id = {line["span_id"]: line for line in lines}
+    assert all(by_id[line["parent_id"]]["path"] + "/" + line["name"] == line["path"] for line in lines if line["parent_id"])
+
+    # without a tracer, row counts are not computed at all
+    monkeypatch.setattr("dsi.core.collection_rows", lambda collection: pytest.fail("rows counted while not tracing"))
+    a = Terminal()
+    a.load_module('plugin', 'Csv', 'reader', filenames=str(csv), table_name="runs")
+    a.load_module('backend', 'Sqlite', 'back-write', filename=str(tmp_path / "untraced.db"))
+    a.artifact_handler(interaction_type='ingest')
+    a.artifact_handler(interaction_type='query', query="SELECT * FROM runs", dict_return=True)
+    a.close()
+
 # SQLITE TESTS
 def test_ingest_sqlite_backend():
     a = Terminal()
@@ -3,7 +3,7 @@ import os
 import io
 from contextlib import redirect_stdout
 import textwrap
-from pandas import DataFrame
+from pandas import DataFrame, read_parquet
 from collections import OrderedDict
 import hashlib
 
@@ -64,6 +64,17 @@ def test_write_sqlite_backend():
     test.write(filename="physics.csv", writer_name="Csv_Writer", table_name="physics")
     assert True
 
+def test_write_query_sqlite_backend():
+    test_read_sqlite_backend()
+
+    dbpath = 'data.db'
+    test = DSI(filename=dbpath, backend_name= "Sqlite")
+
+    test.write(filename="physics_query.pq", writer_name="Parquet", query="SELECT specification, n FROM physics WHERE n > 10", chunk_rows=1)
+    data = read_parquet("physics_query.pq")
+    os.remove("physics_query.pq")
+    assert data.values.tolist() == [["!amy1", 91.8]]
+
 def test_query_sqlite_backend():
     test_read_sqlite_backend()
 
@@ -92,6 +103,22 @@ def test_query_sqlite_backend():
     assert query_data["n"].tolist() == [9.8, 91.8]
     assert query_data["dsi_table_name"][0] == "physics"
 
+def test_query_stream_sqlite_backend():
+    test_read_sqlite_backend()
+
+    dbpath = 'data.db'
+    test = DSI(filename=dbpath, backend_name= "Sqlite")
+
+    chunks = list(test.query("SELECT * FROM physics", collection=True, update=True, stream=True, chunk_rows=1))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    assert chunks[0].columns.tolist() == ['dsi_table_name','specification','n','o','p','q','r','s']
+    assert [chunk["n"].iloc[0] for chunk in chunks] == [9.8, 91.8]
+
+    f = io.StringIO()
+    with redirect_stdout(f):
+        test.query("SELECT * FROM physics", stream=True, chunk_rows=1)
+    assert "!amy1         | 91.8 | gravity | 233 | home 23 | 12 | -0.0122" in f.getvalue()
+
 def test_query_update_sqlite_backend():
     dbpath = 'data.db'
     if os.path.exists(dbpath):
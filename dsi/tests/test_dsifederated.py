@@ -0,0 +1,95 @@
+from dsi.dsifederated import DSIFederated
+import json
+import sqlite3
+import time
+
+def make_federation(tmp_path, num_dbs):
+    databases = []
+    for i in range(num_dbs):
+        path = tmp_path / f"db_{i}.db"
+        with sqlite3.connect(path) as con:
+            con.execute("CREATE TABLE runs (run_id INTEGER, db INTEGER)")
+            con.executemany("INSERT INTO runs VALUES (?, ?)", [(r, i) for r in range(i + 1)])
+        con.close()
+        databases.append({"local_path": str(path), "original_location_type": "local",
+                          "original_path": str(path), "name": f"db_{i}"})
+    with open(tmp_path / "dsi_database_list.json", "w") as f:
+        json.dump(databases, f)
+    return str(tmp_path)
+
+def test_federated_parallel_query(tmp_path):
+    fed = DSIFederated(make_federation(tmp_path, 12), max_workers=4, pool_size=20)
+    assert list(fed.df["name"]) == [f"db_{i}" for i in range(12)]
+    assert fed.validation_catalog is None   # no persistent catalog unless one is asked for
+
+    res = fed.f_query("SELECT COUNT(*) AS n, MAX(db) AS db FROM runs")
+    assert [(r["n"][0], r["db"][0]) for r in res] == [(i + 1, i) for i in range(12)]
+
+    # connections are pooled between calls
+    pooled = {path: entry[0] for path, entry in fed._pool.items()}
+    assert len(pooled) == 12
+    fed.f_query("SELECT * FROM runs", db="db_3")
+    assert fed._pool[str(tmp_path / "db_3.db")][0] is pooled[str(tmp_path / "db_3.db")]
+
+    streamed = fed.f_query("SELECT MAX(db) AS db FROM runs", stream=True)
+    assert sorted(r["db"][0] for _, r in streamed) == list(range(12))
+
+    # a failing database does not stop the others
+    res = fed.f_query("SELECT missing FROM runs", db="db_5")
+    assert res == [None] and fed.errors[0][0] == "db_5"
+    assert fed.f_query("SELECT db FROM runs", db="db_5")[0]["db"].tolist() == [5] * 6
+    fed.close()
+    assert not fed._pool
+
+def test_federated_pool_size_and_timeout(tmp_path):
+    fed = DSIFederated(make_federation(tmp_path, 6), max_workers=2, pool_size=3, timeout=0.5)
+    assert len(fed._pool) <= 3
+
+    slow = "SELECT MAX(x) FROM runs, (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT x FROM c)"
+    start = time.perf_counter()
+    res = fed.f_query(slow, db="db_1")
+    assert res == [None]
+    assert time.perf_counter() - start < 5
+    assert isinstance(fed.errors[0][1], TimeoutError)
+
+    # the interrupted connection still answers
+    assert fed.f_query("SELECT COUNT(*) AS n FROM runs", db="db_1")[0]["n"][0] == 2
+    assert fed.errors == []
+    fed.close()
+
+def test_federated_validation_catalog(tmp_path):
+    folder = make_federation(tmp_path, 4)
+    catalog_path = str(tmp_path / "catalog.db")
+
+    fed = DSIFederated(folder, validation_cache=catalog_path)
+    assert fed.validation_catalog.stats["checks"] == 4
+    fed.close()
+
+    # unchanged databases are not opened again; a modified one is
+    with sqlite3.connect(tmp_path / "db_2.db") as con:
+        con.execute("INSERT INTO runs VALUES (99, 2)")
+    con.close()
+    fed = DSIFederated(folder, validation_cache=catalog_path)
+    assert fed.validation_catalog.stats == {"hits": 3, "checks": 1, "background_checks": 0}
+    assert len(fed.df) == 4
+    fed.close()
+
+    # a quick check is enough to start, the full check finishes in the background
+    fed = DSIFederated(folder, validation_cache=str(tmp_path / "background.db"), background_validation=True)
+    fed.validation_catalog.wait()
+    assert fed.validation_catalog.stats["background_checks"] == 4
+    levels = sqlite3.connect(tmp_path / "background.db").execute("SELECT DISTINCT level FROM validation").fetchall()
+    assert levels == [("full",)]
+    fed.close()
+
+def test_federated_threads_keep_stdout(tmp_path, capsys):
+    import sys
+    fed = DSIFederated(make_federation(tmp_path, 16), max_workers=8, pool_size=16)
+    stdout = sys.stdout
+    for _ in range(20):
+        res = fed._run_federated(fed.df.to_dict(orient="records"), lambda _temp: _temp.summary(collection=True))
+        assert all(r is not None for r in res)
+        assert sys.stdout is stdout
+    print("still printed")
+    fed.close()
+    assert "still printed" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+from dsi.sync import Sync
+import os
+import sqlite3
+import shutil
+import pytest
+
+def test_incremental_index(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    for i in range(10):
+        (data / "sub" / f"f{i}.txt").write_text("x" * i)
+    monkeypatch.chdir(tmp_path)
+    dbpath = "project.db"
+
+    s = Sync(dbpath)
+    s.index(str(data), str(tmp_path / "remote"))
+    assert s.index_stats["inserted"] == 10 and s.index_stats["files_per_sec"] > 0
+    s.copy("copy")
+
+    (data / "sub" / "f3.txt").write_text("changed")
+    os.remove(data / "sub" / "f5.txt")
+    (data / "new.txt").write_text("new")
+    s = Sync(dbpath)
+    s.index(str(data), str(tmp_path / "remote"))
+    stats = s.index_stats
+    assert (stats["files"], stats["inserted"], stats["updated"], stats["deleted"], stats["unchanged"]) == (10, 1, 1, 1, 8)
+
+    rows = dict(sqlite3.connect(dbpath).execute("SELECT file_origin, size FROM filesystem;").fetchall())
+    assert len(rows) == 10
+    assert rows["sub/f3.txt"] == 7 and rows["new.txt"] == 3 and "sub/f5.txt" not in rows
+
+    s = Sync(dbpath)
+    s.index(str(data), str(tmp_path / "remote"))
+    assert s.index_stats["unchanged"] == 10
+
+def test_resumable_copy(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(20):
+        (data / f"f{i}.txt").write_text("x" * (i * 100))
+    monkeypatch.chdir(tmp_path)
+
+    s = Sync("project.db", copy_workers=4, copy_small_file_size=1000, copy_batch_size=3)
+    s.index(str(data), str(tmp_path / "remote"))
+
+    copy2 = shutil.copy2
+    def interrupted_copy(src, dst):
+        if src.endswith("f7.txt"):
+            raise OSError("disk quota exceeded")
+        return copy2(src, dst)
+    monkeypatch.setattr(shutil, "copy2", interrupted_copy)
+    with pytest.raises(RuntimeError, match="Rerun copy to resume"):
+        s.copy("copy")
+    assert os.path.exists("project.db.copy_journal")
+    with open("project.db.copy_journal") as journal:
+        journaled = len(journal.readlines())
+    assert 0 < journaled < 20
+
+    copied = []
+    def counting_copy(src, dst):
+        copied.append(src)
+        return copy2(src, dst)
+    monkeypatch.setattr(shutil, "copy2", counting_copy)
+    s.copy("copy")
+    assert len([f for f in copied if f.endswith(".txt")]) == 20 - journaled
+    assert not os.path.exists("project.db.copy_journal")
+    remote = tmp_path / "remote" / "project" / "data"
+    assert sorted(os.listdir(remote)) == sorted(f"f{i}.txt" for i in range(20))
+    assert (remote / "f19.txt").read_text() == "x" * 1900
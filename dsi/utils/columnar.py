@@ -0,0 +1,343 @@
+from collections import OrderedDict
+from collections.abc import MutableSequence
+
+import numpy as np
+import pandas as pd
+
+
+# values converted to Python objects at a time when a Column is iterated
+ITER_CHUNK = 65536
+_NONE_TYPE = type(None)
+_TYPED = {bool: np.dtype(bool), int: np.dtype(np.int64), float: np.dtype(np.float64)}
+_FILL = {"b": False, "i": 0, "f": 0.0}
+
+
+class Column(MutableSequence):
+    """One column of the DSI abstraction stored in a NumPy array with a null mask.
+
+    Columns of only bools, only ints (within int64) or only floats are stored in typed arrays, so a 10M-value
+    column takes 80 MB instead of 10M boxed Python objects. Any other mix of values is kept in an object array.
+    None is recorded in a boolean null mask next to typed data.
+
+    A Column behaves like the list it was built from: indexing, slicing, iteration, ``+=``, ``append``
+    and comparison with lists all return the same Python values, so readers, writers and backends written
+    for list columns keep working. Code that knows about Columns can use `values`, `mask`,
+    ``numpy.asarray(column)`` or ``pyarrow.array(column)`` without converting each value.
+
+    Args:
+        values: Initial values, a list or any iterable.
+    """
+
+    __slots__ = ("_data", "_mask", "_len")
+
+    def __init__(self, values=()):
+        if isinstance(values, Column):
+            self._set(values.values.copy(), None if values._mask is None else values.mask.copy())
+            return
+        if not isinstance(values, list):
+            values = list(values)
+        types = set(map(type, values))
+        has_null = _NONE_TYPE in types
+        types.discard(_NONE_TYPE)
+        n = len(values)
+
+        data, mask = None, None
+        if len(types) == 1 and next(iter(types)) in _TYPED:
+            dtype = _TYPED[next(iter(types))]
+            try:
+                if has_null:
+                    fill = _FILL[dtype.kind]
+                    data = np.fromiter((fill if v is None else v for v in values), dtype, n)
+                    mask = np.fromiter((v is None for v in values), bool, n)
+                else:
+                    data = np.array(values, dtype=dtype)
+            except OverflowError:   # ints outside int64 stay Python objects
+                data, mask = None, None
+        if data is None:
+            data = np.fromiter(values, object, n)
+        self._set(data, mask)
+
+    def _set(self, data: np.ndarray, mask: np.ndarray | None) -> None:
+        self._data = data
+        self._mask = mask
+        self._len = len(data)
+
+    @classmethod
+    def from_array(cls, data, mask=None) -> "Column":
+        """Wrap a 1-D NumPy array, and an optional boolean null mask, without copying bool, int64 and float64 data.
+
+        Other integer and float widths are converted to int64 and float64; any other dtype is stored as Python objects.
+        """
+        data = np.asarray(data)
+        if data.dtype.kind in "iu":
+            if data.dtype.kind == "u" and data.size and data.max() > np.iinfo(np.int64).max:
+                data = data.astype(object)
+            else:
+                data = data.astype(np.int64, copy=False)
+        elif data.dtype.kind == "f":
+            data = data.astype(np.float64, copy=False)
+        elif data.dtype.kind != "b":
+            data = data.astype(object)
+        column = cls.__new__(cls)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if not mask.any():
+                mask = None
+            elif data.dtype == object:
+                data = data.copy()
+                data[mask] = None
+                mask = None
+        column._set(data, mask)
+        return column
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "Column":
+        """Wrap a pandas Series. NumPy-backed bool, int and float columns are shared, not copied.
+
+        Values read back the same as from ``series.tolist()``: float NaN stays NaN, and nullable
+        extension dtypes turn their missing values into None.
+        """
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            return cls.from_array(series.to_numpy())
+        if isinstance(series.dtype, np.dtype):
+            return cls.from_array(series.astype(object).to_numpy())
+        # pandas extension dtypes (Int64, boolean, string, ...) mark missing values with pd.NA
+        missing = series.isna().to_numpy()
+        return cls.from_array(series.astype(object).to_numpy(), mask=missing)
+
+    @classmethod
+    def from_arrow(cls, array) -> "Column":
+        """Build a Column from a pyarrow Array or ChunkedArray, sharing null-free numeric buffers where Arrow allows it."""
+        import pyarrow as pa
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if pa.types.is_boolean(array.type) or pa.types.is_integer(array.type) or pa.types.is_floating(array.type):
+            if array.null_count == 0:
+                return cls.from_array(array.to_numpy(zero_copy_only=False))
+            mask = array.is_null().to_numpy(zero_copy_only=False)
+            fill = pa.scalar(False if pa.types.is_boolean(array.type) else 0, type=array.type)
+            return cls.from_array(array.fill_null(fill).to_numpy(zero_copy_only=False), mask=mask)
+        return cls(array.to_pylist())
+
+    @property
+    def values(self) -> np.ndarray:
+        """The data array. Entries under the null mask hold a placeholder."""
+        return self._data[:self._len]
+
+    @property
+    def mask(self) -> np.ndarray | None:
+        """Boolean array that is True where the value is None, or None if no typed value is null."""
+        return None if self._mask is None else self._mask[:self._len]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def null_count(self) -> int:
+        if self._mask is not None:
+            return int(np.count_nonzero(self.mask))
+        if self.dtype == object:
+            return sum(v is None for v in self.values)
+        return 0
+
+    def value_range(self) -> tuple:
+        """Return the (min, max) of the non-null values of a typed column as Python scalars."""
+        values = self.values if self._mask is None else self.values[~self.mask]
+        return values.min().item(), values.max().item()
+
+    def python_types(self) -> frozenset:
+        """The set of Python types of the non-null values, as `dsi.utils.type_inference.value_types` returns for a list."""
+        if self.dtype == object:
+            types = set(map(type, self.values))
+            types.discard(_NONE_TYPE)
+            return frozenset(types)
+        if self._len == self.null_count:
+            return frozenset()
+        return frozenset([{"b": bool, "i": int, "f": float}[self.dtype.kind]])
+
+    def _to_list(self, index: slice) -> list:
+        values = self.values[index].tolist()
+        if self._mask is not None:
+            for i in np.flatnonzero(self.mask[index]):
+                values[i] = None
+        return values
+
+    def tolist(self) -> list:
+        """Return the values as a plain list."""
+        return self._to_list(slice(None))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        for start in range(0, self._len, ITER_CHUNK):
+            yield from self._to_list(slice(start, start + ITER_CHUNK))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._to_list(index)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("Column index out of range")
+        if self._mask is not None and self._mask[index]:
+            return None
+        value = self._data[index]
+        return value.item() if self.dtype != object else value
+
+    def __contains__(self, value) -> bool:
+        if value is None:
+            return self.null_count > 0
+        return any(v == value for v in self)
+
+    def _fits(self, value) -> bool:
+        if self.dtype == object or type(value) not in _TYPED or _TYPED[type(value)] != self.dtype:
+            return False
+        return self.dtype.kind != "i" or np.iinfo(np.int64).min <= value <= np.iinfo(np.int64).max
+
+    def _to_object(self) -> None:
+        self._set(np.fromiter(self, object, self._len), None)
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            values = self.tolist()
+            values[index] = value
+            self._set(*_parts(Column(values)))
+            return
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("Column assignment index out of range")
+        if value is None and self.dtype != object:
+            if self._mask is None:
+                self._mask = np.zeros(len(self._data), dtype=bool)
+            self._mask[index] = True
+            return
+        if value is not None and not self._fits(value):
+            self._to_object()
+        self._data[index] = value
+        if self._mask is not None:
+            self._mask[index] = False
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, int) and not -self._len <= index < self._len:
+            raise IndexError("Column assignment index out of range")
+        data = np.delete(self.values, index)
+        mask = None if self._mask is None else np.delete(self.mask, index)
+        self._set(data, mask)
+
+    def insert(self, index: int, value) -> None:
+        values = self.tolist()
+        values.insert(index, value)
+        self._set(*_parts(Column(values)))
+
+    def append(self, value) -> None:
+        self.extend([value])
+
+    def extend(self, values) -> None:
+        other = values if isinstance(values, Column) else Column(values)
+        if len(other) == 0:
+            return
+        dtype = _common_dtype(self, other)
+        if self.dtype != dtype:
+            self._set(*_parts(_cast(self, dtype)))
+        if other.dtype != dtype:
+            other = _cast(other, dtype)
+
+        # grow geometrically so repeated appends are amortized O(1)
+        new_len = self._len + other._len
+        if new_len > len(self._data):
+            capacity = max(new_len, 2 * len(self._data))
+            data = np.empty(capacity, dtype=dtype)
+            data[:self._len] = self.values
+            self._data = data
+            if self._mask is not None:
+                mask = np.zeros(capacity, dtype=bool)
+                mask[:self._len] = self.mask
+                self._mask = mask
+        self._data[self._len:new_len] = other.values
+        if other._mask is not None and self._mask is None:
+            self._mask = np.zeros(len(self._data), dtype=bool)
+        if self._mask is not None:
+            self._mask[self._len:new_len] = False if other._mask is None else other.mask
+        self._len = new_len
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __add__(self, other) -> list:
+        return self.tolist() + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + self.tolist()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Column, list, tuple)):
+            return len(self) == len(other) and self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Column({self.tolist()!r}, dtype={self.dtype})"
+
+    def copy(self) -> "Column":
+        return Column(self)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        data = self.values
+        if self._mask is not None and self.mask.any():
+            # same conversion as numpy/pandas apply to a list with None in it
+            if self.dtype.kind in "if":
+                data = data.astype(np.float64)
+                data[self.mask] = np.nan
+            else:
+                data = np.array(self.tolist(), dtype=object)
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __arrow_array__(self, type=None):
+        import pyarrow as pa
+        if self.dtype == object:
+            return pa.array(self.values, type=type, from_pandas=False)
+        return pa.array(self.values, mask=self.mask, type=type)
+
+    def to_pandas(self) -> pd.Series:
+        """Return the column as a pandas Series, with the same dtype ``pd.Series(column.tolist())`` would have."""
+        return pd.Series(np.asarray(self))
+
+
+def _parts(column: Column) -> tuple:
+    return column.values, column.mask
+
+
+def _common_dtype(a: Column, b: Column) -> np.dtype:
+    """dtype that keeps the Python types of the values of both columns."""
+    if len(a) == 0 or (a.dtype == object and a.null_count == len(a)):
+        return b.dtype
+    if len(b) == 0 or (b.dtype == object and b.null_count == len(b)):
+        return a.dtype
+    return a.dtype if a.dtype == b.dtype else np.dtype(object)
+
+
+def _cast(column: Column, dtype: np.dtype) -> Column:
+    if dtype.kind == "O":
+        return Column.from_array(np.fromiter(column, object, len(column)))
+    # an all-null object column becomes a fully masked typed column
+    return Column.from_array(np.full(len(column), _FILL[dtype.kind], dtype=dtype), mask=np.ones(len(column), dtype=bool))
+
+
+def to_columnar(table: dict) -> OrderedDict:
+    """Convert a table of list columns into a table of `Column` objects. Columns that are already Columns are kept."""
+    return OrderedDict((name, values if isinstance(values, Column) else Column(values)) for name, values in table.items())
+
+
+def from_dataframe(df: pd.DataFrame) -> OrderedDict:
+    """Convert a DataFrame into a table of `Column` objects, sharing the DataFrame's numeric buffers where possible."""
+    return OrderedDict((name, Column.from_series(df.iloc[:, i])) for i, name in enumerate(df.columns))
+
+
+def to_lists(table: dict) -> OrderedDict:
+    """Convert a table of `Column` objects back into a table of plain lists."""
+    return OrderedDict((name, values.tolist() if isinstance(values, Column) else values) for name, values in table.items())
@@ -1,15 +1,114 @@
+import hashlib
 import os
+import queue
 import sqlite3
+import sys
+import threading
+import time
 
-from contextlib import closing
+from contextlib import closing, contextmanager
+from pathlib import Path
 #from pandasql import sqldf
 
-def is_valid_sqlite_with_data(path: str) -> tuple[bool, str]:
+# SQLite consistency checks, from fastest to most thorough
+CHECK_PRAGMAS = {"quick": "quick_check", "full": "integrity_check"}
+CHECK_LEVELS = {"quick": 1, "full": 2}
+
+
+def default_cache_dir(name: str) -> Path:
+    """Return the default on-disk cache folder for a DSI component.
+
+    Args:
+        name: Sub-folder name, e.g. a backend name.
+
+    Returns:
+        ``$XDG_CACHE_HOME/dsi/<name>``, or ``~/.cache/dsi/<name>`` if XDG_CACHE_HOME is not set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "dsi" / name
+
+
+def files_fingerprint(paths: list[str]) -> str:
+    """Return a short hash of the size and modification time of each file in `paths`.
+
+    Args:
+        paths: Files to fingerprint. A missing file is part of the fingerprint too.
+
+    Returns:
+        A hexadecimal digest that changes when any of the files is created, deleted, resized or rewritten.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:-")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+class _ThreadStdout:
+    """Stand-in for ``sys.stdout`` that sends each thread's output to the stream that thread redirected it to,
+    and the output of every other thread to the stream ``sys.stdout`` was when it was installed."""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "target", None) or self.default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+_stdout_lock = threading.Lock()
+_stdout_users = 0
+
+
+@contextmanager
+def redirect_stdout(target):
+    """Thread-safe replacement for ``contextlib.redirect_stdout``: only output printed by the calling thread goes to `target`.
+
+    ``contextlib.redirect_stdout`` swaps the process-wide ``sys.stdout``, so threads that redirect at the same time
+    capture each other's output and can leave ``sys.stdout`` pointing at a closed stream. Here ``sys.stdout`` is
+    replaced by one shared dispatcher while any thread redirects, and restored when the last one is done.
+
+    Args:
+        target: Stream for the calling thread's output, e.g. an ``io.StringIO``.
+    """
+    global _stdout_users
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadStdout):
+            sys.stdout = _ThreadStdout(sys.stdout)
+        proxy = sys.stdout
+        _stdout_users += 1
+    previous = getattr(proxy.local, "target", None)
+    proxy.local.target = target
+    try:
+        yield target
+    finally:
+        proxy.local.target = previous
+        with _stdout_lock:
+            _stdout_users -= 1
+            if _stdout_users == 0 and sys.stdout is proxy:
+                sys.stdout = proxy.default
+
+
+def is_valid_sqlite_with_data(path: str, check: str = "full") -> tuple[bool, str]:
     """
     Checks if the file at `path` is a valid SQLite3 database file and contains at least one user table with data.
 
     Arg:
         path: The file path to check.
+        check: "full" runs PRAGMA integrity_check. "quick" runs PRAGMA quick_check, which skips
+            verifying that indexes match their tables and is much faster on large files.
 
     Returns:
         A tuple (is_valid, message) where:
@@ -32,7 +131,7 @@ def is_valid_sqlite_with_data(path: str) -> tuple[bool, str]:
             cur = conn.cursor()
 
             # Check integrity
-            row = cur.execute("PRAGMA integrity_check;").fetchone()
+            row = cur.execute(f"PRAGMA {CHECK_PRAGMAS[check]};").fetchone()
             if not row or row[0].lower() != "ok":
                 return False, "SQLite integrity check failed"
 
@@ -124,17 +223,18 @@ def is_valid_duckdb_with_data(path: str) -> tuple[bool, str]:
     
 
 
-def detect_valid_db_with_data(path: str) -> tuple[str | None, bool, str]:
+def detect_valid_db_with_data(path: str, check: str = "full") -> tuple[str | None, bool]:
     """
     Detects whether the file at `path` is a valid SQLite or DuckDB database file containing at least one user table with data.
 
     Args:
         path: The file path to check.
+        check: "full" or "quick" consistency check for SQLite files. See `is_valid_sqlite_with_data`.
         
     Returns:
-        A tuple (db_type, is_valid, message) where:
+        A tuple (db_type, is_valid) where db_type is "sqlite", "duckdb" or None.
     """
-    ok, msg = is_valid_sqlite_with_data(path)
+    ok, msg = is_valid_sqlite_with_data(path, check)
     if ok:
         return "sqlite", True
 
@@ -144,3 +244,145 @@ def detect_valid_db_with_data(path: str) -> tuple[str | None, bool, str]:
 
     return None, False
 
+
+class ValidationCatalog:
+    """Persistent catalog of `detect_valid_db_with_data` results, so unchanged databases are not validated again.
+
+    Each result is stored in a small SQLite file together with the database's fingerprint: its resolved path, size,
+    modification time and a hash of its first 4 KiB, which holds the SQLite header and its change counter.
+    A database whose fingerprint still matches is not opened at all.
+
+    Args:
+        path: SQLite file that holds the catalog. Defaults to ``default_cache_dir("validation") / "catalog.db"``.
+        check: Consistency check for new or changed SQLite files, "quick" (PRAGMA quick_check) or "full" (PRAGMA integrity_check).
+            A stored result is reused if it was made with the same or a more thorough check.
+        background: If True, new or changed files only get a quick_check before they are returned, and a full
+            integrity_check runs in a background thread. Its result is stored for the next lookup; call `wait()` to block until it is done.
+        max_age: Seconds after which a stored result is checked again even though the file is unchanged.
+            The recheck runs in the background if `background` is True. None keeps results until the file changes.
+    """
+
+    def __init__(self, path: str | Path | None = None, check: str = "full", background: bool = False, max_age: float | None = None):
+        if check not in CHECK_LEVELS:
+            raise ValueError(f"check must be one of {list(CHECK_LEVELS)}")
+        self.path = Path(path) if path is not None else default_cache_dir("validation") / "catalog.db"
+        self.check = check
+        self.background = background
+        self.max_age = max_age
+        self.stats = {"hits": 0, "checks": 0, "background_checks": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS validation (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, header_hash TEXT,
+                db_type TEXT, valid INTEGER, level TEXT, checked_at REAL)
+        """)
+        self._conn.commit()
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._worker = None
+
+    def _fingerprint(self, path: str) -> tuple[int, int, str]:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            header = f.read(4096)
+        return st.st_size, st.st_mtime_ns, hashlib.sha256(header).hexdigest()
+
+    def _lookup(self, path: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT size, mtime_ns, header_hash, db_type, valid, level, checked_at FROM validation WHERE path = ?", (path,)
+            ).fetchone()
+
+    def _store(self, path: str, fingerprint: tuple, db_type: str | None, valid: bool, level: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO validation VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (path, *fingerprint, db_type, int(valid), level, time.time()))
+            self._conn.commit()
+
+    def _run_check(self, path: str, fingerprint: tuple, level: str) -> tuple[str | None, bool]:
+        db_type, valid = detect_valid_db_with_data(path, check=level)
+        # only SQLite has check levels; any other result is final
+        self._store(path, fingerprint, db_type, valid, level if db_type == "sqlite" and valid else "full")
+        return db_type, valid
+
+    def validate(self, path: str | Path) -> tuple[str | None, bool]:
+        """Return the `detect_valid_db_with_data` result for a database, from the catalog if the file is unchanged.
+
+        Args:
+            path: Path to the database file.
+
+        Returns:
+            A tuple (db_type, is_valid) where db_type is "sqlite", "duckdb" or None.
+        """
+        path = str(Path(path).resolve())
+        try:
+            fingerprint = self._fingerprint(path)
+        except OSError:
+            return None, False
+
+        level = "quick" if self.background else self.check
+        row = self._lookup(path)
+        if row is not None and tuple(row[:3]) == fingerprint and CHECK_LEVELS[row[5]] >= CHECK_LEVELS[level]:
+            db_type, valid, stored_level, checked_at = row[3], bool(row[4]), row[5], row[6]
+            expired = self.max_age is not None and time.time() - checked_at > self.max_age
+            if not expired or self.background:
+                self.stats["hits"] += 1
+                if self.background and valid and (expired or stored_level != "full"):
+                    self._schedule(path)
+                return db_type, valid
+
+        self.stats["checks"] += 1
+        db_type, valid = self._run_check(path, fingerprint, level)
+        if self.background and valid and db_type == "sqlite":
+            self._schedule(path)
+        return db_type, valid
+
+    def _schedule(self, path: str) -> None:
+        # queue under the lock so an idle worker cannot exit between the check and the put
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            self._queue.put(path)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._background_loop, name="dsi-validation", daemon=True)
+                self._worker.start()
+
+    def _background_loop(self) -> None:
+        while True:
+            try:
+                path = self._queue.get(timeout=1)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            try:
+                self.stats["background_checks"] += 1
+                self._run_check(path, self._fingerprint(path), "full")
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+                self._queue.task_done()
+
+    def wait(self) -> None:
+        """Block until every background revalidation has finished."""
+        self._queue.join()
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        with self._lock:
+            self._conn.execute("DELETE FROM validation")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Wait for background revalidation and close the catalog."""
+        self.wait()
+        self._conn.close()
@@ -9,6 +9,7 @@ from pathlib import Path, PurePosixPath
 from urllib.parse import urlparse
 
 from dsi.dsi import DSI
+from dsi.utils.hash_utils import DEFAULT_BUFFER_SIZE, hash_file
 
 
 def parse_timestamp(ts: str) -> datetime:
@@ -153,13 +154,7 @@ def local_md5(local_path: str, timeout: int | None = None) -> str:
     Returns:
         str: The computed MD5 checksum as a hexadecimal string.
     """
-    h = hashlib.md5()
-
-    with open(local_path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-
-    return h.hexdigest()
+    return hash_file(local_path, "md5")
 
 
 def should_download(remote:str, remote_path:str, stored_md5:str) -> bool:
@@ -189,23 +184,18 @@ def should_download(remote:str, remote_path:str, stored_md5:str) -> bool:
 
 
 
-def compute_md5(file_path:str, chunk_size:int = 8192) -> str:
-    """Computes the MD5 checksum of a file.
+def compute_md5(file_path:str, chunk_size:int = DEFAULT_BUFFER_SIZE) -> str:
+    """Computes the MD5 checksum of a file. The file is streamed through one reused buffer, and the checksum is cached
+    until the file's inode, size or modification time change.
     
     Args:
         file_path (str): The path to the file to compute the checksum for.
-        chunk_size (int): The size of the chunks to read from the file. Default is 8192 bytes.
+        chunk_size (int): The size of the chunks to read from the file. Default is 4 MiB.
 
     Returns:
         str: The computed MD5 checksum as a hexadecimal string.
     """
-    md5 = hashlib.md5()
-    
-    with open(file_path, "rb") as f:
-        while chunk := f.read(chunk_size):
-            md5.update(chunk)
-    
-    return md5.hexdigest()
+    return hash_file(file_path, "md5", buffer_size=chunk_size)
 
 
 
@@ -0,0 +1,135 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dsi.utils.keyed_cache import KeyedCache
+
+
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class HashCache(KeyedCache):
+    """Cache of file digests keyed by (inode, size, mtime).
+
+    A digest is reused as long as the file's inode, size and modification time are unchanged,
+    so a file that has already been hashed is not read again. Digests are kept in memory for the
+    lifetime of the cache, and in a SQLite file for later processes if `path` is given, e.g.
+    ``HashCache(default_cache_dir("hashes") / "digests.db")``.
+
+    Args:
+        path: SQLite file that holds the cache, or None to only cache digests in memory.
+            If the file cannot be created, digests are only cached in memory.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        super().__init__(path, "digests", ("path", "algorithm"), ("inode", "size", "mtime_ns"), "digest")
+
+    @staticmethod
+    def _key(st: os.stat_result) -> tuple[int, int, int]:
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def get(self, path: str, algorithm: str, st: os.stat_result) -> str | None:
+        """Return the cached digest of `path`, or None if it is missing or the file changed since it was stored."""
+        return self.lookup((path, algorithm), self._key(st))
+
+    def put(self, path: str, algorithm: str, st: os.stat_result, digest: str) -> None:
+        """Store the digest of `path` together with the stat result it was computed for."""
+        self.put_many([(path, algorithm, st, digest)])
+
+    def put_many(self, entries: list[tuple[str, str, os.stat_result, str]]) -> None:
+        """Store several (path, algorithm, stat result, digest) entries in one transaction."""
+        self.store_many([((path, algorithm), self._key(st), digest) for path, algorithm, st, digest in entries])
+
+
+def default_hash_cache() -> HashCache:
+    """Return the process-wide in-memory `HashCache`, creating it on first use."""
+    return HashCache.default()
+
+
+def _resolve_cache(cache: HashCache | bool | None) -> HashCache | None:
+    return HashCache.resolve(cache)
+
+
+def stream_hash(path: str | Path, algorithm: str = "sha1", buffer_size: int = DEFAULT_BUFFER_SIZE) -> str:
+    """Hash a file by reading it into one reused buffer, so memory use does not grow with the file size.
+
+    Args:
+        path: File to hash.
+        algorithm: Any algorithm accepted by ``hashlib.new``.
+        buffer_size: Bytes read per call.
+
+    Returns:
+        The hexadecimal digest.
+    """
+    h = hashlib.new(algorithm)
+    with open(path, "rb", buffering=0) as f:
+        # small files do not need a full-size buffer
+        buffer = bytearray(max(1, min(buffer_size, os.fstat(f.fileno()).st_size)))
+        view = memoryview(buffer)
+        while n := f.readinto(buffer):
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def hash_file(path: str | Path, algorithm: str = "sha1", buffer_size: int = DEFAULT_BUFFER_SIZE,
+              cache: HashCache | bool | None = True) -> str:
+    """Return the digest of a file, from the cache if its inode, size and modification time are unchanged.
+
+    Args:
+        path: File to hash.
+        algorithm: Any algorithm accepted by ``hashlib.new``.
+        buffer_size: Bytes read per call.
+        cache: A `HashCache`, True for the process-wide in-memory cache, or None/False to always read the file.
+
+    Returns:
+        The hexadecimal digest.
+    """
+    cache = _resolve_cache(cache)
+    digest, entry = _lookup_or_hash(path, algorithm, buffer_size, cache)
+    if entry is not None:
+        cache.put(*entry)
+    return digest
+
+
+def _lookup_or_hash(path, algorithm, buffer_size, cache):
+    """Return (digest, cache entry to store or None)."""
+    if cache is None:
+        return stream_hash(path, algorithm, buffer_size), None
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    digest = cache.get(path, algorithm, st)
+    if digest is not None:
+        return digest, None
+    digest = stream_hash(path, algorithm, buffer_size)
+    # only cache the digest if the file did not change while it was read
+    if HashCache._key(os.stat(path)) != HashCache._key(st):
+        return digest, None
+    return digest, (path, algorithm, st, digest)
+
+
+def hash_files(paths: list[str | Path], algorithm: str = "sha1", max_workers: int = DEFAULT_WORKERS,
+               buffer_size: int = DEFAULT_BUFFER_SIZE, cache: HashCache | bool | None = True) -> list[str]:
+    """Hash several files in parallel. hashlib releases the GIL while hashing large buffers, so threads scale with the disks and cores.
+
+    Args:
+        paths: Files to hash.
+        algorithm: Any algorithm accepted by ``hashlib.new``.
+        max_workers: Maximum number of files hashed at the same time.
+        buffer_size: Bytes read per call, for each worker.
+        cache: A `HashCache`, True for the process-wide in-memory cache, or None/False to always read the files.
+
+    Returns:
+        The hexadecimal digests, in the order of `paths`.
+    """
+    paths = list(paths)
+    cache = _resolve_cache(cache)
+    if len(paths) <= 1 or max_workers <= 1:
+        results = [_lookup_or_hash(path, algorithm, buffer_size, cache) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            results = list(executor.map(lambda path: _lookup_or_hash(path, algorithm, buffer_size, cache), paths))
+    if cache is not None:
+        cache.put_many([entry for _, entry in results if entry is not None])
+    return [digest for digest, _ in results]
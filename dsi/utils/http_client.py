@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from dsi.utils.dsi_utils import default_cache_dir  # noqa: F401  (re-exported for the web backends)
+
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# urllib3 < 2 has no separate error for DNS failures
+NAME_RESOLUTION_ERRORS = getattr(urllib3.exceptions, "NameResolutionError", ())
+
+
+def _unresolved_host(error: Exception) -> bool:
+    """Return True if a connection error was caused by a host name that cannot be resolved, which retrying will not fix."""
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NAME_RESOLUTION_ERRORS)
+
+
+class HttpClient:
+    """JSON-over-HTTP client shared by the web backends.
+
+    Keeps one pooled ``requests.Session`` so connections are reused, retries failed
+    requests with exponential backoff, fetches several requests concurrently and
+    caches JSON responses on disk. A cached response younger than ``cache_ttl``
+    seconds is returned without contacting the server; an older one is revalidated
+    with its ETag/Last-Modified headers, so an unchanged response costs a 304 and no body.
+
+    Args:
+        headers: Headers sent with every request.
+        verify: Toggle SSL certificate verification.
+        timeout: Timeout in seconds for each request attempt.
+        retries: Number of retries after the first attempt for connection errors,
+            timeouts and 429/5xx responses. Hosts that cannot be resolved are not retried.
+        backoff: Seconds to wait before the first retry, doubled for each later one.
+            A ``Retry-After`` header from the server takes precedence.
+        pool_size: Maximum number of pooled connections per host, and threads used by ``get_json_many``.
+        cache_dir: Folder for the response cache. None disables caching. Cached responses are readable by the owner only.
+        cache_ttl: Seconds a cached response is used without revalidation.
+        rate_limit: Maximum requests per second across all threads, including retries. None for no limit.
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        verify: bool = True,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 8,
+        cache_dir: str | Path | None = None,
+        cache_ttl: float = 600.0,
+        rate_limit: float | None = None,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.cache_ttl = cache_ttl
+        self.stats = {"requests": 0, "retries": 0, "cache_hits": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+        self.rate_limit = rate_limit
+        self._next_request = 0.0
+        self._rate_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.verify = verify
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _throttle(self) -> None:
+        """Wait until the next request is allowed by ``rate_limit``, spacing requests evenly."""
+        if not self.rate_limit:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + 1.0 / self.rate_limit
+        if wait > 0:
+            time.sleep(wait)
+
+    def request(self, method: str, url: str, retries: int | None = None, timeout: float | None = None, **kwargs) -> requests.Response:
+        """Send a request on the pooled session, retrying connection errors, timeouts and 429/5xx responses.
+
+        Args:
+            method: HTTP method, e.g. "GET" or "HEAD".
+            url: Request URL.
+            retries: Overrides the client's number of retries.
+            timeout: Overrides the client's timeout.
+            **kwargs: Passed to ``requests.Session.request``.
+
+        Returns:
+            The last response. Its status is not checked.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt failed to connect or timed out.
+        """
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(retries + 1):
+            self._throttle()
+            self._count("requests")
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == retries or _unresolved_host(e):
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == retries:
+                    return response
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                response.close()
+            self._count("retries")
+            time.sleep(delay)
+
+    def _cache_path(self, url: str, params: dict | None) -> Path:
+        key = json.dumps([url, sorted((params or {}).items()), sorted(self.session.headers.items())], default=str)
+        return self.cache_dir / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get_json(self, url: str, params: dict | None = None, use_cache: bool = True, **kwargs):
+        """GET a URL and return its decoded JSON body, using the response cache if enabled.
+
+        Args:
+            url: Request URL.
+            params: Query parameters.
+            use_cache: If False, skip the response cache for this request.
+            **kwargs: Passed to ``request``, e.g. ``retries`` or ``timeout``.
+
+        Returns:
+            The decoded JSON body.
+
+        Raises:
+            requests.exceptions.HTTPError: If the final response has an error status.
+            ValueError: If the body is not valid JSON.
+        """
+        cache_path = None
+        cached = None
+        if use_cache and self.cache_dir is not None:
+            cache_path = self._cache_path(url, params)
+            try:
+                with open(cache_path) as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = None
+            if cached is not None and time.time() - cached["time"] < self.cache_ttl:
+                self._count("cache_hits")
+                return cached["body"]
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = self.request("GET", url, params=params, headers=headers, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            self._count("not_modified")
+            body = cached["body"]
+        else:
+            response.raise_for_status()
+            body = response.json()
+        if cache_path is not None:
+            entry = {"url": url, "time": time.time(), "body": body,
+                     "etag": response.headers.get("ETag") or (cached or {}).get("etag"),
+                     "last_modified": response.headers.get("Last-Modified") or (cached or {}).get("last_modified")}
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            # responses may belong to an authenticated session, so only the owner can read them
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, cache_path)
+        return body
+
+    def get_json_many(self, url: str, params_list: list[dict], **kwargs) -> list:
+        """GET one URL with several sets of query parameters concurrently.
+
+        Args:
+            url: Request URL.
+            params_list: Query parameters of each request.
+            **kwargs: Passed to ``get_json``.
+
+        Returns:
+            The decoded JSON bodies, in the order of ``params_list``.
+        """
+        if len(params_list) <= 1:
+            return [self.get_json(url, params, **kwargs) for params in params_list]
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(params_list))) as executor:
+            return list(executor.map(lambda params: self.get_json(url, params, **kwargs), params_list))
+
+    def clear_cache(self) -> None:
+        """Delete every cached response in ``cache_dir``."""
+        if self.cache_dir is not None and self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
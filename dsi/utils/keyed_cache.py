@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class KeyedCache:
+    """Cache of values keyed by a tuple of strings, each stored with the stamp of the source it was computed from.
+
+    A value is only returned while the caller's current stamp of the source, e.g. a file's size and
+    modification time, equals the stamp it was stored with. Entries are kept in memory and, if a `path` is
+    given, persisted in one table of a SQLite file. Subclasses define the table and adapt `lookup()` and `store_many()`
+    to their keys and values.
+
+    Args:
+        path: SQLite file that holds the cache, or None to only cache entries in memory. If the file cannot be
+            created, entries are also only cached in memory.
+        table: Name of the table in the SQLite file.
+        key_columns: Column names of the key.
+        stamp_columns: Column names of the stamp.
+        value_column: Column name of the value.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path: str | Path | None, table: str, key_columns: tuple[str, ...], stamp_columns: tuple[str, ...],
+                 value_column: str):
+        self.path = Path(path) if path is not None else None
+        self._key_size = len(key_columns)
+        self._lock = threading.Lock()
+        self._memory = {}   # key -> (*stamp, value)
+        columns = (*key_columns, *stamp_columns, value_column)
+        self._select = f"SELECT {', '.join(columns[self._key_size:])} FROM {table} WHERE " + \
+                       " AND ".join(f"{column} = ?" for column in key_columns)
+        self._insert = f"INSERT OR REPLACE INTO {table} VALUES ({', '.join('?' * len(columns))})"
+        self._delete = f"DELETE FROM {table}"
+        self._conn = None
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)}, PRIMARY KEY ({', '.join(key_columns)}))")
+            self._conn.commit()
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def lookup(self, key: tuple, stamp: tuple):
+        """Return the value stored for `key`, or None if there is none or it was stored with a different stamp."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                entry = self._conn.execute(self._select, key).fetchone()
+                if entry is not None:
+                    self._memory[key] = entry
+        if entry is None or tuple(entry[:-1]) != tuple(stamp):
+            return None
+        return entry[-1]
+
+    def store_many(self, entries: list[tuple[tuple, tuple, object]]) -> None:
+        """Store several (key, stamp, value) entries in one transaction."""
+        rows = [(*key, *stamp, value) for key, stamp, value in entries]
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._memory[row[:self._key_size]] = row[self._key_size:]
+            if self._conn is not None:
+                self._conn.executemany(self._insert, rows)
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute(self._delete)
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the cache file, if any. Entries stay cached in memory."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @classmethod
+    def default(cls):
+        """Return the process-wide instance of this cache class at its default path, creating it on first use."""
+        with KeyedCache._default_lock:
+            if cls.__dict__.get("_default") is None:
+                cls._default = cls()
+            return cls._default
+
+    @classmethod
+    def resolve(cls, cache):
+        """Return `cache` itself, the `default()` cache for True, or None for None/False."""
+        if cache is True:
+            return cls.default()
+        return cache or None
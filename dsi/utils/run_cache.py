@@ -0,0 +1,45 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from dsi.utils.dsi_utils import default_cache_dir
+from dsi.utils.keyed_cache import KeyedCache
+
+
+class RunCache(KeyedCache):
+    """Persistent cache of the data a reader parsed from a run directory, reused while the directory is unchanged.
+
+    An entry is keyed by the reader (`kind`) and the directory, and is only returned while the `folder_fingerprint()`
+    of the directory matches the one it was stored with, so a run whose files were added, removed or rewritten is parsed again.
+
+    Args:
+        path: SQLite file that holds the cache. Defaults to ``default_cache_dir("runs") / "runs.db"``.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        super().__init__(path if path is not None else default_cache_dir("runs") / "runs.db", "runs",
+                         ("kind", "folder"), ("fingerprint",), "value")
+
+    def get(self, kind: str, folder: str, fingerprint: str):
+        """Return the value stored for `folder`, or None if there is none or the folder changed since it was stored."""
+        value = self.lookup((kind, folder), (fingerprint,))
+        return None if value is None else json.loads(value)
+
+    def put_many(self, entries: list[tuple[str, str, str, object]]) -> None:
+        """Store several (kind, folder, fingerprint, value) entries in one transaction. Values must be JSON-serializable."""
+        self.store_many([((kind, folder), (fingerprint,), json.dumps(value)) for kind, folder, fingerprint, value in entries])
+
+
+def folder_fingerprint(folder: str | Path) -> str:
+    """Fingerprint of the name, size and modification time of every file directly inside `folder`.
+
+    Args:
+        folder: Directory to fingerprint. Sub-directories are not descended into.
+
+    Returns:
+        A hexadecimal digest that changes when a file in the folder is added, removed, resized or rewritten.
+    """
+    entries = sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                     for entry in os.scandir(folder) if entry.is_file())
+    return hashlib.sha1(repr(entries).encode()).hexdigest()
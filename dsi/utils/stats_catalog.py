@@ -0,0 +1,155 @@
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from dsi.utils.dsi_utils import files_fingerprint
+
+
+# statistics stored per column, in this order
+STAT_FIELDS = ["column", "type", "unique", "min", "max", "avg", "std_dev", "count", "null_count"]
+
+# a quoted or bare SQL identifier
+_IDENTIFIER = r'"(?:[^"]|"")+"|`[^`]+`|\[[^\]]+\]|[^\s."`\[\](),;]+'
+_UPDATE_TARGET = re.compile(rf'\s*UPDATE\s+(?:OR\s+\w+\s+)?((?:(?:{_IDENTIFIER})\s*\.\s*)?(?:{_IDENTIFIER}))', re.IGNORECASE)
+
+
+def unquote_identifier(name: str) -> str:
+    """Return an SQL identifier without its double quotes, backticks or brackets."""
+    if len(name) > 1 and (name[0], name[-1]) in (('"', '"'), ('`', '`'), ('[', ']')):
+        return name[1:-1].replace('""', '"') if name[0] == '"' else name[1:-1]
+    return name
+
+
+def table_key(name: str) -> str:
+    """Catalog key of a table: the unquoted name, lower-cased because table names are case-insensitive in SQLite and DuckDB."""
+    return unquote_identifier(name).lower()
+
+
+def updated_table(query: str) -> str | None:
+    """Table an UPDATE statement writes to.
+
+    Args:
+        query: SQL statement.
+
+    Returns:
+        The unquoted table name without its schema prefix, as written in the query,
+        or None if `query` is not an UPDATE whose target could be read.
+    """
+    match = _UPDATE_TARGET.match(query)
+    if match is None:
+        return None
+    return unquote_identifier(re.findall(_IDENTIFIER, match.group(1))[-1])
+
+
+class StatsCatalog:
+    """Persistent per-column summary statistics of the tables of one database.
+
+    Each table has a change counter. Backends increment it with `bump()` whenever DSI writes to the table,
+    and statistics are only returned by `get()` if they were stored for the current counter value, so only
+    tables that changed since the last `summary()` are scanned again.
+
+    Writes made outside DSI do not increment any counter. They are detected by comparing the size and
+    modification time of the database files against the values recorded after DSI's own last write;
+    on a mismatch every table is treated as changed.
+
+    The catalog is a separate SQLite file, so the database itself is never modified by it.
+
+    Args:
+        path: SQLite file of the catalog, or ":memory:" to keep it for the lifetime of this object only.
+        db_files: Files of the database the statistics describe, e.g. the database and its write-ahead log.
+    """
+
+    def __init__(self, path: str | Path, db_files: list[str] = ()):
+        self.path = str(path)
+        self.db_files = [str(f) for f in db_files]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        # columns without a declared type keep the int, float or str type of each value
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tables (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL, stats_version INTEGER);
+            CREATE TABLE IF NOT EXISTS columns (table_name, position, column_name, type, unique_count, min, max, avg, std_dev,
+                                                count, null_count, PRIMARY KEY (table_name, position));
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def fingerprint(self) -> str:
+        """Size and modification time of the database files, as a short hash."""
+        return files_fingerprint(self.db_files)
+
+    def _record_fingerprint(self) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint(),))
+
+    def _check_external_changes(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint():
+            self._conn.execute("UPDATE tables SET version = version + 1")
+            self._record_fingerprint()
+            self._conn.commit()
+
+    def bump(self, tables: list[str] | None = None) -> None:
+        """Increment the change counter of `tables`, or of every table if None. Call after the write is committed.
+
+        Args:
+            tables: Names of the tables that DSI changed, created or dropped, in any letter case and quoted or not.
+        """
+        with self._lock:
+            if tables is None:
+                self._conn.execute("UPDATE tables SET version = version + 1")
+            else:
+                self._conn.executemany("""INSERT INTO tables (table_name, version) VALUES (?, 1)
+                                          ON CONFLICT (table_name) DO UPDATE SET version = version + 1""",
+                                       [(t,) for t in set(map(table_key, tables))])
+            self._record_fingerprint()
+            self._conn.commit()
+
+    def get(self, table: str) -> list[list] | None:
+        """Return the stored statistics of `table`, one list per column ordered as `STAT_FIELDS`, or None if it changed since they were stored."""
+        table = table_key(table)
+        with self._lock:
+            self._check_external_changes()
+            fresh = self._conn.execute("SELECT 1 FROM tables WHERE table_name = ? AND version = stats_version", (table,)).fetchone()
+            if fresh is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            rows = self._conn.execute("""SELECT column_name, type, unique_count, min, max, avg, std_dev, count, null_count
+                                         FROM columns WHERE table_name = ? ORDER BY position""", (table,)).fetchall()
+        return [list(row) for row in rows]
+
+    def put(self, table: str, rows: list[list]) -> bool:
+        """Store the statistics of `table` for its current change counter.
+
+        Args:
+            table: Table name.
+            rows: One list per column ordered as `STAT_FIELDS`.
+
+        Returns:
+            False if a value cannot be stored in SQLite (e.g. a Decimal or an integer beyond 64 bits), in which case nothing is stored.
+        """
+        table = table_key(table)
+        with self._lock:
+            try:
+                self._conn.execute("INSERT OR IGNORE INTO tables (table_name, version) VALUES (?, 1)", (table,))
+                self._conn.execute("DELETE FROM columns WHERE table_name = ?", (table,))
+                self._conn.executemany("INSERT INTO columns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                       [(table, i, *row) for i, row in enumerate(rows)])
+                self._conn.execute("UPDATE tables SET stats_version = version WHERE table_name = ?", (table,))
+                self._conn.commit()
+            except (sqlite3.Error, OverflowError):
+                self._conn.rollback()
+                return False
+        return True
+
+    def clear(self) -> None:
+        """Delete all stored statistics and change counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM columns")
+            self._conn.execute("DELETE FROM tables")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
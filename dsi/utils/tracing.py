@@ -0,0 +1,331 @@
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from inspect import signature
+from pathlib import Path
+
+
+class Span:
+    """One timed stage of a DSI operation.
+
+    Spans nest: a span opened while another one is open on the same thread becomes its child, and its
+    `path` is the parent's path followed by its own name. Wall time is measured with ``time.perf_counter()``
+    and CPU time with ``time.process_time()``, so CPU time includes worker threads started by the stage.
+
+    Args:
+        name: Stage name, e.g. "ingest" or "sqlite.insert".
+        parent: The enclosing span, or None for a root span.
+        attrs: Initial attributes such as the backend name or a row count.
+    """
+
+    __slots__ = ("name", "path", "span_id", "parent_id", "depth", "thread", "attrs", "start", "wall", "cpu",
+                 "error", "_wall0", "_cpu0")
+
+    recording = True
+
+    def __init__(self, name: str, span_id: int, parent: "Span | None" = None, **attrs):
+        self.name = name
+        self.path = name if parent is None else f"{parent.path}/{name}"
+        self.span_id = span_id
+        self.parent_id = None if parent is None else parent.span_id
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.thread = threading.current_thread().name
+        self.attrs = attrs
+        self.start = time.time()
+        self.wall = None
+        self.cpu = None
+        self.error = None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def set(self, **attrs) -> None:
+        """Set attributes of the span, e.g. ``span.set(rows=1000, bytes=8000)``."""
+        self.attrs.update(attrs)
+
+    def add(self, **counts) -> None:
+        """Add to numeric attributes of the span, starting from 0, e.g. ``span.add(rows=len(chunk))``."""
+        for key, value in counts.items():
+            self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def finish(self) -> None:
+        self.wall = time.perf_counter() - self._wall0
+        self.cpu = time.process_time() - self._cpu0
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serializable dictionary."""
+        return {"name": self.name, "path": self.path, "span_id": self.span_id, "parent_id": self.parent_id,
+                "depth": self.depth, "thread": self.thread, "start": self.start, "wall": self.wall, "cpu": self.cpu,
+                "error": self.error, "attrs": self.attrs}
+
+
+class _NullSpan:
+    """Stand-in yielded by `span()` while tracing is off, so instrumented code can call set() and add() unconditionally.
+
+    Check `recording` before computing an attribute that is expensive to measure.
+    """
+
+    recording = False
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def add(self, **counts) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+_NULL_CONTEXT = nullcontext(NULL_SPAN)
+
+
+class MemoryCollector:
+    """Exporter that keeps finished spans in memory, as dictionaries from `Span.to_dict()`.
+
+    Spans are stored in the order they finish, so children come before their parent.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span.to_dict())
+
+    def close(self) -> None:
+        pass
+
+    def breakdown(self) -> list[dict]:
+        """Aggregate the spans by path.
+
+        Returns:
+            One dictionary per distinct span path with its name, depth, number of spans, total wall and CPU
+            seconds, and summed ``rows`` and ``bytes`` attributes (None if no span recorded them), ordered
+            so every path follows its parent in the order the stages started.
+        """
+        stages = {}
+        for span in sorted(self.spans, key=lambda s: (s["start"], s["depth"])):
+            stage = stages.setdefault(span["path"], {"path": span["path"], "name": span["name"], "depth": span["depth"],
+                                                     "count": 0, "wall": 0.0, "cpu": 0.0, "rows": None, "bytes": None})
+            stage["count"] += 1
+            stage["wall"] += span["wall"]
+            stage["cpu"] += span["cpu"]
+            for key in ("rows", "bytes"):
+                if isinstance(span["attrs"].get(key), (int, float)):
+                    stage[key] = (stage[key] or 0) + span["attrs"][key]
+
+        # depth-first order: children listed under their parent even if a later parent started before them
+        children = {}
+        for path in stages:
+            children.setdefault(path.rpartition("/")[0], []).append(path)
+        ordered = []
+        pending = list(reversed(children.get("", [])))
+        while pending:
+            path = pending.pop()
+            ordered.append(stages[path])
+            pending.extend(reversed(children.get(path, [])))
+        return ordered
+
+    def report(self) -> str:
+        """Return the `breakdown()` as a text table, with each stage's share of the total wall time of the root spans."""
+        stages = self.breakdown()
+        total = sum(s["wall"] for s in stages if s["depth"] == 0) or 1e-12
+        lines = [f"{'stage':<40} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'% wall':>7} {'rows':>12} {'bytes':>14}",
+                 "-" * 103]
+        for s in stages:
+            name = "  " * s["depth"] + s["name"]
+            rows = "" if s["rows"] is None else f"{s['rows']:,}"
+            size = "" if s["bytes"] is None else f"{s['bytes']:,}"
+            lines.append(f"{name:<40.40} {s['count']:>6} {s['wall']:>9.4f} {s['cpu']:>9.4f} "
+                         f"{100 * s['wall'] / total:>6.1f}% {rows:>12} {size:>14}")
+        return "\n".join(lines)
+
+
+class JsonLinesExporter:
+    """Exporter that appends each finished span to a JSON-lines file, one `Span.to_dict()` object per line.
+
+    Args:
+        path: File to append to. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class Tracer:
+    """Creates nested spans and hands each finished span to its exporters.
+
+    Args:
+        exporters: Objects with ``export(span)`` and ``close()`` methods, such as `MemoryCollector` and `JsonLinesExporter`.
+    """
+
+    def __init__(self, exporters=()):
+        self.exporters = list(exporters)
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Span | None:
+        """Return the innermost open span of the calling thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Open a span for the duration of the ``with`` block and yield it. An exception escaping the block is recorded in ``error``."""
+        stack = self._stack()
+        span = Span(name, next(self._ids), stack[-1] if stack else None, **attrs)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.finish()
+            stack.pop()
+            for exporter in self.exporters:
+                exporter.export(span)
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+
+_tracer = None
+
+
+def enable(*exporters) -> Tracer:
+    """Turn tracing on for the whole process.
+
+    Args:
+        *exporters: Exporters for the finished spans. Strings and paths are opened as `JsonLinesExporter` files.
+            With no exporters, a single `MemoryCollector` is used.
+
+    Returns:
+        The active `Tracer`.
+    """
+    global _tracer
+    exporters = [JsonLinesExporter(e) if isinstance(e, (str, os.PathLike)) else e for e in exporters] or [MemoryCollector()]
+    _tracer = Tracer(exporters)
+    return _tracer
+
+
+def disable() -> None:
+    """Turn tracing off and close the exporters of the active tracer."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+
+
+def active_tracer() -> Tracer | None:
+    """Return the active `Tracer`, or None if tracing is off."""
+    return _tracer
+
+
+@contextmanager
+def tracing(*exporters):
+    """Trace everything inside the ``with`` block and restore the previous tracer afterwards.
+
+    Args:
+        *exporters: Passed to `enable()`.
+
+    Yields:
+        The `Tracer` of the block. Its exporters are closed when the block exits.
+    """
+    global _tracer
+    previous = _tracer
+    tracer = enable(*exporters)
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
+        tracer.close()
+
+
+def span(name: str, **attrs):
+    """Context manager that records a span with the active tracer.
+
+    While tracing is off this returns a shared no-op context whose span ignores set() and add(),
+    so instrumented code costs one global lookup.
+
+    Args:
+        name: Stage name. Nested spans are reported under their parent's path.
+        **attrs: Initial span attributes; ``rows`` and ``bytes`` are summed in reports.
+    """
+    if _tracer is None:
+        return _NULL_CONTEXT
+    return _tracer.span(name, **attrs)
+
+
+def traced(name: str, *arg_names: str):
+    """Decorator that runs every call of the function inside a span.
+
+    Args:
+        name: Span name.
+        *arg_names: Parameters of the function whose values are recorded as span attributes.
+    """
+    def decorator(func):
+        sig = signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            bound = sig.bind_partial(*args, **kwargs)
+            attrs = {arg: bound.arguments[arg] for arg in arg_names if arg in bound.arguments}
+            with _tracer.span(name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def collection_rows(collection: dict) -> int:
+    """Number of rows in a DSI collection: the longest column of each table, summed over tables.
+
+    Args:
+        collection: Table names mapped to tables of columns. `dsi_relations` and `dsi_units` are not counted.
+    """
+    rows = 0
+    for table_name, table in collection.items():
+        if table_name in ("dsi_relations", "dsi_units") or not isinstance(table, dict):
+            continue
+        rows += max((len(col) for col in table.values() if hasattr(col, "__len__")), default=0)
+    return rows
+
+
+def frame_bytes(df) -> int:
+    """Shallow memory footprint of a DataFrame's columns in bytes, without measuring each Python object."""
+    return int(df.memory_usage(index=False).sum())
+
+
+def file_bytes(paths) -> int | None:
+    """Total size of the existing files in `paths` (a path or a list of paths), or None if there are none."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if not isinstance(paths, (list, tuple)):
+        return None
+    sizes = [os.path.getsize(p) for p in paths if isinstance(p, (str, os.PathLike)) and os.path.isfile(p)]
+    return sum(sizes) if sizes else None
@@ -0,0 +1,44 @@
+import math
+
+from dsi.utils.columnar import Column
+
+
+def sample_size_for_confidence(confidence: float, tolerance: float = 0.001) -> int:
+    """
+    Returns how many values must be sampled from a column so that, with probability `confidence`,
+    the sample contains at least one value of every Python type that makes up more than `tolerance` of the column.
+
+    Arg:
+        confidence: Probability between 0 and 1 (exclusive) that the sampled types describe the whole column.
+        tolerance: Largest fraction of a column a type may occupy and still be missed by the sample.
+
+    Returns:
+        The number of values to sample.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if not 0 < tolerance < 1:
+        raise ValueError("tolerance must be between 0 and 1")
+    return math.ceil(math.log(1 - confidence) / math.log(1 - tolerance))
+
+
+def value_types(values, sample_size: int | None = None) -> frozenset:
+    """
+    Returns the set of Python types of the non-null values in a column buffer.
+
+    The types are collected with ``set(map(type, values))`` so the scan runs in C instead of a per-value Python loop.
+
+    Arg:
+        values: A list (or other sliceable sequence) holding one column of data. The types of a `Column` are read from its dtype.
+        sample_size: If set and the column is longer, only about `sample_size` evenly spaced values are inspected.
+
+    Returns:
+        A frozenset of the types found, excluding NoneType.
+    """
+    if isinstance(values, Column):
+        return values.python_types()
+    if sample_size is not None and len(values) > sample_size:
+        values = values[::len(values) // sample_size]
+    types = set(map(type, values))
+    types.discard(type(None))
+    return frozenset(types)